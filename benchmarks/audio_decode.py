@@ -0,0 +1,67 @@
+"""
+Compare the old temp-file audio decode with the streaming ffmpeg pipe: time until the float32
+array is ready for inference and peak Python-side memory (bytes, buffers and NumPy arrays).
+
+Usage (from the repository root, needs numpy and ffmpeg):
+    python -m benchmarks.audio_decode audio.mp3 [...]
+
+The blob download is simulated by reading the file in blob-sized chunks.
+"""
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from functions.speech_to_text.audio import decode_audio_stream
+from functions.speech_to_text.chunking import SAMPLE_RATE
+
+BLOB_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def blob_chunks(path: str):
+    with open(path, "rb") as f:
+        while chunk := f.read(BLOB_CHUNK_SIZE):
+            yield chunk
+
+
+def temp_file_decode(path: str):
+    # what speech_to_text did before: readall(), a temp file, then whisper.audio.load_audio
+    body = b"".join(blob_chunks(path))
+    with tempfile.NamedTemporaryFile(suffix=".mp3") as tmp_file:
+        tmp_file.write(body)
+        tmp_file.flush()
+        cmd = ["ffmpeg", "-nostdin", "-threads", "0", "-i", tmp_file.name,
+               "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-"]
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+def streaming_decode(path: str):
+    return decode_audio_stream(blob_chunks(path))
+
+
+def measure(fn, path: str) -> tuple[float, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    audio = fn(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, len(audio)
+
+
+def main(paths: list[str]):
+    for path in paths:
+        print(f"\n{path}: {Path(path).stat().st_size / 2**20:.1f} MiB")
+        print(f"{'decode':<12}{'to array s':>12}{'peak MiB':>10}{'minutes':>10}")
+        for name, fn in (("temp file", temp_file_decode), ("streaming", streaming_decode)):
+            elapsed, peak_mib, samples = measure(fn, path)
+            print(f"{name:<12}{elapsed:>12.2f}{peak_mib:>10.1f}{samples / SAMPLE_RATE / 60:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
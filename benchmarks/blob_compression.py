@@ -0,0 +1,76 @@
+"""
+Compare blob codecs on real result blobs: bytes on the wire and encode/decode CPU time.
+
+Usage (from the repository root):
+    python -m benchmarks.blob_compression results/<id>/transcript.json results/<id>/summary.json ...
+
+Without arguments a synthetic hour-long transcript and sentiment chart are used.
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+from functions.shared.compression import available_codecs, compress, decompress
+
+REPEATS = 20
+
+SAMPLE_SENTENCES = [
+    "Starting with the battery life, I'm genuinely impressed",
+    "On most days I end with around 25 to 30 percent battery left",
+    "In daylight the photos look sharp, vibrant, and full of detail",
+    "But low-light performance is disappointing",
+    "Apps open instantly, multitasking is smooth, and I haven't seen any noticeable lag",
+    "As for the speakers, they're just okay",
+]
+
+
+def synthetic_payloads() -> dict[str, bytes]:
+    # ~150 words per minute for an hour of speech
+    words = " ".join(SAMPLE_SENTENCES).split()
+    transcript = " ".join(words[i % len(words)] for i in range(150 * 60))
+    sentences = 900
+    summary = {
+        "verdict": {"score": 0.42, "verdict": "NEUTRAL"},
+        "sentiment_series_chart": {
+            "y": [round(((i * 37) % 200 - 100) / 100, 2) for i in range(sentences)],
+            "labels": ["POSITIVE" if (i * 37) % 200 >= 100 else "NEGATIVE" for i in range(sentences)],
+        },
+    }
+    return {
+        "synthetic transcript.json": json.dumps({"id": "bench", "transcript": transcript}).encode("utf-8"),
+        "synthetic summary.json": json.dumps(summary).encode("utf-8"),
+    }
+
+
+def time_it(fn, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def bench(name: str, payload: bytes):
+    print(f"\n{name}: {len(payload)} bytes")
+    print(f"{'codec':<10}{'bytes':>12}{'ratio':>9}{'encode ms':>12}{'decode ms':>12}")
+    for codec in available_codecs():
+        encoded = compress(payload, codec)
+        assert decompress(encoded, codec) == payload
+        encode_ms = time_it(compress, payload, codec)
+        decode_ms = time_it(decompress, encoded, codec)
+        ratio = len(payload) / len(encoded)
+        print(f"{codec:<10}{len(encoded):>12}{ratio:>9.2f}{encode_ms:>12.3f}{decode_ms:>12.3f}")
+
+
+def main(paths: list[str]):
+    if paths:
+        payloads = {path: Path(path).read_bytes() for path in paths}
+    else:
+        payloads = synthetic_payloads()
+
+    for name, payload in payloads.items():
+        bench(name, payload)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,106 @@
+"""
+Replay YouTube jobs through the real YTDownloader.process path (extract_info, subtitle fetch and parse,
+blob uploads, status transition, queue message) and report jobs/sec and per-phase latency.
+The network is replaced by a ReplaySession; storage is whatever AzureWebJobsStorage points at,
+by default Azurite (docker compose up azurite).
+
+Usage (from the repository root):
+    python -m benchmarks.downloader_replay [--jobs N] [--concurrency C] [fixture_dir ...]
+
+fixture_dir holds fixtures recorded by running the downloader with DOWNLOADER_RECORD_DIR set;
+every recorded video in it is replayed. Without arguments synthetic videos with a 10 minute and
+a 6 hour auto-caption track are used.
+"""
+import argparse
+import json
+import statistics
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.json3_parser import synthetic_captions
+from functions.downloader import strategies
+from functions.downloader.replay import INFO_DIR, ReplaySession, write_http_fixture, write_info_fixture
+from functions.downloader.session import set_downloader_session
+from functions.shared.common import write_job_metadata
+from functions.shared.job_status import JobStatus
+
+
+def synthetic_fixtures(fixture_dir: Path) -> list[tuple[str, str]]:
+    cases = []
+    for name, hours in (("10 min captions", 1 / 6), ("6 h captions", 6)):
+        video_id = f"bench{int(hours * 60):06d}"
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        caption_url = f"https://www.youtube.com/api/timedtext?v={video_id}&fmt=json3"
+        info = {
+            "id": video_id,
+            "title": f"Synthetic review ({name})",
+            "duration": int(hours * 3600),
+            "automatic_captions": {"en": [{"ext": "json3", "url": caption_url}]},
+        }
+        write_info_fixture(fixture_dir, url, info)
+        write_http_fixture(fixture_dir, caption_url, synthetic_captions(hours))
+        cases.append((name, url))
+    return cases
+
+
+def recorded_videos(fixture_dir: Path) -> list[tuple[str, str]]:
+    cases = []
+    for path in sorted((fixture_dir / INFO_DIR).glob("*.json")):
+        fixture = json.loads(path.read_text("utf-8"))
+        if fixture["info"].get("_type") == "playlist":
+            continue
+        cases.append((fixture["info"].get("title") or fixture["url"], fixture["url"]))
+    return cases
+
+
+def run_job(url: str) -> dict:
+    job_id = f"bench-{uuid.uuid4()}"
+    write_job_metadata(job_id, url, JobStatus.CREATED.value)
+    downloader = strategies.YTDownloader(job_id, url)
+    downloader.process()
+    return downloader.timings
+
+
+def bench(name: str, url: str, jobs: int, concurrency: int):
+    run_job(url)  # warm up connections, containers and the replay cache
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        timings = list(executor.map(run_job, [url] * jobs))
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{name}: {jobs} jobs, concurrency {concurrency}, {jobs / elapsed:.1f} jobs/s")
+    print(f"{'phase':<16}{'mean ms':>10}{'p95 ms':>10}")
+    for phase in timings[0]:
+        samples = sorted(t.get(phase, 0.0) * 1000 for t in timings)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(f"{phase:<16}{statistics.mean(samples):>10.1f}{p95:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("fixture_dirs", nargs="*")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    # replayed jobs never reach YouTube, so they must not wait for its rate limit
+    strategies.YOUTUBE_RATE_LIMITER.rate = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.fixture_dirs:
+            suites = [(Path(d), recorded_videos(Path(d))) for d in args.fixture_dirs]
+        else:
+            suites = [(Path(tmp), synthetic_fixtures(Path(tmp)))]
+
+        for fixture_dir, cases in suites:
+            set_downloader_session(ReplaySession(fixture_dir))
+            for name, url in cases:
+                bench(name, url, args.jobs, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare the old full-load json3 parsing with the streaming parser: wall time and peak memory.
+
+Usage (from the repository root):
+    python -m benchmarks.json3_parser [subtitles.json3 ...]
+
+Without arguments synthetic auto-caption files (word-level segments) of 1, 3 and 6 hours are used.
+"""
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from functions.downloader.json3 import parse_json3
+
+CHUNK_SIZE = 64 * 1024
+REPEATS = 3
+
+WORDS = "starting with the battery life I'm genuinely impressed but low-light performance is disappointing".split()
+
+
+def synthetic_captions(hours: float) -> bytes:
+    # auto captions: one event per ~3 s cue, one seg per word, ~150 words per minute
+    events = [{"tStartMs": 0, "dDurationMs": int(hours * 3600 * 1000), "id": 1, "wpWinPosId": 1, "wsWinStyleId": 1}]
+    for cue in range(int(hours * 1200)):
+        start = cue * 3000
+        segs = [{"utf8": WORDS[(cue + i) % len(WORDS)] if i == 0 else " " + WORDS[(cue + i) % len(WORDS)],
+                 "tOffsetMs": i * 400, "acAsrConf": 0} for i in range(7)]
+        events.append({"tStartMs": start, "dDurationMs": 3000, "wWinId": 1, "segs": segs})
+        events.append({"tStartMs": start + 2990, "dDurationMs": 10, "wWinId": 1, "aAppend": 1, "segs": [{"utf8": "\n"}]})
+    return json.dumps({"wireMagic": "pb3", "pens": [{}], "events": events}).encode("utf-8")
+
+
+def full_load(body: bytes) -> str:
+    # the parser YTDownloader used before: whole document in memory, then flattened
+    subtitle_json = json.loads(body.decode("utf-8"))
+    parts = []
+    for event in subtitle_json.get("events", []):
+        for seg in event.get("segs") or ():
+            text = seg.get("utf8", "").strip()
+            if text:
+                parts.append(text)
+    return " ".join(parts)
+
+
+def streaming(body: bytes) -> str:
+    transcript, _ = parse_json3(body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+    return transcript
+
+
+def measure(fn, body: bytes) -> tuple[float, float]:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(body)
+    elapsed_ms = (time.perf_counter() - start) / REPEATS * 1000
+
+    # the response body itself is excluded: the streaming parser never holds it whole
+    tracemalloc.start()
+    fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 2**20
+
+
+def bench(name: str, body: bytes):
+    print(f"\n{name}: {len(body) / 2**20:.1f} MiB")
+    print(f"{'parser':<12}{'ms':>10}{'peak MiB':>12}")
+    assert full_load(body) == streaming(body)
+    for parser_name, fn in (("full-load", full_load), ("streaming", streaming)):
+        elapsed_ms, peak_mib = measure(fn, body)
+        print(f"{parser_name:<12}{elapsed_ms:>10.1f}{peak_mib:>12.1f}")
+
+
+def main(paths: list[str]):
+    if paths:
+        bodies = {path: Path(path).read_bytes() for path in paths}
+    else:
+        bodies = {f"synthetic {hours}h auto captions": synthetic_captions(hours) for hours in (1, 3, 6)}
+
+    for name, body in bodies.items():
+        bench(name, body)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,86 @@
+"""
+Compare speech-to-text backends and model sizes on a fixed local audio set:
+load time, real-time factor (transcription seconds per audio second, lower is faster) and
+word error rate against reference transcripts.
+
+Usage (from the repository root, needs openai-whisper, ffmpeg and optionally faster-whisper):
+    python -m benchmarks.stt_backends [--backends whisper whisper-int8 faster-whisper]
+                                      [--models tiny base] audio_dir
+
+audio_dir holds audio files (mp3/m4a/wav/webm) each with a reference transcript next to it
+under the same name with a .txt extension. Inference runs on CPU, as in production.
+"""
+import argparse
+import re
+import time
+from pathlib import Path
+
+from functions.speech_to_text.audio import decode_audio_file
+from functions.speech_to_text.backends import available_backends
+from functions.speech_to_text.chunking import SAMPLE_RATE
+from functions.speech_to_text.model import WhisperModel
+
+AUDIO_SUFFIXES = {".mp3", ".m4a", ".wav", ".webm"}
+
+
+def normalize(text: str) -> list[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance divided by the reference length"""
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / max(1, len(ref))
+
+
+def load_audio_set(audio_dir: Path) -> list[tuple[str, object, str]]:
+    samples = []
+    for path in sorted(audio_dir.iterdir()):
+        reference = path.with_suffix(".txt")
+        if path.suffix.lower() in AUDIO_SUFFIXES and reference.exists():
+            samples.append((path.name, decode_audio_file(str(path)), reference.read_text("utf-8")))
+    if not samples:
+        raise SystemExit(f"No audio files with .txt references in {audio_dir}")
+    return samples
+
+
+def bench(backend: str, model_size: str, samples: list):
+    holder = WhisperModel(model_size, "cpu", backend)
+    holder.warm_up()
+
+    audio_seconds = transcribe_seconds = errors = 0.0
+    for _, audio, reference in samples:
+        start = time.perf_counter()
+        result = holder.get().transcribe(audio)
+        transcribe_seconds += time.perf_counter() - start
+        audio_seconds += len(audio) / SAMPLE_RATE
+        errors += word_error_rate(reference, result["text"])
+
+    print(f"{backend:<16}{model_size:<10}{holder.load_seconds:>8.1f}{holder.rss_delta_mib:>10.0f}"
+          f"{transcribe_seconds / audio_seconds:>8.3f}{errors / len(samples):>8.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("audio_dir")
+    parser.add_argument("--backends", nargs="+", default=available_backends())
+    parser.add_argument("--models", nargs="+", default=["tiny", "base"])
+    args = parser.parse_args()
+
+    samples = load_audio_set(Path(args.audio_dir))
+    total_minutes = sum(len(audio) for _, audio, _ in samples) / SAMPLE_RATE / 60
+    print(f"{len(samples)} files, {total_minutes:.1f} min of audio")
+    print(f"{'backend':<16}{'model':<10}{'load s':>8}{'MiB':>10}{'RTF':>8}{'WER':>8}")
+    for model_size in args.models:
+        for backend in args.backends:
+            bench(backend, model_size, samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare wall-clock transcription time of the single Whisper call with silence-chunked
+transcription on a process pool, for several worker counts.
+
+Usage (from the repository root, needs openai-whisper and ffmpeg):
+    python -m benchmarks.whisper_chunking [--workers 2 4 8] [--chunk-seconds 120] audio.mp3 [...]
+
+Model loading and pool start-up are excluded: every configuration is warmed up on the
+first 30 seconds of the audio before it is timed.
+"""
+import argparse
+import time
+
+from functions.speech_to_text.chunking import SAMPLE_RATE
+from functions.speech_to_text.model import get_whisper_model
+from functions.speech_to_text.parallel import get_transcription_pool, transcribe_chunked
+
+WARMUP_SECONDS = 30
+
+
+def bench(path: str, worker_counts: list[int], chunk_seconds: float, search_seconds: float):
+    from whisper.audio import load_audio
+
+    audio = load_audio(path)
+    warmup = audio[:WARMUP_SECONDS * SAMPLE_RATE]
+    print(f"\n{path}: {len(audio) / SAMPLE_RATE / 60:.1f} min")
+    print(f"{'mode':<16}{'seconds':>10}{'speedup':>10}{'words':>10}")
+
+    model = get_whisper_model().get()
+    model.transcribe(warmup)
+    start = time.perf_counter()
+    words = len(model.transcribe(audio)["text"].split())
+    baseline = time.perf_counter() - start
+    print(f"{'single call':<16}{baseline:>10.1f}{1:>10.2f}{words:>10}")
+
+    for workers in worker_counts:
+        pool = get_transcription_pool(workers)
+        list(pool.map(_warm_up_worker, [warmup] * workers))
+        start = time.perf_counter()
+        result = transcribe_chunked(audio, workers, chunk_seconds, search_seconds)
+        elapsed = time.perf_counter() - start
+        print(f"{f'{workers} workers':<16}{elapsed:>10.1f}{baseline / elapsed:>10.2f}{len(result['text'].split()):>10}")
+
+
+def _warm_up_worker(audio):
+    get_whisper_model().get().transcribe(audio)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--chunk-seconds", type=float, default=120)
+    parser.add_argument("--search-seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    for path in args.paths:
+        bench(path, args.workers, args.chunk_seconds, args.search_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import { useView } from './hooks/useView';
 
 const STATUS_MESSAGES: Record<string, string> = {
   CREATED: 'Collecting video reviews...',
+  METADATA_READY: 'Fetching the transcript...',
   DOWNLOADED: 'Processing video content...',
   TRANSCRIBED: 'Analyzing reviews...',
   DONE: 'Complete!',
@@ -12,6 +13,10 @@ const STATUS_MESSAGES: Record<string, string> = {
   NO_SPEECH: 'No speech detected',
 };
 
+// the API holds each status request until the status changes or this many seconds pass
+const LONG_POLL_SECONDS = 20;
+const RETRY_DELAY_MS = 3000;
+
 type LoadingPageProps = {
   jobId: string;
   onDone?: () => void;
@@ -29,43 +34,40 @@ export const LoadingPage: React.FC<LoadingPageProps> = ({
   const [noSpeech, setNoSpeech] = useState<boolean>(false);
 
   useEffect(() => {
-    let pollInterval: number | null = null;
     let timeoutId: number | null = null;
     let isMounted = true;
 
     timeoutId = window.setTimeout(() => {
       isMounted = false;
-      if (pollInterval) clearInterval(pollInterval);
       onDone?.();
     }, delayMs);
 
-    window.setTimeout(() => {
-      pollInterval = window.setInterval(async () => {
-        if (!isMounted) {
-          if (pollInterval) clearInterval(pollInterval);
-          return;
-        }
+    const finish = () => {
+      isMounted = false;
+      if (timeoutId) clearTimeout(timeoutId);
+    };
+
+    const poll = async () => {
+      let since: string | undefined;
 
+      while (isMounted) {
         try {
-          const statusResponse = await checkJobStatus(jobId);
+          const statusResponse = await checkJobStatus(
+            jobId,
+            LONG_POLL_SECONDS,
+            since
+          );
 
-          if (!isMounted) {
-            if (pollInterval) clearInterval(pollInterval);
-            return;
-          }
+          if (!isMounted) return;
 
           if (statusResponse.status === JobStatus.FAILED) {
-            isMounted = false;
-            if (pollInterval) clearInterval(pollInterval);
-            if (timeoutId) clearTimeout(timeoutId);
+            finish();
             setError(statusResponse.message || 'An unknown error occurred');
             return;
           }
 
           if (statusResponse.status === JobStatus.NO_SPEECH) {
-            isMounted = false;
-            if (pollInterval) clearInterval(pollInterval);
-            if (timeoutId) clearTimeout(timeoutId);
+            finish();
             setNoSpeech(true);
             return;
           }
@@ -75,22 +77,27 @@ export const LoadingPage: React.FC<LoadingPageProps> = ({
           setMessage(statusMsg);
 
           if (statusResponse.status === JobStatus.DONE) {
-            isMounted = false;
-            if (pollInterval) clearInterval(pollInterval);
-            if (timeoutId) clearTimeout(timeoutId);
+            finish();
             onDone?.();
+            return;
           }
+
+          since = statusResponse.status;
         } catch (error) {
           if (!isMounted) return;
           console.error('Error polling job status:', error);
           setMessage('Connection issue, retrying...');
+          await new Promise((resolve) =>
+            window.setTimeout(resolve, RETRY_DELAY_MS)
+          );
         }
-      }, 3000);
-    }, 3000);
+      }
+    };
+
+    poll();
 
     return () => {
       isMounted = false;
-      if (pollInterval) clearInterval(pollInterval);
       if (timeoutId) clearTimeout(timeoutId);
     };
   }, [jobId, onDone, delayMs]);
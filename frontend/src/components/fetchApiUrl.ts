@@ -67,16 +67,24 @@ export async function createJob(url: string): Promise<ApiResponse> {
 }
 
 // GET request to check job status
+// With `wait` the API long-polls: it answers once the status differs from `since` or after `wait` seconds
 export async function checkJobStatus(
-  jobId: string
+  jobId: string,
+  wait?: number,
+  since?: string
 ): Promise<JobStatusResponse> {
+  const waitParam = wait ? `&wait=${wait}` : '';
+  const sinceParam = since ? `&since=${since}` : '';
   try {
-    const response = await fetch(`${URL}?id=${jobId}`, {
-      method: 'GET',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-    });
+    const response = await fetch(
+      `${URL}?id=${jobId}${waitParam}${sinceParam}`,
+      {
+        method: 'GET',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+      }
+    );
 
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
@@ -89,44 +97,45 @@ export async function checkJobStatus(
   }
 }
 
+interface JobBundleResponse {
+  status?: JobStatusResponse;
+  summary?: JobSummaryResponse;
+  metadata?: VideoMetadataResponse | null;
+  transcript?: TranscriptResponse;
+}
+
 //  External method to retrieve all data from the backend
 export async function getBackendData(
   jobId: string
 ): Promise<JobAllDataResponse> {
-  const [summary, metadata, transcript, sentimentByPart] = (await Promise.all([
-    getJobSummary(jobId),
-    fetchVideoMetadata(jobId),
-    fetchTranscript(jobId),
-    fetchSentimentByPart(jobId),
-  ])) as [
-    JobSummaryResponse | undefined,
-    VideoMetadataResponse | undefined,
-    TranscriptResponse | undefined,
-    // eslint-disable-next-line  @typescript-eslint/no-explicit-any
-    any,
-  ];
+  const bundle = await fetchBundle(jobId);
 
   return {
     summary: {
-      ...(summary || {}),
-      ...(metadata || {}),
-      ...(transcript || {}),
-      ...(sentimentByPart || {}),
+      ...(bundle?.summary || {}),
+      ...(bundle?.metadata || {}),
+      ...(bundle?.transcript || {}),
+      ...(bundle?.status || {}),
     },
   };
 }
 
-// GET to retrieve summary.json
-async function getJobSummary(
-  jobId: string
-): Promise<JobSummaryResponse | undefined> {
+// GET status, summary, metadata and transcript in a single request
+async function fetchBundle(
+  jobId: string,
+  fields?: string[]
+): Promise<JobBundleResponse | undefined> {
+  const fieldsParam = fields ? `&fields=${fields.join(',')}` : '';
   try {
-    const response = await fetch(`${URL}?action=summary&id=${jobId}`, {
-      method: 'GET',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-    });
+    const response = await fetch(
+      `${URL}?action=bundle&id=${jobId}${fieldsParam}`,
+      {
+        method: 'GET',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+      }
+    );
 
     if (!response.ok) {
       console.error(`HTTP error! status: ${response.status}`);
@@ -135,7 +144,7 @@ async function getJobSummary(
 
     return await response.json();
   } catch (error) {
-    console.error('Error checking job status:', error);
+    console.error('Error fetching job bundle:', error);
     return undefined;
   }
 }
@@ -163,27 +172,6 @@ export async function fetchVideoMetadata(
   }
 }
 
-async function fetchTranscript(
-  jobId: string
-): Promise<TranscriptResponse | undefined> {
-  try {
-    const response = await fetch(`${URL}?action=transcript&id=${jobId}`, {
-      method: 'GET',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-    });
-    if (!response.ok) {
-      console.error(`HTTP error! status: ${response.status}`);
-      return undefined;
-    }
-    return await response.json();
-  } catch (error) {
-    console.error('Error fetching transcript:', error);
-    return undefined;
-  }
-}
-
 // eslint-disable-next-line  @typescript-eslint/no-explicit-any
 export async function fetchSentimentByPart(jobId: string): Promise<any> {
   try {
@@ -5,6 +5,7 @@ export const JobStatus = {
   FAILED: 'FAILED',
   NO_SPEECH: 'NO_SPEECH',
   CREATED: 'CREATED',
+  METADATA_READY: 'METADATA_READY',
 } as const;
 
 export type JobStatus = (typeof JobStatus)[keyof typeof JobStatus];
@@ -1,17 +1,32 @@
+import hashlib
 import json
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from email.utils import format_datetime
+from typing import NamedTuple
 
+from azure.core.exceptions import ResourceNotFoundError
 from azure.functions import HttpRequest, HttpResponse
 
-from ..shared.common import enqueue_message, read_blob, read_job_metadata, write_job_metadata, read_video_metadata
-from ..shared.config import NEW_QUEUE, SUMMARY_FILENAME, TRANSCRIPT_FILENAME
-from ..shared.job_status import JobStatus
+from ..shared.common import enqueue_message, write_job_metadata, \
+    reset_round_trips, get_round_trips, read_job_status, list_jobs_by_status, run_async, aread_many, \
+    read_blob_with_properties, get_blob_properties, count_child_statuses
+from ..shared.config import NEW_QUEUE, SUMMARY_FILENAME, TRANSCRIPT_FILENAME, VIDEO_METADATA_FILENAME, \
+    BULK_MAX_ITEMS, BULK_CONCURRENCY, \
+    API_CACHE_MAX_ENTRIES, API_CACHE_MAX_BYTES, API_CACHE_TERMINAL_TTL, API_CACHE_ACTIVE_TTL, LONG_POLL_INTERVAL, \
+    LONG_POLL_MAX_WAIT, HTTP_TERMINAL_MAX_AGE
+from ..shared.job_status import JobStatus, TERMINAL_STATUSES
 from ..shared.logs import logging
+from ..shared.submission import reuse_processed_video, submit_jobs, video_fields
+from ..shared.video_url import canonical_video_id
 
 cors_headers = {
         "Access-Control-Allow-Origin": "*",
         "Access-Control-Allow-Methods": "POST, GET, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type",
+        "Access-Control-Allow-Headers": "Content-Type, If-None-Match",
+        "Access-Control-Expose-Headers": "ETag, Last-Modified",
     }
 
 
@@ -22,10 +37,18 @@ def main(req: HttpRequest) -> HttpResponse:
     action = req.params.get("action")
     logging.warning(f"${action} QWERTY")
 
-    if req.method == "GET":
-        return handle_get(req, action)
-    
-    return handle_post(req)
+    reset_round_trips()
+    try:
+        if req.method == "GET":
+            if action == "list":
+                return handle_list(req)
+            if action == "cache-stats":
+                return handle_cache_stats()
+            return handle_get(req, action)
+
+        return handle_post(req)
+    finally:
+        logging.info(f"api {req.method} (action={action}) storage round-trips: {get_round_trips()}")
 
 
 def handle_preflight_options() -> HttpResponse | None:
@@ -35,49 +58,12 @@ def handle_preflight_options() -> HttpResponse | None:
     )
 
 
-def handle_get(req: HttpRequest, action: str) -> HttpResponse:
-    """Handle GET request - check job status, summary, or metadata"""
-    job_id = req.params.get("id")
-    
-    if not job_id:
-        return HttpResponse(
-            json.dumps({"status": JobStatus.FAILED.value, "message": "Missing job id parameter"}),
-            status_code=400,
-            mimetype="application/json",
-            headers=cors_headers
-        )
-
-    try:
-        response = {}
-        if action == "summary":
-            logging.info("ACTION == SUMMARY, accessed")
-            try:
-                response = read_blob(f"results/{job_id}/{SUMMARY_FILENAME}") 
-            except:
-                response = {"status": "Didn't get the summary file bro, sorry"}
-        elif action == "metadata":
-            response = read_video_metadata(job_id)
-        else:
-            response = read_job_metadata(job_id)
-
-        return HttpResponse(
-            json.dumps(response),
-            status_code=200,
-            mimetype="application/json",
-            headers=cors_headers
-        )
-    except Exception as e:
-        logging.error(f"Failed to read job data for {job_id} (action={action}): {e}")
-        return HttpResponse(
-            json.dumps({"status": JobStatus.FAILED.value, "message": "Data not found"}),
-            status_code=404,
-            mimetype="application/json",
-            headers=cors_headers
-        )
-
-
 def handle_post(req: HttpRequest) -> HttpResponse:
     """Handle POST request - create new job"""
+    items = _parse_bulk_items(req)
+    if items is not None:
+        return handle_bulk_post(items)
+
     try:
         body = req.get_json()
     except (ValueError, TypeError):
@@ -94,8 +80,17 @@ def handle_post(req: HttpRequest) -> HttpResponse:
             headers=cors_headers
         )
 
+    video = canonical_video_id(url)
     try:
-        write_job_metadata(job_id, url, JobStatus.CREATED.value)
+        source_job = run_async(reuse_processed_video(job_id, url, video, body.get("force") is True))
+        if source_job:
+            return HttpResponse(
+                json.dumps({"id": job_id, "url": url, "deduplicated_from": source_job}),
+                mimetype="application/json",
+                headers=cors_headers
+            )
+
+        write_job_metadata(job_id, url, JobStatus.CREATED.value, **video_fields(video))
         logging.info(f"api saved job {job_id} metadata to blob")
 
         msg = {"id": job_id}
@@ -120,6 +115,73 @@ def handle_post(req: HttpRequest) -> HttpResponse:
 
 
 
+_JSON_LINES_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+
+def _parse_bulk_items(req: HttpRequest) -> list[dict] | None:
+    """
+    Bulk bodies: {"urls": [...]}, a JSON array, or JSON lines (one {"url": ..., "id": ...} per line,
+    sent as NDJSON or spanning several lines).
+    Items may be plain url strings or objects. Returns None for a regular single-job body.
+    """
+    raw = req.get_body().decode("utf-8", errors="ignore")
+    content_type = req.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    body = None
+    if content_type not in _JSON_LINES_TYPES:
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            pass
+
+    if isinstance(body, dict):
+        if not isinstance(body.get("urls"), list):
+            return None
+        entries = body["urls"]
+    elif isinstance(body, list):
+        entries = body
+    else:
+        lines = [line for line in raw.splitlines() if line.strip()]
+        if content_type not in _JSON_LINES_TYPES and len(lines) < 2:
+            # a malformed single-line body stays an invalid single-job request
+            return None
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                entries.append({"error": "Invalid JSON line"})
+        if not entries:
+            return None
+
+    return [{"url": entry} if isinstance(entry, str) else entry for entry in entries]
+
+
+def handle_bulk_post(items: list[dict]) -> HttpResponse:
+    """Create one job per item, writing metadata blobs and NEW_QUEUE messages with bounded concurrency"""
+    if len(items) > BULK_MAX_ITEMS:
+        return HttpResponse(
+            json.dumps(
+                {
+                    "status": JobStatus.FAILED.value,
+                    "message": f"Too many urls: {len(items)} > {BULK_MAX_ITEMS}",
+                }
+            ),
+            status_code=413,
+            mimetype="application/json",
+            headers=cors_headers,
+        )
+
+    jobs = run_async(submit_jobs(items, BULK_CONCURRENCY))
+    failed = sum(1 for job in jobs if "error" in job)
+    logging.info(f"api bulk submitted {len(jobs) - failed} jobs, {failed} failed")
+
+    return HttpResponse(
+        json.dumps({"submitted": len(jobs) - failed, "failed": failed, "jobs": jobs}),
+        mimetype="application/json",
+        headers=cors_headers,
+    )
+
+
 def _extract_transcript_payload(raw, job_id: str) -> dict[str, str]:
     """
     {
@@ -163,6 +225,298 @@ def _extract_transcript_payload(raw, job_id: str) -> dict[str, str]:
     return {"id": transcript_id, "transcript": transcript_text}
 
 
+class CachedResponse(NamedTuple):
+    body: str
+    etag: str | None = None
+    last_modified: object = None
+
+
+class ArtifactCache:
+    """
+    Thread-safe LRU cache of serialized GET responses with per-entry TTL,
+    bounded both by entry count and by total body size.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[CachedResponse, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple[str, str], response: CachedResponse, ttl: float) -> None:
+        if ttl <= 0 or len(response.body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (response, time.monotonic() + ttl)
+            self._bytes += len(response.body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        response, _ = self._entries.pop(key)
+        self._bytes -= len(response.body)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._bytes}
+
+
+_artifact_cache = ArtifactCache(API_CACHE_MAX_ENTRIES, API_CACHE_MAX_BYTES)
+_terminal_statuses = {status.value for status in TERMINAL_STATUSES}
+
+
+def _read_status(job_id: str) -> dict:
+    """Job status through the cache; terminal statuses are kept for the long TTL"""
+    key = (job_id, "status")
+    cached = _artifact_cache.get(key)
+    if cached is not None:
+        return json.loads(cached.body)
+
+    return _fetch_status(job_id)
+
+
+def _fetch_status(job_id: str) -> dict:
+    """Fresh status read (terminal statuses from the index, others from the metadata blob), refreshing the cached copy"""
+    response = read_job_status(job_id)
+    if "children" in response:
+        response = _with_child_progress(job_id, response)
+    _artifact_cache.put(
+        (job_id, "status"),
+        CachedResponse(json.dumps(response, ensure_ascii=False)),
+        _status_ttl(response.get("status")),
+    )
+    return response
+
+
+def _with_child_progress(job_id: str, status: dict) -> dict:
+    """
+    Playlist jobs: attach per-status counts of their child jobs from the job index (only the
+    total without it). Read-only, the pipeline completes the parent when its last child finishes.
+    """
+    progress = {"total": len(status["children"])}
+    counts = count_child_statuses(job_id)
+    if counts is not None:
+        progress["finished"] = sum(counts.get(terminal, 0) for terminal in _terminal_statuses)
+        progress["statuses"] = counts
+    return {**status, "progress": progress}
+
+
+class StatusWatcher:
+    """
+    Backs long-poll status requests. A single background thread re-reads the status of every
+    job that has waiting requests once per interval, no matter how many requests wait on it,
+    and wakes the waiters when it changes. The thread exits when nobody is waiting.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._condition = threading.Condition()
+        self._statuses: dict[str, dict] = {}
+        self._waiters: dict[str, int] = {}
+        self._thread = None
+
+    def wait_for_change(self, job_id: str, current: dict, since: str, timeout: float) -> dict:
+        """Block until the job's status differs from since or timeout passes; returns the latest status"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._waiters[job_id] = self._waiters.get(job_id, 0) + 1
+            self._statuses.setdefault(job_id, current)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="status-watcher", daemon=True)
+                self._thread.start()
+            try:
+                while True:
+                    status = self._statuses[job_id]
+                    remaining = deadline - time.monotonic()
+                    if status.get("status") != since or remaining <= 0:
+                        return status
+                    self._condition.wait(remaining)
+            finally:
+                self._waiters[job_id] -= 1
+                if not self._waiters[job_id]:
+                    del self._waiters[job_id]
+                    del self._statuses[job_id]
+
+    def _run(self):
+        while True:
+            with self._condition:
+                job_ids = list(self._waiters)
+                if not job_ids:
+                    self._thread = None
+                    return
+
+            changed = False
+            for job_id in job_ids:
+                try:
+                    status = _fetch_status(job_id)
+                except Exception as e:
+                    logging.warning(f"Status watcher failed to read job {job_id}: {e}")
+                    continue
+                with self._condition:
+                    if job_id in self._statuses and self._statuses[job_id] != status:
+                        self._statuses[job_id] = status
+                        changed = True
+
+            if changed:
+                with self._condition:
+                    self._condition.notify_all()
+            time.sleep(self.interval)
+
+
+_status_watcher = StatusWatcher(LONG_POLL_INTERVAL)
+
+
+def _read_status_long_poll(job_id: str, wait: str, since: str | None) -> dict:
+    """
+    Handle ?wait=<seconds>[&since=<STATUS>]: hold the request until the status differs from since
+    (default: the current status) or the wait (capped at LONG_POLL_MAX_WAIT) runs out.
+    """
+    status = _read_status(job_id)
+    try:
+        timeout = min(float(wait), LONG_POLL_MAX_WAIT)
+    except ValueError:
+        return status
+
+    since = since or status.get("status")
+    if timeout <= 0 or status.get("status") != since or status.get("status") in _terminal_statuses:
+        return status
+    return _status_watcher.wait_for_change(job_id, status, since, timeout)
+
+
+def _status_ttl(status: str | None) -> float:
+    return API_CACHE_TERMINAL_TTL if status in _terminal_statuses else API_CACHE_ACTIVE_TTL
+
+
+def _job_status(job_id: str) -> str | None:
+    """The job's status for caching decisions, or None if it cannot be read"""
+    try:
+        return _read_status(job_id).get("status")
+    except Exception as e:
+        logging.warning(f"Could not read status of job {job_id}, not caching its artifacts: {e}")
+        return None
+
+
+def _artifact_ttl(status: str | None) -> float:
+    """Artifacts of finished jobs never change; anything else is cached only briefly, unknown ones not at all"""
+    return _status_ttl(status) if status else 0
+
+
+def _read_artifact(job_id: str, action: str) -> tuple[dict, object]:
+    """
+    Read the artifact for action together with its blob properties (ETag, Last-Modified).
+    Properties are None for placeholders and status reads, which must not be cached as artifacts.
+    """
+    if action == "summary":
+        logging.info("ACTION == SUMMARY, accessed")
+        try:
+            return read_blob_with_properties(f"results/{job_id}/{SUMMARY_FILENAME}")
+        except Exception:
+            return {"status": "Didn't get the summary file bro, sorry"}, None
+
+    if action == "metadata":
+        return read_blob_with_properties(f"results/{job_id}/{VIDEO_METADATA_FILENAME}")
+
+    if action == "transcript":
+        logging.info("ACTION == TRANSCRIPT, accessed")
+        try:
+            transcript_data, properties = read_blob_with_properties(f"results/{job_id}/{TRANSCRIPT_FILENAME}")
+            payload = _extract_transcript_payload(transcript_data, job_id)
+            return {"full-text": payload}, properties
+        except Exception as e:
+            logging.error(f"Failed to read transcript for {job_id}: {e}")
+            return {
+                "full-text": {
+                    "id": job_id,
+                    "transcript": "Transcript not available yet",
+                }
+            }, None
+
+    return _read_status(job_id), None
+
+
+BUNDLE_FIELDS = ("status", "metadata", "summary", "transcript")
+_bundle_artifacts = {
+    "metadata": VIDEO_METADATA_FILENAME,
+    "summary": SUMMARY_FILENAME,
+    "transcript": TRANSCRIPT_FILENAME,
+}
+# actions whose responses become immutable once the job is finished
+_immutable_actions = (*_bundle_artifacts, "bundle")
+
+
+def _read_bundle(job_id: str, fields: str | None, status: dict) -> tuple[str, bool]:
+    """
+    All requested artifacts of a job as one JSON document keyed by action name, and whether
+    any part is a placeholder. Cached parts are reused as-is; the rest are downloaded concurrently.
+    Missing artifacts come back as the same placeholders the single actions return.
+    """
+    selected = [field for field in (fields or ",".join(BUNDLE_FIELDS)).split(",") if field in BUNDLE_FIELDS]
+
+    ttl = _status_ttl(status.get("status"))
+    parts = {"status": json.dumps(status, ensure_ascii=False)}
+    placeholder = False
+
+    missing = []
+    for field in selected:
+        if field == "status":
+            continue
+        cached = _artifact_cache.get((job_id, field))
+        if cached is None:
+            missing.append(field)
+        else:
+            parts[field] = cached.body
+
+    if missing:
+        results = run_async(
+            aread_many(
+                [f"results/{job_id}/{_bundle_artifacts[field]}" for field in missing],
+                return_exceptions=True,
+                with_properties=True,
+            )
+        )
+        for field, result in zip(missing, results):
+            if isinstance(result, Exception):
+                parts[field] = json.dumps(_bundle_placeholder(job_id, field))
+                placeholder = True
+                continue
+            data, properties = result
+            if field == "transcript":
+                data = {"full-text": _extract_transcript_payload(data, job_id)}
+            parts[field] = json.dumps(data, ensure_ascii=False)
+            # same entry the single action would cache, so its blob validators come along
+            _artifact_cache.put(
+                (job_id, field), CachedResponse(parts[field], properties.etag, properties.last_modified), ttl
+            )
+
+    # parts are already serialized, so splice them instead of re-encoding a large transcript
+    return "{" + ", ".join(f'"{field}": {parts[field]}' for field in selected) + "}", placeholder
+
+
+def _bundle_placeholder(job_id: str, field: str):
+    if field == "summary":
+        return {"status": "Didn't get the summary file bro, sorry"}
+    if field == "transcript":
+        return {"full-text": {"id": job_id, "transcript": "Transcript not available yet"}}
+    return None
+
+
 def handle_get(req: HttpRequest, action: str) -> HttpResponse:
     """Handle GET request - check job status, summary, or metadata"""
     job_id = req.params.get("id")
@@ -181,41 +535,59 @@ def handle_get(req: HttpRequest, action: str) -> HttpResponse:
         )
 
     try:
-        response = {}
-
-        if action == "summary":
-            logging.info("ACTION == SUMMARY, accessed")
-            try:
-                response = read_blob(f"results/{job_id}/{SUMMARY_FILENAME}")
-            except Exception:
-                response = {"status": "Didn't get the summary file bro, sorry"}
-
-        elif action == "metadata":
-            response = read_video_metadata(job_id)
-
-        elif action == "transcript":
-            logging.info("ACTION == TRANSCRIPT, accessed")
-            try:
-                transcript_data = read_blob(f"results/{job_id}/{TRANSCRIPT_FILENAME}")
-                payload = _extract_transcript_payload(transcript_data, job_id)
-                response = {"full-text": payload}
-            except Exception as e:
-                logging.error(f"Failed to read transcript for {job_id}: {e}")
-                response = {
-                    "full-text": {
-                        "id": job_id,
-                        "transcript": "Transcript not available yet",
-                    }
-                }
-
+        key = (job_id, action or "status")
+        if_none_match = req.headers.get("If-None-Match")
+        status = None
+        placeholder = False
+        if action == "bundle":
+            job = _read_status(job_id)
+            status = job.get("status")
+            body, placeholder = _read_bundle(job_id, req.params.get("fields"), job)
+            cached = CachedResponse(body)
+        elif not action and req.params.get("wait"):
+            cached = CachedResponse(json.dumps(_read_status_long_poll(job_id, req.params["wait"], req.params.get("since"))))
         else:
-            response = read_job_metadata(job_id)
+            if action in _immutable_actions:
+                # status before the artifact: an artifact read while the job was active must not get the terminal TTL
+                status = _job_status(job_id)
+            cached = _artifact_cache.get(key) if action else None
+            if cached is None and if_none_match and action in _bundle_artifacts:
+                # properties-only request: a matching ETag never downloads the blob body
+                try:
+                    properties = get_blob_properties(f"results/{job_id}/{_bundle_artifacts[action]}")
+                except ResourceNotFoundError:
+                    properties = None  # not written yet, the read below returns the placeholder
+                if properties is not None and _etag_matches(if_none_match, properties.etag):
+                    return _not_modified(action, status, properties.etag, properties.last_modified)
+        if cached is None:
+            response, properties = _read_artifact(job_id, action)
+            cached = CachedResponse(
+                json.dumps(response, ensure_ascii=False),
+                properties.etag if properties else None,
+                properties.last_modified if properties else None,
+            )
+            if properties:
+                _artifact_cache.put(key, cached, _artifact_ttl(status))
+            placeholder = action in _bundle_artifacts and properties is None
+
+        if placeholder:
+            # the real artifact can appear any moment, so no validator a client or proxy could keep
+            return HttpResponse(
+                cached.body,
+                status_code=200,
+                mimetype="application/json",
+                headers={**cors_headers, "Cache-Control": "no-cache"},
+            )
+
+        etag = cached.etag or _weak_etag(cached.body)
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return _not_modified(action, status, etag, cached.last_modified)
 
         return HttpResponse(
-            json.dumps(response, ensure_ascii=False),
+            cached.body,
             status_code=200,
             mimetype="application/json",
-            headers=cors_headers,
+            headers={**cors_headers, **_validator_headers(action, status, etag, cached.last_modified)},
         )
 
     except Exception as e:
@@ -231,3 +603,85 @@ def handle_get(req: HttpRequest, action: str) -> HttpResponse:
             mimetype="application/json",
             headers=cors_headers,
         )
+
+
+def _weak_etag(body: str) -> str:
+    """Validator for responses that do not map to a single blob (status, bundle)"""
+    return f'W/"{hashlib.sha1(body.encode("utf-8")).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str, etag: str | None) -> bool:
+    if not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison, as If-None-Match requires
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def _cache_control(action: str | None, status: str | None) -> str:
+    """Artifacts of finished jobs are immutable; status and in-progress artifacts must be revalidated"""
+    if action in _immutable_actions and status in _terminal_statuses:
+        return f"public, max-age={HTTP_TERMINAL_MAX_AGE}, immutable"
+    return "no-cache"
+
+
+def _validator_headers(action: str | None, status: str | None, etag: str, last_modified) -> dict:
+    headers = {"ETag": etag, "Cache-Control": _cache_control(action, status)}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def _not_modified(action: str | None, status: str | None, etag: str, last_modified) -> HttpResponse:
+    return HttpResponse(
+        status_code=304,
+        headers={**cors_headers, **_validator_headers(action, status, etag, last_modified)},
+    )
+
+
+def handle_cache_stats() -> HttpResponse:
+    """Handle GET ?action=cache-stats - hit/miss counters of the artifact cache"""
+    return HttpResponse(
+        json.dumps(_artifact_cache.stats()),
+        status_code=200,
+        mimetype="application/json",
+        headers=cors_headers,
+    )
+
+
+def handle_list(req: HttpRequest) -> HttpResponse:
+    """Handle GET ?action=list&status=<STATUS>[&date=YYYYMMDD] - list jobs by status from the job index"""
+    status = req.params.get("status")
+
+    if status not in {s.value for s in JobStatus}:
+        return HttpResponse(
+            json.dumps(
+                {
+                    "status": JobStatus.FAILED.value,
+                    "message": "Missing or invalid status parameter",
+                }
+            ),
+            status_code=400,
+            mimetype="application/json",
+            headers=cors_headers,
+        )
+
+    try:
+        jobs = list_jobs_by_status(status, req.params.get("date"))
+    except Exception as e:
+        logging.error(f"Failed to list jobs with status {status}: {e}")
+        return HttpResponse(
+            json.dumps({"status": JobStatus.FAILED.value, "message": str(e)}),
+            status_code=500,
+            mimetype="application/json",
+            headers=cors_headers,
+        )
+
+    return HttpResponse(
+        json.dumps({"status": status, "count": len(jobs), "jobs": jobs}),
+        status_code=200,
+        mimetype="application/json",
+        headers=cors_headers,
+    )
@@ -0,0 +1,97 @@
+# downloader/errors.py
+import random
+import re
+
+import requests
+from yt_dlp.utils import DownloadError, ExtractorError, GeoRestrictedError, UnsupportedError
+
+from .rate_limit import RateLimited
+from ..shared.config import DOWNLOAD_BACKOFF_BASE, DOWNLOAD_BACKOFF_MAX
+
+PERMANENT = "permanent"
+RETRYABLE = "retryable"
+DEFERRED = "deferred"
+UNKNOWN = "unknown"
+
+# yt-dlp reports most failures as DownloadError/ExtractorError with a message only
+_PERMANENT_MESSAGES = (
+    "private video",
+    "video unavailable",
+    "this video is unavailable",
+    "has been removed",
+    "members-only",
+    "join this channel",
+    "confirm your age",
+    "copyright",
+    "unsupported url",
+    "is not a valid url",
+    "does not exist",
+    "premieres in",
+)
+_RETRYABLE_MESSAGES = (
+    "too many requests",
+    "not a bot",
+    "timed out",
+    "connection reset",
+    "remote end closed",
+    "temporary failure",
+    "unable to download webpage",
+    "incomplete",
+)
+_PERMANENT_HTTP_STATUSES = {400, 401, 403, 404, 410, 451}
+# the status yt-dlp embeds in messages such as "Unable to download webpage: HTTP Error 404: Not Found"
+_HTTP_STATUS_MESSAGE = re.compile(r"http error (\d{3})")
+
+
+class PermanentDownloadError(Exception):
+    """A job that can never be downloaded, e.g. a URL no strategy supports"""
+
+
+def classify_download_error(error: BaseException) -> str:
+    """
+    Sort a download failure into DEFERRED (our own rate limiter said wait), PERMANENT
+    (retrying cannot help: private, removed, unsupported), RETRYABLE (throttling, network,
+    5xx) or UNKNOWN (left to the queue's own retry policy).
+    """
+    if isinstance(error, RateLimited):
+        return DEFERRED
+    if isinstance(error, (PermanentDownloadError, UnsupportedError, GeoRestrictedError)):
+        return PERMANENT
+
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        kind = _classify_http_status(error.response.status_code)
+        if kind:
+            return kind
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return RETRYABLE
+
+    if isinstance(error, (DownloadError, ExtractorError)):
+        message = str(error).lower()
+        # an explicit status decides before any phrase, "unable to download webpage" comes with 404s and 503s alike
+        status = _HTTP_STATUS_MESSAGE.search(message)
+        kind = _classify_http_status(int(status[1])) if status else None
+        if kind:
+            return kind
+        if any(pattern in message for pattern in _PERMANENT_MESSAGES):
+            return PERMANENT
+        if any(pattern in message for pattern in _RETRYABLE_MESSAGES):
+            return RETRYABLE
+        # expected=True marks errors yt-dlp considers the user's, not a bug or a glitch
+        if isinstance(error, ExtractorError) and error.expected:
+            return PERMANENT
+
+    return UNKNOWN
+
+
+def _classify_http_status(status: int) -> str | None:
+    if status == 429 or status >= 500:
+        return RETRYABLE
+    if status in _PERMANENT_HTTP_STATUSES:
+        return PERMANENT
+    return None
+
+
+def backoff_delay(attempt: int) -> int:
+    """Exponential backoff with jitter, so throttled workers do not come back in lockstep"""
+    delay = min(DOWNLOAD_BACKOFF_MAX, DOWNLOAD_BACKOFF_BASE * 2 ** attempt)
+    return int(delay * random.uniform(0.5, 1.0)) or 1
@@ -0,0 +1,107 @@
+# downloader/json3.py
+import codecs
+import json
+import re
+from typing import Iterable
+
+from ..shared.segments import SegmentTable
+
+_decoder = json.JSONDecoder()
+_SEPARATOR = re.compile(r"[\s,]*")
+
+
+class Json3Parser:
+    """
+    Incremental parser for YouTube json3 subtitles.
+
+    Bytes are fed as they arrive; every complete object of the top-level "events"
+    array is decoded and discarded right away, so only the current event, the
+    transcript pieces and the segment table stay in memory.
+    """
+
+    def __init__(self):
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._in_events = False
+        self._done = False
+        self._parts = []
+        self._length = 0
+        self.segments = SegmentTable()
+
+    def feed(self, chunk: bytes):
+        if self._done:
+            return
+        self._buffer += self._text_decoder.decode(chunk)
+        self._parse()
+
+    def close(self) -> tuple[str, SegmentTable]:
+        """
+        Finish parsing and return (flat transcript, segment table).
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        self._parse()
+        if self._in_events and not self._done:
+            raise ValueError("Truncated json3 subtitles: events array is not closed")
+        return " ".join(self._parts), self.segments
+
+    def _parse(self):
+        if not self._in_events and not self._seek_events():
+            return
+
+        buffer = self._buffer
+        pos = 0
+        while True:
+            pos = _SEPARATOR.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._done = True
+                pos = len(buffer)
+                break
+            try:
+                event, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # incomplete event, wait for the next chunk
+                break
+            self._add_event(event)
+            pos = end
+
+        self._buffer = buffer[pos:]
+
+    def _seek_events(self) -> bool:
+        key = self._buffer.find('"events"')
+        if key == -1:
+            # keep a tail in case the key is split across chunks
+            self._buffer = self._buffer[-16:]
+            return False
+        bracket = self._buffer.find("[", key)
+        if bracket == -1:
+            self._buffer = self._buffer[key:]
+            return False
+        self._buffer = self._buffer[bracket + 1:]
+        self._in_events = True
+        return True
+
+    def _add_event(self, event: dict):
+        segs = event.get("segs")
+        if not segs:
+            return
+        texts = [text for text in (seg.get("utf8", "").strip() for seg in segs) if text]
+        if not texts:
+            return
+
+        offset = self._length + (1 if self._parts else 0)
+        self.segments.append(event.get("tStartMs", 0), event.get("dDurationMs", 0), offset)
+        # every piece adds its text plus one joining space
+        self._length = offset + sum(map(len, texts)) + len(texts) - 1
+        self._parts.extend(texts)
+
+
+def parse_json3(chunks: Iterable[bytes]) -> tuple[str, SegmentTable]:
+    """
+    Parse json3 subtitles from an iterable of byte chunks (e.g. a streamed HTTP body).
+    """
+    parser = Json3Parser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
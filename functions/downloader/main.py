@@ -1,10 +1,14 @@
 # downloader/__init__.py
 from azure.functions import QueueMessage
 
-from .strategies import YTDownloader
-from ..shared.common import read_job_metadata, write_failed_job_metadata
-from ..shared.config import MAX_DEQUEUE_COUNT
+from .errors import DEFERRED, PERMANENT, RETRYABLE, PermanentDownloadError, backoff_delay, classify_download_error
+from .strategies import AudioFallback, DirectMediaDownloader, PlaylistDownloader, YTAudioDownloader, YTDownloader
+from ..shared.common import enqueue_message, read_job_metadata, write_failed_job_metadata, reset_round_trips, \
+    get_round_trips
+from ..shared.config import DOWNLOAD_MAX_ATTEMPTS, MAX_DEQUEUE_COUNT, NEW_QUEUE
 from ..shared.logs import logging
+from ..shared.video_url import YOUTUBE, canonical_collection_url, canonical_video_id, canonical_video_url, \
+    is_direct_media_url
 
 
 def parse_id(msg: QueueMessage):
@@ -17,35 +21,91 @@ def parse_id(msg: QueueMessage):
         return e
 
 
+def parse_attempt(msg: QueueMessage) -> int:
+    """How many retryable failures this job has had; set by reschedule()"""
+    try:
+        return int(msg.get_json().get("attempt", 0))
+    except Exception:
+        return 0
+
+
+def reschedule(job_id: str, attempt: int, delay: float):
+    """Put the job back on NEW_QUEUE, invisible for delay seconds, instead of failing this message"""
+    enqueue_message({"id": job_id, "attempt": attempt}, queue_name=NEW_QUEUE, visibility_timeout=int(delay) or 1)
+    logging.info(f"downloader rescheduled job {job_id} (attempt {attempt}) in {delay:.0f}s")
+
+
+def handle_download_error(job_id: str, attempt: int, error: Exception) -> bool:
+    """
+    Deal with a classified download failure without a queue retry.
+    Returns False for unknown errors, which are left to the queue's retry policy.
+    """
+    kind = classify_download_error(error)
+
+    if kind == DEFERRED:
+        # our own limiter asked us to wait, this is not a failed attempt
+        reschedule(job_id, attempt, error.retry_after)
+        return True
+
+    if kind == RETRYABLE and attempt + 1 < DOWNLOAD_MAX_ATTEMPTS:
+        reschedule(job_id, attempt + 1, backoff_delay(attempt))
+        return True
+
+    if kind in (PERMANENT, RETRYABLE):
+        logging.error(f"Failed to download {job_id} ({kind}, attempt {attempt}): {error}")
+        write_failed_job_metadata(job_id, error=str(error))
+        return True
+
+    return False
+
+
 def main(msg: QueueMessage):
     job_id = parse_id(msg)
+    attempt = parse_attempt(msg)
+    reset_round_trips()
     try:
         # Read job metadata to get URL and determine platform
         job_metadata = read_job_metadata(job_id)
         url = job_metadata.get("url")
 
         if not url:
-            raise ValueError("No URL found in job metadata")
+            raise PermanentDownloadError("No URL found in job metadata")
 
         # Determine which downloader to use based on URL
-        if "youtube.com" in url or "youtu.be" in url:
-            # convert shorts into basic video
-            if "shorts/" in url:
-                url = url.replace("shorts/", "watch?v=")
-                logging.info(f"YT Shorts detected. Changing shorts url into video url {url}")
-
+        video = canonical_video_id(url)
+        if video and video[0] == YOUTUBE:
+            # shorts/, youtu.be and embed links all become the plain watch url
+            url = canonical_video_url(*video)
+            downloader = YTDownloader(job_id, url)
+        elif canonical_collection_url(url):
+            # playlists and channels fan out into one child job per video
+            downloader = PlaylistDownloader(job_id, canonical_collection_url(url))
+        elif "youtube.com" in url or "youtu.be" in url:
             downloader = YTDownloader(job_id, url)
+        elif is_direct_media_url(url):
+            downloader = DirectMediaDownloader(job_id, url)
         else:
-            raise ValueError(f"Unsupported platform for URL: {url}")
+            raise PermanentDownloadError(f"Unsupported platform for URL: {url}")
 
         # Execute the download strategy
-        downloader.process()
+        fallback = downloader.process()
+        if isinstance(fallback, AudioFallback):
+            # no English captions, the job continues as an audio download for speech_to_text
+            YTAudioDownloader.from_fallback(job_id, url, fallback).process()
 
     except Exception as e:
         logging.error(f"Error in downloading job {job_id}: {e}")
 
+        try:
+            if handle_download_error(job_id, attempt, e):
+                return
+        except Exception as handling_error:
+            logging.error(f"Could not handle download error of job {job_id}: {handling_error}")
+
         if msg.dequeue_count >= MAX_DEQUEUE_COUNT:
             logging.error(f"Failed to download {job_id}: {e}")
             write_failed_job_metadata(job_id)
 
         raise
+    finally:
+        logging.info(f"downloader job {job_id} storage round-trips: {get_round_trips()}")
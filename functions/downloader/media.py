@@ -0,0 +1,134 @@
+# downloader/media.py
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import NamedTuple
+
+import requests
+
+from ..shared.common import BlockBlobWriter, commit_blob_blocks, stage_blob_block
+from ..shared.config import AUDIO_BLOCK_SIZE, DOWNLOADER_HTTP_TIMEOUT
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def select_audio_format(info: dict) -> dict | None:
+    """
+    Pick the smallest audio-only format that can be fetched over plain HTTP(S).
+    Whisper resamples everything to 16 kHz mono, so a higher bitrate only costs download time.
+    """
+    candidates = [
+        f for f in info.get('formats') or ()
+        if f.get('url')
+        and f.get('vcodec') == 'none'
+        and f.get('acodec') not in (None, 'none')
+        and f.get('protocol') in ('http', 'https')
+    ]
+    return min(candidates, key=lambda f: f.get('abr') or f.get('tbr') or float('inf'), default=None)
+
+
+class MediaProbe(NamedTuple):
+    url: str
+    size: int | None
+    accepts_ranges: bool
+    content_type: str | None
+
+
+def probe_media(http: requests.Session, url: str) -> MediaProbe:
+    """
+    HEAD the URL (following redirects, so ranges go straight to the final CDN host)
+    for its size, Range support and content type.
+    """
+    response = http.head(url, allow_redirects=True, timeout=DOWNLOADER_HTTP_TIMEOUT)
+    response.raise_for_status()
+    length = response.headers.get("Content-Length")
+    return MediaProbe(
+        url=response.url or url,
+        size=int(length) if length and length.isdigit() else None,
+        accepts_ranges=response.headers.get("Accept-Ranges", "").lower() == "bytes",
+        content_type=response.headers.get("Content-Type"),
+    )
+
+
+def audio_content_type(ext: str | None) -> str:
+    return {"m4a": "audio/mp4", "mp4": "audio/mp4", "webm": "audio/webm", "mp3": "audio/mpeg"}.get(
+        ext, "application/octet-stream"
+    )
+
+
+def stream_to_blob(http: requests.Session, url: str, blob_name: str, headers: dict | None = None,
+                   size: int | None = None, block_size: int = AUDIO_BLOCK_SIZE,
+                   content_type: str | None = None) -> int:
+    """
+    Copy a remote file into a block blob and return the number of bytes written.
+
+    With a known size the file is fetched in block-sized Range requests (media CDNs throttle
+    long single responses), otherwise the body is streamed in one request. Either way at most
+    one block is buffered in memory.
+    """
+    headers = dict(headers or {})
+    writer = BlockBlobWriter(blob_name, block_size, content_type)
+
+    if size:
+        for start in range(0, size, block_size):
+            end = min(start + block_size, size) - 1
+            with http.get(url, headers={**headers, "Range": f"bytes={start}-{end}"},
+                          timeout=DOWNLOADER_HTTP_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                full_body = response.status_code != 206
+                if full_body and start:
+                    raise ValueError(f"Server ignored Range request for {blob_name}")
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    writer.write(chunk)
+            if full_body:
+                # Range not supported, the first response already carried the whole file
+                break
+    else:
+        with http.get(url, headers=headers, timeout=DOWNLOADER_HTTP_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                writer.write(chunk)
+
+    writer.close()
+    return writer.size
+
+
+def parallel_ranges_to_blob(http: requests.Session, url: str, blob_name: str, size: int, workers: int,
+                            block_size: int = AUDIO_BLOCK_SIZE, content_type: str | None = None) -> int:
+    """
+    Fetch a file of known size as block-sized byte ranges on a thread pool, staging each range
+    as block i of blob_name, then commit the blocks in order. Memory is bounded by
+    workers * block_size no matter how large the file is. The first failed range aborts
+    the remaining ones and nothing is committed.
+    """
+    block_count = (size + block_size - 1) // block_size
+    failed = threading.Event()
+
+    def fetch_block(index: int) -> int:
+        start = index * block_size
+        end = min(start + block_size, size) - 1
+        response = http.get(url, headers={"Range": f"bytes={start}-{end}"}, timeout=DOWNLOADER_HTTP_TIMEOUT)
+        response.raise_for_status()
+        if response.status_code != 206 or len(response.content) != end - start + 1:
+            raise ValueError(f"Bad range response for bytes {start}-{end} of {blob_name}")
+        if failed.is_set():
+            return 0
+        stage_blob_block(blob_name, index, response.content)
+        return len(response.content)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="range-fetch") as executor:
+        # pool threads do not inherit the caller's context, copy it so storage round-trips stay attributed
+        futures = [executor.submit(contextvars.copy_context().run, fetch_block, index) for index in range(block_count)]
+        written = 0
+        try:
+            for future in as_completed(futures):
+                written += future.result()
+        except BaseException:
+            # fail fast: queued ranges are dropped and in-flight ones stop before staging,
+            # the blocks already staged are never committed and expire with the uncommitted list
+            failed.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    commit_blob_blocks(blob_name, block_count, content_type)
+    return written
@@ -0,0 +1,94 @@
+# downloader/rate_limit.py
+import time
+
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+from azure.data.tables import UpdateMode
+
+from ..shared.common import get_table_client
+from ..shared.config import RATE_LIMIT_TABLE
+from ..shared.logs import logging
+
+_BUCKET_PARTITION = "bucket"
+_MAX_CONFLICTS = 5
+
+
+class RateLimited(Exception):
+    """No token within the allowed wait; retry_after is the estimated wait in seconds"""
+
+    def __init__(self, source: str, retry_after: float):
+        super().__init__(f"Rate limit for {source} exhausted, retry in {retry_after:.1f}s")
+        self.source = source
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every downloader worker through one Table storage row, so a source
+    sees at most rate requests per second in total (bursts up to capacity).
+
+    The row holds the token count and the time it was last refilled; each take is an
+    ETag-conditional update, a lost race simply re-reads the row. Storage failures let the
+    request through, the limiter must never stop the pipeline on its own.
+    """
+
+    def __init__(self, source: str, rate: float, capacity: float):
+        self.source = source
+        self.rate = rate
+        self.capacity = capacity
+
+    def try_acquire(self) -> float:
+        """Take one token. Returns 0 on success, otherwise the seconds until one is available."""
+        if self.rate <= 0:
+            return 0
+
+        try:
+            table = get_table_client(RATE_LIMIT_TABLE)
+            for _ in range(_MAX_CONFLICTS):
+                now = time.time()
+                try:
+                    entity = table.get_entity(_BUCKET_PARTITION, self.source)
+                except ResourceNotFoundError:
+                    try:
+                        table.create_entity(
+                            {"PartitionKey": _BUCKET_PARTITION, "RowKey": self.source,
+                             "tokens": self.capacity - 1, "updated": now}
+                        )
+                        return 0
+                    except ResourceExistsError:
+                        continue
+
+                elapsed = max(0.0, now - entity["updated"])
+                tokens = min(self.capacity, entity["tokens"] + elapsed * self.rate)
+                if tokens < 1:
+                    return (1 - tokens) / self.rate
+
+                entity["tokens"] = tokens - 1
+                entity["updated"] = now
+                try:
+                    table.update_entity(
+                        entity,
+                        mode=UpdateMode.REPLACE,
+                        etag=entity.metadata["etag"],
+                        match_condition=MatchConditions.IfNotModified,
+                    )
+                    return 0
+                except ResourceModifiedError:
+                    continue
+        except Exception as e:
+            logging.warning(f"Rate limiter for {self.source} unavailable, not limiting: {e}")
+            return 0
+
+        # heavy contention: everybody else is taking tokens right now
+        return 1 / self.rate
+
+    def acquire(self, max_wait: float) -> None:
+        """Wait for a token up to max_wait seconds, raising RateLimited if it takes longer"""
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimited(self.source, wait)
+            time.sleep(wait)
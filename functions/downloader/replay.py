@@ -0,0 +1,158 @@
+# downloader/replay.py
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+import requests
+
+from ..shared.logs import logging
+
+INFO_DIR = "info"
+HTTP_DIR = "http"
+
+
+def _fixture_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:20]
+
+
+def write_info_fixture(fixture_dir: str | Path, url: str, info: dict) -> Path:
+    path = Path(fixture_dir) / INFO_DIR / f"{_fixture_key(url)}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"url": url, "info": info}, default=repr), encoding="utf-8")
+    return path
+
+
+def write_http_fixture(fixture_dir: str | Path, url: str, body: bytes) -> Path:
+    path = Path(fixture_dir) / HTTP_DIR / f"{_fixture_key(url)}.bin"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(body)
+    return path
+
+
+class _RecordingExtractor:
+
+    def __init__(self, ydl, fixture_dir: Path):
+        self._ydl = ydl
+        self._fixture_dir = fixture_dir
+
+    def extract_info(self, url, download=False, **kwargs):
+        info = self._ydl.extract_info(url, download=download, **kwargs)
+        sanitize = getattr(self._ydl, "sanitize_info", None)
+        write_info_fixture(self._fixture_dir, url, sanitize(info) if sanitize else info)
+        return info
+
+
+class _RecordingHttp:
+
+    def __init__(self, http, fixture_dir: Path):
+        self._http = http
+        self._fixture_dir = fixture_dir
+
+    def get(self, url, stream=False, **kwargs):
+        # the body is read whole so it can be saved; iter_content still works on it afterwards
+        response = self._http.get(url, **kwargs)
+        if response.status_code == 200:
+            write_http_fixture(self._fixture_dir, url, response.content)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._http, name)
+
+
+class RecordingSession:
+    """
+    Wraps a DownloaderSession and saves every extract_info result and every
+    plain GET body (subtitles) under fixture_dir, keyed by URL, for ReplaySession.
+    Meant for capturing fixtures, not for production traffic.
+    """
+
+    def __init__(self, session, fixture_dir: str | Path):
+        self._session = session
+        self.fixture_dir = Path(fixture_dir)
+        logging.info(f"Recording downloader traffic to {self.fixture_dir}")
+
+    def extractor(self, options: dict):
+        return _RecordingExtractor(self._session.extractor(options), self.fixture_dir)
+
+    @property
+    def http(self):
+        return _RecordingHttp(self._session.http, self.fixture_dir)
+
+
+class ReplayResponse:
+    """The parts of requests.Response the downloaders use, served from a fixture file"""
+
+    def __init__(self, url: str, body: bytes):
+        self.url = url
+        self.content = body
+        self.status_code = 200
+        self.headers = {"Content-Length": str(len(body))}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size: int = 1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+
+class _ReplayExtractor:
+
+    def __init__(self, replay: "ReplaySession"):
+        self._replay = replay
+
+    def extract_info(self, url, download=False, **kwargs):
+        return self._replay.info(url)
+
+
+class _ReplayHttp:
+
+    def __init__(self, replay: "ReplaySession"):
+        self._replay = replay
+
+    def get(self, url, **kwargs):
+        return ReplayResponse(url, self._replay.body(url))
+
+
+class ReplaySession:
+    """
+    Stand-in for DownloaderSession that answers from fixtures written by RecordingSession
+    (or write_info_fixture / write_http_fixture), so the downloaders run without the network.
+    Fixtures are read once and kept in memory; a URL that was never recorded raises
+    requests.ConnectionError, like an unreachable host would.
+    """
+
+    def __init__(self, fixture_dir: str | Path):
+        self.fixture_dir = Path(fixture_dir)
+        self._infos = {}
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self.http = _ReplayHttp(self)
+
+    def extractor(self, options: dict) -> _ReplayExtractor:
+        return _ReplayExtractor(self)
+
+    def info(self, url: str) -> dict:
+        info = self._load(self._infos, url, INFO_DIR, ".json", lambda path: json.loads(path.read_text("utf-8"))["info"])
+        # extractors hand out a fresh dict per call
+        return json.loads(json.dumps(info))
+
+    def body(self, url: str) -> bytes:
+        return self._load(self._bodies, url, HTTP_DIR, ".bin", Path.read_bytes)
+
+    def _load(self, cache: dict, url: str, subdir: str, suffix: str, read):
+        key = _fixture_key(url)
+        with self._lock:
+            if key not in cache:
+                path = self.fixture_dir / subdir / f"{key}{suffix}"
+                if not path.exists():
+                    raise requests.ConnectionError(f"No recorded response for {url} in {self.fixture_dir}")
+                cache[key] = read(path)
+            return cache[key]
@@ -0,0 +1,69 @@
+# downloader/session.py
+import json
+import threading
+
+import requests
+import yt_dlp
+
+from ..shared.config import DOWNLOADER_POOL_SIZE, DOWNLOADER_RECORD_DIR
+
+
+class DownloaderSession:
+    """
+    Long-lived network state shared by every downloader on this worker.
+
+    yt-dlp extractors are cached per thread and per option set, so extractor
+    initialization and the extractor's own keep-alive connections survive between
+    jobs (YoutubeDL instances are not safe to share across threads). Plain HTTP
+    fetches (subtitles, media) go through one pooled keep-alive requests session.
+    """
+
+    def __init__(self, pool_size: int):
+        self.pool_size = pool_size
+        self._local = threading.local()
+        self._http = None
+        self._lock = threading.Lock()
+
+    def extractor(self, options: dict) -> yt_dlp.YoutubeDL:
+        extractors = getattr(self._local, "extractors", None)
+        if extractors is None:
+            extractors = self._local.extractors = {}
+
+        key = json.dumps(options, sort_keys=True, default=repr)
+        ydl = extractors.get(key)
+        if ydl is None:
+            # YoutubeDL fills in defaults on the params dict it is given
+            ydl = yt_dlp.YoutubeDL(dict(options))
+            extractors[key] = ydl
+        return ydl
+
+    @property
+    def http(self) -> requests.Session:
+        if self._http is None:
+            with self._lock:
+                if self._http is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._http = session
+        return self._http
+
+
+_session = DownloaderSession(DOWNLOADER_POOL_SIZE)
+if DOWNLOADER_RECORD_DIR:
+    from .replay import RecordingSession
+    _session = RecordingSession(_session, DOWNLOADER_RECORD_DIR)
+
+
+def get_downloader_session() -> DownloaderSession:
+    return _session
+
+
+def set_downloader_session(session) -> DownloaderSession:
+    """
+    Swap the worker's session (e.g. for a ReplaySession) and return the previous one.
+    """
+    global _session
+    previous, _session = _session, session
+    return previous
@@ -1,16 +1,56 @@
 # downloader/strategies.py
+import asyncio
+import posixpath
+import time
 from abc import ABC, abstractmethod
-
-import yt_dlp
-
-from ..shared.common import write_blob, enqueue_message, read_job_metadata, write_job_metadata
+from contextlib import contextmanager
+from typing import NamedTuple
+from urllib.parse import unquote, urlparse
+
+from .json3 import parse_json3
+from .media import audio_content_type, parallel_ranges_to_blob, probe_media, select_audio_format, stream_to_blob
+from .rate_limit import TokenBucket
+from .session import get_downloader_session
+from ..shared.common import awrite_blob, complete_parent_job, enqueue_message, read_job_metadata, \
+    transition_job_status, run_async, submit_async, write_blob
 from ..shared.config import (
+    AUDIO_BLOCK_SIZE,
+    AUDIO_FALLBACK_ENABLED,
+    AUDIO_FILENAME,
+    DIRECT_MEDIA_WORKERS,
+    DOWNLOAD_RATE_BURST,
+    DOWNLOAD_RATE_LIMIT,
+    DOWNLOAD_RATE_MAX_WAIT,
+    DOWNLOADED_QUEUE,
+    DOWNLOADER_HTTP_TIMEOUT,
+    PLAYLIST_CONCURRENCY,
+    PLAYLIST_MAX_ENTRIES,
+    PLAYLIST_STAGGER,
+    SEGMENTS_FILENAME,
     TRANSCRIBED_QUEUE,
     VIDEO_METADATA_FILENAME,
     TRANSCRIPT_FILENAME
 )
 from ..shared.job_status import JobStatus
 from ..shared.logs import logging
+from ..shared.submission import submit_jobs
+from ..shared.video_url import YOUTUBE, canonical_video_id, canonical_video_url
+
+
+# statuses a job can be in while a downloader works on it
+DOWNLOADING_STATUSES = (JobStatus.CREATED, JobStatus.METADATA_READY)
+
+# one bucket per source, shared with every other worker through Table storage
+YOUTUBE_RATE_LIMITER = TokenBucket(YOUTUBE, DOWNLOAD_RATE_LIMIT, DOWNLOAD_RATE_BURST)
+
+
+class AudioFallback(NamedTuple):
+    """
+    Returned by YTDownloader.process() for videos without English captions: the caller hands
+    the job to YTAudioDownloader.from_fallback, which reuses the extracted info.
+    """
+    info: dict
+    metadata_published: bool
 
 
 class BaseDownloader(ABC):
@@ -21,30 +61,56 @@ class BaseDownloader(ABC):
     the common interface for blob storage and queue management.
     """
 
+    # TokenBucket guarding the source, taken once before every _download
+    rate_limiter = None
+
     def __init__(self, job_id: str, url: str):
         self.job_id = job_id
         self.url = url
         self.job_metadata = None
+        self.session = get_downloader_session()
+        self.timings = {}
 
-    def process(self):
+    def process(self) -> AudioFallback | None:
         """
         Main entry point. Loads metadata, executes download,
         writes results, and enqueues to appropriate queue.
+        Returns an AudioFallback when the job has to continue as an audio download.
         """
         try:
             self.job_metadata = read_job_metadata(self.job_id)
-            result = self._download()
-
-            if result is None:
-                return
-
-            self._save_results(result)
-            self._finalize()
+            if self.rate_limiter is not None:
+                with self._timed("rate_limit"):
+                    self.rate_limiter.acquire(DOWNLOAD_RATE_MAX_WAIT)
+            with self._timed("download"):
+                result = self._download()
+
+            if result is None or isinstance(result, AudioFallback):
+                return result
+
+            with self._timed("save"):
+                self._save_results(result)
+            with self._timed("finalize"):
+                self._finalize()
             logging.info(f"Downloader processed job {self.job_id}")
 
         except Exception as e:
             logging.error(f"Error in download processing for job {self.job_id}: {e}")
             raise
+        finally:
+            phases = " ".join(f"{phase}={seconds * 1000:.0f}ms" for phase, seconds in self.timings.items())
+            logging.info(f"Downloader timings for job {self.job_id}: {phases}")
+
+    @contextmanager
+    def _timed(self, phase: str):
+        """
+        Accumulate wall time spent in a phase under self.timings[phase].
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = self.timings.get(phase, 0.0) + time.perf_counter() - start
 
     @abstractmethod
     def _download(self) -> dict:
@@ -70,12 +136,53 @@ class BaseDownloader(ABC):
         pass
 
 
+SUBTITLE_CHUNK_SIZE = 64 * 1024
+
+YT_AUDIO_OPTIONS = {
+    'skip_download': True,
+    'format': 'bestaudio/best',
+    'quiet': True,
+    'no_warnings': True,
+}
+
+YT_PLAYLIST_OPTIONS = {
+    'skip_download': True,
+    'extract_flat': 'in_playlist',
+    'playlistend': PLAYLIST_MAX_ENTRIES,
+    'quiet': True,
+    'no_warnings': True,
+}
+
+YT_TRANSCRIPT_OPTIONS = {
+    'skip_download': True,
+    'writesubtitles': True,
+    'writeautomaticsub': True,
+    'subtitleslangs': ['en'],
+    'subtitlesformat': 'json3',
+    'quiet': True,
+    'no_warnings': True,
+}
+
+
+def _yt_video_metadata(info: dict, **fields) -> dict:
+    return {
+        'title': info.get('title'),
+        'duration': info.get('duration'),
+        'uploader': info.get('uploader'),
+        'upload_date': info.get('upload_date'),
+        'view_count': info.get('view_count'),
+        **fields,
+    }
+
+
 class YTDownloader(BaseDownloader):
     """
     YouTube downloader - extracts transcripts directly without downloading audio.
     Skips DOWNLOADED_QUEUE and goes straight to TRANSCRIBED_QUEUE.
     """
 
+    rate_limiter = YOUTUBE_RATE_LIMITER
+
     def _download(self) -> dict:
         """
         Download transcript using yt-dlp.
@@ -83,100 +190,349 @@ class YTDownloader(BaseDownloader):
         """
         logging.info(f"Downloading YouTube transcript for job {self.job_id}")
 
-        ydl_opts = {
-            'skip_download': True,
-            'writesubtitles': True,
-            'writeautomaticsub': True,
-            'subtitleslangs': ['en'],
-            'subtitlesformat': 'json3',
-            'quiet': True,
-            'no_warnings': True,
-        }
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        ydl = self.session.extractor(YT_TRANSCRIPT_OPTIONS)
+        with self._timed("extract_info"):
             info = ydl.extract_info(self.url, download=False)
 
-            subtitles = info.get('subtitles', {})
-            auto_captions = info.get('automatic_captions', {})
-
-            transcript_data = None
-            subtitle_type = None
-
-            if 'en' in subtitles:
-                subtitle_type = 'manual'
-                for sub in subtitles['en']:
-                    if sub.get('ext') == 'json3':
-                        transcript_data = sub
-                        break
-
-            if not transcript_data and 'en' in auto_captions:
-                subtitle_type = 'auto'
-                for sub in auto_captions['en']:
-                    if sub.get('ext') == 'json3':
-                        transcript_data = sub
-                        break
-
-            if not transcript_data:
-                logging.info(f"No English subtitles available for job {self.job_id}")
-                self.job_metadata["status"] = JobStatus.NO_SPEECH.value
-                write_job_metadata(
-                    self.job_id,
-                    self.job_metadata.get("url"),
-                    self.job_metadata.get("status")
-                )
-                logging.info(f"YTDownloader updated job {self.job_id} metadata to NO_SPEECH")
-                return None
-
-            import urllib.request
-            with urllib.request.urlopen(transcript_data['url']) as response:
-                import json
-                subtitle_json = json.loads(response.read().decode('utf-8'))
+        subtitles = info.get('subtitles', {})
+        auto_captions = info.get('automatic_captions', {})
+
+        transcript_data = None
+        subtitle_type = None
+
+        if 'en' in subtitles:
+            subtitle_type = 'manual'
+            for sub in subtitles['en']:
+                if sub.get('ext') == 'json3':
+                    transcript_data = sub
+                    break
+
+        if not transcript_data and 'en' in auto_captions:
+            subtitle_type = 'auto'
+            for sub in auto_captions['en']:
+                if sub.get('ext') == 'json3':
+                    transcript_data = sub
+                    break
+
+        # publish the video metadata first, so the title can be shown while the transcript is fetched
+        video_metadata = _yt_video_metadata(info, subtitle_type=subtitle_type)
+        published = submit_async(self._publish_video_metadata(video_metadata))
+
+        if not transcript_data:
+            metadata_published = self._wait_for_metadata(published)
+            if AUDIO_FALLBACK_ENABLED:
+                logging.info(f"No English subtitles for job {self.job_id}, falling back to audio download")
+                return AudioFallback(info, metadata_published)
+
+            logging.info(f"No English subtitles available for job {self.job_id}")
+            self.job_metadata = transition_job_status(self.job_id, DOWNLOADING_STATUSES, JobStatus.NO_SPEECH)
+            logging.info(f"YTDownloader updated job {self.job_id} metadata to NO_SPEECH")
+            return None
+
+        # the body is parsed while it streams in, so subtitle_fetch covers both
+        with self._timed("subtitle_fetch"):
+            with self.session.http.get(transcript_data['url'], timeout=DOWNLOADER_HTTP_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                transcript_text, segments = parse_json3(response.iter_content(chunk_size=SUBTITLE_CHUNK_SIZE))
+
+        with self._timed("metadata_wait"):
+            metadata_published = self._wait_for_metadata(published)
+
+        return {
+            'transcript': transcript_text,
+            'segments': segments,
+            'video_metadata': video_metadata,
+            'metadata_published': metadata_published,
+        }
 
-            transcript_text = self._parse_json3_transcript(subtitle_json)
+    async def _publish_video_metadata(self, video_metadata: dict):
+        """
+        Write video_metadata.json and move the job to METADATA_READY.
+        """
+        await awrite_blob(
+            f"results/{self.job_id}/{VIDEO_METADATA_FILENAME}",
+            {
+                "video-metadata": video_metadata
+            },
+        )
+        self.job_metadata = await asyncio.to_thread(
+            transition_job_status, self.job_id, (JobStatus.CREATED,), JobStatus.METADATA_READY
+        )
+        logging.info(f"YTDownloader published job {self.job_id} video metadata early")
 
-            video_metadata = {
-                'title': info.get('title'),
-                'duration': info.get('duration'),
-                'uploader': info.get('uploader'),
-                'upload_date': info.get('upload_date'),
-                'view_count': info.get('view_count'),
-                'subtitle_type': subtitle_type,
-            }
+    def _wait_for_metadata(self, published) -> bool:
+        """
+        Join the early publication. A failure only costs the early first paint,
+        the metadata is then written again with the other results.
+        """
+        try:
+            published.result()
+            return True
+        except Exception as e:
+            logging.warning(f"Early video metadata publication failed for job {self.job_id}: {e}")
+            return False
 
-            return {
-                'transcript': transcript_text,
-                'video_metadata': video_metadata,
-            }
+    def _save_results(self, result: dict):
+        """
+        Save transcript and segment table to blob storage (video metadata too, if the
+        early publication failed). All blobs are uploaded concurrently.
+        """
+        run_async(self._upload_results(result))
+        logging.info(f"YTDownloader saved job {self.job_id} transcript and segments to blob")
+
+    async def _upload_results(self, result: dict):
+        uploads = [
+            awrite_blob(
+                f"results/{self.job_id}/{TRANSCRIPT_FILENAME}",
+                {
+                    "id": self.job_id,
+                    "transcript": result['transcript'],
+                },
+            ),
+            awrite_blob(
+                f"results/{self.job_id}/{SEGMENTS_FILENAME}",
+                {
+                    "id": self.job_id,
+                    **result['segments'].to_dict(),
+                },
+            ),
+        ]
+        if not result['metadata_published']:
+            uploads.append(
+                awrite_blob(
+                    f"results/{self.job_id}/{VIDEO_METADATA_FILENAME}",
+                    {
+                        "video-metadata": result['video_metadata']
+                    },
+                )
+            )
+        await asyncio.gather(*uploads)
 
-    def _parse_json3_transcript(self, subtitle_json: dict) -> str:
+    def _finalize(self):
         """
-        Parse json3 subtitle format and extract clean text.
+        Update status to TRANSCRIBED and enqueue to TRANSCRIBED_QUEUE.
         """
-        events = subtitle_json.get('events', [])
-        transcript_parts = []
+        self.job_metadata = transition_job_status(self.job_id, DOWNLOADING_STATUSES, JobStatus.TRANSCRIBED)
+        if self.job_metadata is None:
+            logging.warning(f"YTDownloader skipped enqueue, job {self.job_id} has moved past TRANSCRIBED")
+            return
+        logging.info(f"YTDownloader updated job {self.job_id} metadata to TRANSCRIBED")
+
+        msg = {"id": self.job_id}
+        enqueue_message(msg, queue_name=TRANSCRIBED_QUEUE)
+        logging.info(f"YTDownloader queued job {self.job_id} to TRANSCRIBED_QUEUE")
 
-        for event in events:
-            segs = event.get('segs')
-            if segs:
-                for seg in segs:
-                    text = seg.get('utf8', '').strip()
-                    if text:
-                        transcript_parts.append(text)
 
-        return ' '.join(transcript_parts)
+class AudioDownloader(BaseDownloader):
+    """
+    Base for strategies that put the media itself into results/{id}/audio.mp3 during _download,
+    so speech_to_text transcribes it. Saves video metadata and hands the job to DOWNLOADED_QUEUE.
+    """
 
     def _save_results(self, result: dict):
         """
-        Save transcript and video metadata to blob storage.
+        The audio is already in blob storage, only video metadata is left to save.
         """
         write_blob(
-            f"results/{self.job_id}/{TRANSCRIPT_FILENAME}",
+            f"results/{self.job_id}/{VIDEO_METADATA_FILENAME}",
             {
-                "id": self.job_id,
-                "transcript": result['transcript'],
+                "video-metadata": result['video_metadata']
             },
         )
-        logging.info(f"YTDownloader saved job {self.job_id} transcript to blob")
+        logging.info(f"{type(self).__name__} saved job {self.job_id} video metadata to blob")
+
+    def _finalize(self):
+        """
+        Update status to DOWNLOADED and enqueue to DOWNLOADED_QUEUE.
+        """
+        self.job_metadata = transition_job_status(self.job_id, DOWNLOADING_STATUSES, JobStatus.DOWNLOADED)
+        if self.job_metadata is None:
+            logging.warning(f"{type(self).__name__} skipped enqueue, job {self.job_id} has moved past DOWNLOADED")
+            return
+        logging.info(f"{type(self).__name__} updated job {self.job_id} metadata to DOWNLOADED")
+
+        enqueue_message({"id": self.job_id}, queue_name=DOWNLOADED_QUEUE)
+        logging.info(f"{type(self).__name__} queued job {self.job_id} to DOWNLOADED_QUEUE")
+
+
+class YTAudioDownloader(AudioDownloader):
+    """
+    YouTube fallback for videos without English captions - streams only the audio track
+    into blob storage and hands the job to speech_to_text through DOWNLOADED_QUEUE.
+    """
+
+    rate_limiter = YOUTUBE_RATE_LIMITER
+
+    def __init__(self, job_id: str, url: str, info: dict | None = None):
+        super().__init__(job_id, url)
+        self.info = info
+        self.metadata_published = False
+
+    @classmethod
+    def from_fallback(cls, job_id: str, url: str, fallback: AudioFallback) -> "YTAudioDownloader":
+        """
+        Take over a job YTDownloader found no captions for. Its rate limiter token already
+        covers this download, and its early video metadata is kept instead of written again.
+        """
+        downloader = cls(job_id, url, info=fallback.info)
+        downloader.rate_limiter = None
+        downloader.metadata_published = fallback.metadata_published
+        return downloader
+
+    def _download(self) -> dict:
+        """
+        Stream the audio into results/{id}/audio.mp3 in staged blocks.
+        Returns dict with video metadata, or None if the video has no audio stream.
+        """
+        logging.info(f"Downloading YouTube audio for job {self.job_id}")
+
+        info = self.info
+        if info is None:
+            ydl = self.session.extractor(YT_AUDIO_OPTIONS)
+            with self._timed("extract_info"):
+                info = ydl.extract_info(self.url, download=False)
+
+        audio_format = select_audio_format(info)
+        if audio_format is None:
+            logging.info(f"No downloadable audio stream for job {self.job_id}")
+            self.job_metadata = transition_job_status(self.job_id, DOWNLOADING_STATUSES, JobStatus.NO_SPEECH)
+            logging.info(f"YTAudioDownloader updated job {self.job_id} metadata to NO_SPEECH")
+            return None
+
+        # the blob keeps the name speech_to_text expects; ffmpeg detects the actual container
+        with self._timed("audio_fetch"):
+            size = stream_to_blob(
+                self.session.http,
+                audio_format['url'],
+                f"results/{self.job_id}/{AUDIO_FILENAME}",
+                headers=audio_format.get('http_headers'),
+                size=audio_format.get('filesize'),
+                content_type=audio_content_type(audio_format.get('ext')),
+            )
+        logging.info(f"YTAudioDownloader streamed {size} bytes of {audio_format.get('ext')} audio for job {self.job_id}")
+
+        return {
+            'video_metadata': _yt_video_metadata(info, subtitle_type=None, audio_format=audio_format.get('ext')),
+        }
+
+    def _save_results(self, result: dict):
+        """
+        Save the video metadata, unless YTDownloader published it already.
+        """
+        if self.metadata_published:
+            logging.info(f"YTAudioDownloader kept the published video metadata of job {self.job_id}")
+            return
+        super()._save_results(result)
+
+
+class DirectMediaDownloader(AudioDownloader):
+    """
+    Plain http(s) links to media files - fetched as parallel byte ranges when the server
+    supports Range, streamed otherwise, and stored for speech_to_text like YouTube audio.
+    """
+
+    def _download(self) -> dict:
+        """
+        Copy the file into results/{id}/audio.mp3 in staged blocks.
+        Returns dict with video metadata.
+        """
+        logging.info(f"Downloading direct media for job {self.job_id}")
+        blob_name = f"results/{self.job_id}/{AUDIO_FILENAME}"
+
+        with self._timed("probe"):
+            probe = probe_media(self.session.http, self.url)
+
+        with self._timed("audio_fetch"):
+            if probe.size and probe.accepts_ranges:
+                size = parallel_ranges_to_blob(
+                    self.session.http, probe.url, blob_name, probe.size, DIRECT_MEDIA_WORKERS,
+                    block_size=AUDIO_BLOCK_SIZE, content_type=probe.content_type,
+                )
+            else:
+                size = stream_to_blob(
+                    self.session.http, probe.url, blob_name,
+                    block_size=AUDIO_BLOCK_SIZE, content_type=probe.content_type,
+                )
+        logging.info(f"DirectMediaDownloader copied {size} bytes ({probe.content_type}) for job {self.job_id}")
+
+        return {
+            'video_metadata': {
+                'title': unquote(posixpath.basename(urlparse(self.url).path)),
+                'content_type': probe.content_type,
+                'size': size,
+                'subtitle_type': None,
+            },
+        }
+
+
+class PlaylistDownloader(BaseDownloader):
+    """
+    Playlist/channel fan-out - lists the videos with flat extraction (no per-video requests)
+    and submits one child job per video. The parent job only tracks its children and is
+    completed by whichever stage finishes its last child.
+    """
+
+    rate_limiter = YOUTUBE_RATE_LIMITER
+
+    def __init__(self, job_id: str, url: str):
+        super().__init__(job_id, url)
+        self.children = []
+        self.failed_children = 0
+
+    def _download(self) -> dict:
+        """
+        Enumerate the playlist entries.
+        Returns dict with the video ids and playlist metadata, or None if the playlist is empty.
+        """
+        logging.info(f"Expanding playlist for job {self.job_id}")
+
+        ydl = self.session.extractor(YT_PLAYLIST_OPTIONS)
+        with self._timed("extract_info"):
+            info = ydl.extract_info(self.url, download=False)
+
+        video_ids = []
+        for entry in info.get('entries') or ():
+            entry = entry or {}
+            video = canonical_video_id(entry.get('url') or '') or canonical_video_id(f"youtu.be/{entry.get('id')}")
+            if video:
+                video_ids.append(video[1])
+        video_ids = list(dict.fromkeys(video_ids))
+
+        if not video_ids:
+            logging.info(f"No videos found in playlist for job {self.job_id}")
+            self.job_metadata = transition_job_status(self.job_id, (JobStatus.CREATED,), JobStatus.NO_SPEECH)
+            logging.info(f"PlaylistDownloader updated job {self.job_id} metadata to NO_SPEECH")
+            return None
+
+        return {
+            'video_ids': video_ids,
+            'video_metadata': {
+                'title': info.get('title'),
+                'uploader': info.get('uploader') or info.get('channel'),
+                'playlist_count': len(video_ids),
+            },
+        }
+
+    def _save_results(self, result: dict):
+        """
+        Submit the child jobs and save the playlist metadata.
+        Child ids derive from the parent id, so a retried fan-out rewrites the same jobs.
+        Their queue messages are staggered so the source sees a steady trickle of downloads.
+        """
+        items = [
+            {
+                "id": f"{self.job_id}-{index:04d}",
+                "url": canonical_video_url(YOUTUBE, video_id),
+                "delay": int(index * PLAYLIST_STAGGER) or None,
+            }
+            for index, video_id in enumerate(result['video_ids'])
+        ]
+        jobs = run_async(submit_jobs(items, PLAYLIST_CONCURRENCY, parent_id=self.job_id))
+
+        self.children = [job["id"] for job in jobs if "error" not in job]
+        self.failed_children = len(jobs) - len(self.children)
+        if not self.children:
+            raise RuntimeError(f"Could not submit any child job of playlist job {self.job_id}")
 
         write_blob(
             f"results/{self.job_id}/{VIDEO_METADATA_FILENAME}",
@@ -184,20 +540,28 @@ class YTDownloader(BaseDownloader):
                 "video-metadata": result['video_metadata']
             },
         )
-        logging.info(f"YTDownloader saved job {self.job_id} video metadata to blob")
+        logging.info(
+            f"PlaylistDownloader submitted {len(self.children)} child jobs for job {self.job_id}, "
+            f"{self.failed_children} failed"
+        )
 
     def _finalize(self):
         """
-        Update status to TRANSCRIBED and enqueue to TRANSCRIBED_QUEUE.
+        Update status to DOWNLOADED and record the child jobs; nothing is enqueued for the parent.
         """
-        self.job_metadata["status"] = JobStatus.TRANSCRIBED.value
-        write_job_metadata(
+        self.job_metadata = transition_job_status(
             self.job_id,
-            self.job_metadata.get("url"),
-            self.job_metadata.get("status")
+            (JobStatus.CREATED,),
+            JobStatus.DOWNLOADED,
+            children=self.children,
+            failed_children=self.failed_children,
         )
-        logging.info(f"YTDownloader updated job {self.job_id} metadata to TRANSCRIBED")
-
-        msg = {"id": self.job_id}
-        enqueue_message(msg, queue_name=TRANSCRIBED_QUEUE)
-        logging.info(f"YTDownloader queued job {self.job_id} to TRANSCRIBED_QUEUE")
+        if self.job_metadata is None:
+            logging.warning(f"PlaylistDownloader could not record children, job {self.job_id} has moved on")
+            return
+        logging.info(f"PlaylistDownloader updated job {self.job_id} metadata to DOWNLOADED")
+
+        # children that reused earlier results, or finished before this point, completed nothing
+        completed = complete_parent_job(self.job_id)
+        if completed is not None:
+            self.job_metadata = completed
@@ -1,3 +1,4 @@
+import functools
 import json
 from pathlib import Path
 import torch
@@ -5,7 +6,10 @@ import torch
 from azure.functions import QueueMessage
 from transformers import pipeline
 
-from ..shared.common import write_blob, read_blob, read_job_metadata, write_job_metadata, write_failed_job_metadata
+from .summary import calculate_overall_sentiment, feature_verdicts, merge_after_part, read_manifest, \
+    read_transcript_part, summary_document, try_merge_parts, write_part_scores
+from ..shared.common import write_blob, read_blob, transition_job_status, write_failed_job_metadata, write_video_index, \
+    reset_round_trips, get_round_trips
 from ..shared.config import TRANSCRIPT_FILENAME, SUMMARY_FILENAME, MAX_DEQUEUE_COUNT
 from ..shared.job_status import JobStatus
 from ..shared.logs import logging
@@ -37,9 +41,12 @@ def extract_sentences(transcript):
     return sentences
 
 
-def analyze_sentiment(sentences, sentiment_model, feature_classifier, features):
+def score_sentences(sentences, sentiment_model, feature_classifier, features):
+    """
+    Per-sentence sentiment plus, for every feature, the scores of the sentences classified as about it.
+    """
     sentiment_series = []
-    feature_sentiments = {f: [] for f in features}
+    feature_scores = {f: [] for f in features}
 
     for s in sentences:
         result = sentiment_model(s)[0]
@@ -54,64 +61,35 @@ def analyze_sentiment(sentences, sentiment_model, feature_classifier, features):
                 cls = feature_classifier(s, candidate_labels=features)
                 top_feature, confidence = cls["labels"][0], cls["scores"][0]
                 if confidence > 0.3:
-                    feature_sentiments[top_feature].append(score)
+                    feature_scores[top_feature].append(score)
             except Exception:
                 continue
 
-    # 3. Aggregate & format sentiment by part
-    sentiment_by_part = {}
-    for f, scores in feature_sentiments.items():
-        if scores:
-            avg = sum(scores) / len(scores)
-            score_10 = round((avg + 1) * 5, 1)
-            if avg <= -0.5:
-                label = "NEGATIVE"
-            elif -0.5 < avg < 0.5:
-                label = "NEUTRAL"
-            else:
-                label = "POSITIVE"
-            sentiment_by_part[f] = {"score": score_10, "label": label}
-        else:
-            sentiment_by_part[f] = {"score": 5.0, "label": "NEUTRAL"}
+    return sentiment_series, feature_scores
 
-    return sentiment_series, sentiment_by_part
 
+def analyze_sentiment(sentences, sentiment_model, feature_classifier, features):
+    sentiment_series, feature_scores = score_sentences(sentences, sentiment_model, feature_classifier, features)
+    return sentiment_series, feature_verdicts(feature_scores)
 
-def calculate_overall_sentiment(sentiment_series):
-    # overall sentiment
-    overall_score = round(sum([x["score"] for x in sentiment_series]) / len(sentiment_series), 2)
-    overall_label = "NEUTRAL"
-    if overall_score > 0.5:
-        overall_label = "POSITIVE"
-    elif overall_score < -0.5:
-        overall_label = "NEGATIVE"
-
-    return overall_score, overall_label
 
 def save_results(job_id, overall_score, overall_label, sentiment_series, sentiment_by_part, device):
     # save results
     write_blob(
         f"results/{job_id}/{SUMMARY_FILENAME}",
-        {
-            "verdict": {"score": overall_score, "verdict": overall_label},
-            "sentiment_series_chart": {
-                "y": [s["score"] for s in sentiment_series],
-                "labels": [s["label"] for s in sentiment_series],
-            },
-            "sentiment_by_part": {
-                "device": device,
-                "features_verdict": sentiment_by_part
-            },
-        },
+        summary_document(overall_score, overall_label, sentiment_series, sentiment_by_part, device),
     )
 
 
 def update_job_metadata(job_id):
     try:
         logging.info(f"nlp saved job {job_id} summary to blob")
-        url = read_job_metadata(job_id).get("url")
-        write_job_metadata(job_id, url, JobStatus.DONE.value)
-        logging.info(f"nlp updated job {job_id} metadata to blob")
+        metadata = transition_job_status(job_id, (JobStatus.TRANSCRIBED,), JobStatus.DONE)
+        if metadata is not None:
+            logging.info(f"nlp updated job {job_id} metadata to blob")
+            if metadata.get("video_id"):
+                # later submissions of the same video reuse these results
+                write_video_index(metadata["platform"], metadata["video_id"], job_id)
     except Exception as e:
         logging.error(f"Error in metadata update: {e}")
 
@@ -131,47 +109,85 @@ def read_keywords():
 
     return device, features
 
+@functools.lru_cache(maxsize=1)
+def load_models():
+    """
+    Sentiment and zero-shot pipelines, built once per worker process: with incremental transcripts
+    one job is scored in several invocations.
+    """
+    if torch.cuda.is_available():
+        model_device = 0  # GPU
+        logging.info("CUDA available – using GPU for NLP models")
+    else:
+        model_device = -1  # CPU
+        logging.info("CUDA not available – using CPU for NLP models")
+
+    try:
+        sentiment_model = pipeline(
+            "sentiment-analysis",
+            model="distilbert/distilbert-base-uncased-finetuned-sst-2-english",
+            device=model_device
+        )
+        logging.info(f"Sentiment model initialized on {'GPU' if model_device == 0 else 'CPU'}")
+    except Exception as e:
+        logging.error(f"Failed to initialize sentiment model: {e}")
+        raise
+
+    try:
+        feature_classifier = pipeline(
+            "zero-shot-classification",
+            model="facebook/bart-large-mnli",
+            device=model_device
+        )
+        logging.info(f"Zero-shot classifier initialized on {'GPU' if model_device == 0 else 'CPU'}")
+    except Exception as e:
+        logging.error(f"Failed to initialize zero-shot classifier: {e}")
+        raise
+
+    return sentiment_model, feature_classifier
+
+
+def process_transcript(job_id):
+    transcript = read_blob(f"results/{job_id}/{TRANSCRIPT_FILENAME}")
+    device, features = read_keywords()
+    sentiment_model, feature_classifier = load_models()
+
+    sentences = extract_sentences(transcript)
+
+    sentiment_series, sentiment_by_part = analyze_sentiment(sentences, sentiment_model, feature_classifier, features)
+    overall_score, overall_label = calculate_overall_sentiment(sentiment_series)
+    logging.info(f"Sentiment was estimated. Sentiment overall label: {overall_label}. Sentiment by part: {sentiment_by_part}")
+    save_results(job_id, overall_score, overall_label, sentiment_series, sentiment_by_part, device)
+    return overall_label
+
+
+def process_part(job_id, index):
+    part = read_transcript_part(job_id, index)
+    _, features = read_keywords()
+    sentiment_model, feature_classifier = load_models()
+
+    sentences = [s.strip() for s in part.get("transcript", "").split(".") if s.strip()]
+    sentiment_series, feature_scores = score_sentences(sentences, sentiment_model, feature_classifier, features)
+    write_part_scores(job_id, index, sentiment_series, feature_scores)
+    logging.info(f"nlp scored part {index} of job {job_id}: {len(sentences)} sentences")
+
+
 def main(msg: QueueMessage):
     job_id = parse_id(msg)
+    reset_round_trips()
     try:
-        transcript = read_blob(f"results/{job_id}/{TRANSCRIPT_FILENAME}")
-        device, features = read_keywords()
-
-        if torch.cuda.is_available():
-            model_device = 0  # GPU
-            logging.info("CUDA available – using GPU for NLP models")
+        part = msg.get_json().get("part")
+        if part is not None:
+            process_part(job_id, part)
+            overall_label = merge_after_part(job_id, read_keywords()[0])
+        elif read_manifest(job_id) is not None:
+            # the transcript arrived in parts, the summary is merged from their scores
+            overall_label = try_merge_parts(job_id, read_keywords()[0])
         else:
-            model_device = -1  # CPU
-            logging.info("CUDA not available – using CPU for NLP models")
-
-        try:
-            sentiment_model = pipeline(
-                "sentiment-analysis",
-                model="distilbert/distilbert-base-uncased-finetuned-sst-2-english",
-                device=model_device
-            )
-            logging.info(f"Sentiment model initialized on {'GPU' if model_device == 0 else 'CPU'}")
-        except Exception as e:
-            logging.error(f"Failed to initialize sentiment model: {e}")
-            raise
-
-        try:
-            feature_classifier = pipeline(
-                "zero-shot-classification",
-                model="facebook/bart-large-mnli",
-                device=model_device
-            )
-            logging.info(f"Zero-shot classifier initialized on {'GPU' if model_device == 0 else 'CPU'}")
-        except Exception as e:
-            logging.error(f"Failed to initialize zero-shot classifier: {e}")
-            raise
-
-        sentences = extract_sentences(transcript)
-
-        sentiment_series, sentiment_by_part = analyze_sentiment(sentences, sentiment_model, feature_classifier, features)
-        overall_score, overall_label = calculate_overall_sentiment(sentiment_series)
-        logging.info(f"Sentiment was estimated. Sentiment overall label: {overall_label}. Sentiment by part: {sentiment_by_part}")
-        save_results(job_id, overall_score, overall_label, sentiment_series, sentiment_by_part, device)
+            overall_label = process_transcript(job_id)
+
+        if overall_label is None:
+            return
         update_job_metadata(job_id)
 
         logging.info(f"nlp processed job {job_id}: {overall_label}")
@@ -182,4 +198,6 @@ def main(msg: QueueMessage):
             write_failed_job_metadata(job_id)
             logging.error(f"Failed to nlp job {job_id}")
 
-        raise
\ No newline at end of file
+        raise
+    finally:
+        logging.info(f"nlp job {job_id} storage round-trips: {get_round_trips()}")
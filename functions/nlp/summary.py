@@ -0,0 +1,125 @@
+# nlp/summary.py
+from ..shared.common import aread_many, read_blob, read_job_metadata, run_async, write_blob
+from ..shared.config import SUMMARY_FILENAME, SUMMARY_PART_FILENAME, TRANSCRIPT_MANIFEST_FILENAME, \
+    TRANSCRIPT_PART_FILENAME
+from ..shared.job_status import JobStatus
+from ..shared.logs import logging
+
+
+def feature_verdicts(feature_scores: dict) -> dict:
+    """Average each feature's sentence scores into a 0-10 score and a label"""
+    sentiment_by_part = {}
+    for f, scores in feature_scores.items():
+        if scores:
+            avg = sum(scores) / len(scores)
+            score_10 = round((avg + 1) * 5, 1)
+            if avg <= -0.5:
+                label = "NEGATIVE"
+            elif -0.5 < avg < 0.5:
+                label = "NEUTRAL"
+            else:
+                label = "POSITIVE"
+            sentiment_by_part[f] = {"score": score_10, "label": label}
+        else:
+            sentiment_by_part[f] = {"score": 5.0, "label": "NEUTRAL"}
+    return sentiment_by_part
+
+
+def calculate_overall_sentiment(sentiment_series):
+    # overall sentiment
+    overall_score = round(sum([x["score"] for x in sentiment_series]) / len(sentiment_series), 2)
+    overall_label = "NEUTRAL"
+    if overall_score > 0.5:
+        overall_label = "POSITIVE"
+    elif overall_score < -0.5:
+        overall_label = "NEGATIVE"
+
+    return overall_score, overall_label
+
+
+def summary_document(overall_score, overall_label, sentiment_series, sentiment_by_part, device) -> dict:
+    return {
+        "verdict": {"score": overall_score, "verdict": overall_label},
+        "sentiment_series_chart": {
+            "y": [s["score"] for s in sentiment_series],
+            "labels": [s["label"] for s in sentiment_series],
+        },
+        "sentiment_by_part": {
+            "device": device,
+            "features_verdict": sentiment_by_part
+        },
+    }
+
+
+# INCREMENTAL TRANSCRIPTS
+# speech_to_text publishes long transcripts as parts plus a manifest; every part is scored on its
+# own (raw sentence scores, not averages, so parts can be merged exactly) and the summary is built
+# once the manifest is complete and every part has been scored.
+def read_manifest(job_id: str) -> dict | None:
+    try:
+        return read_blob(f"results/{job_id}/{TRANSCRIPT_MANIFEST_FILENAME}")
+    except Exception:
+        return None
+
+
+def read_transcript_part(job_id: str, index: int) -> dict:
+    return read_blob(f"results/{job_id}/{TRANSCRIPT_PART_FILENAME.format(index=index)}")
+
+
+def write_part_scores(job_id: str, index: int, sentiment_series: list, feature_scores: dict):
+    write_blob(
+        f"results/{job_id}/{SUMMARY_PART_FILENAME.format(index=index)}",
+        {"index": index, "sentiment_series": sentiment_series, "feature_scores": feature_scores},
+    )
+
+
+def merge_part_scores(parts: list[dict]) -> tuple[list, dict]:
+    """Concatenate the parts' sentence scores in part order"""
+    sentiment_series = []
+    feature_scores = {}
+    for part in sorted(parts, key=lambda p: p["index"]):
+        sentiment_series.extend(part["sentiment_series"])
+        for f, scores in part["feature_scores"].items():
+            feature_scores.setdefault(f, []).extend(scores)
+    return sentiment_series, feature_scores
+
+
+def try_merge_parts(job_id: str, device: str) -> str | None:
+    """
+    Write summary.json from the part scores if the transcript is complete and every part has been
+    scored. Called on the final message, and after a part only through merge_after_part.
+    Returns the overall label when the summary was written, None if parts are still missing.
+    """
+    manifest = read_manifest(job_id)
+    if not manifest or not manifest.get("complete"):
+        return None
+
+    names = [f"results/{job_id}/{SUMMARY_PART_FILENAME.format(index=i)}" for i in range(manifest["total"])]
+    parts = run_async(aread_many(names, return_exceptions=True))
+    missing = sum(isinstance(part, BaseException) for part in parts)
+    if missing:
+        logging.info(f"nlp job {job_id} waits for {missing} of {len(parts)} transcript parts")
+        return None
+
+    sentiment_series, feature_scores = merge_part_scores(parts)
+    if not sentiment_series:
+        raise ValueError("Transcript missing or empty.")
+    overall_score, overall_label = calculate_overall_sentiment(sentiment_series)
+    write_blob(
+        f"results/{job_id}/{SUMMARY_FILENAME}",
+        summary_document(overall_score, overall_label, sentiment_series, feature_verdicts(feature_scores), device),
+    )
+    logging.info(f"nlp merged {len(parts)} transcript parts of job {job_id}")
+    return overall_label
+
+
+def merge_after_part(job_id: str, device: str) -> str | None:
+    """
+    Merge from a part message, but only once speech_to_text has marked the job TRANSCRIBED: before
+    that the final message is still to come, finds every part scored and merges on its own (and the
+    job could not move to DONE yet). The part scorer reads the status after writing its scores and
+    the final message reads the scores after TRANSCRIBED was written, so one of them always merges.
+    """
+    if read_job_metadata(job_id).get("status") != JobStatus.TRANSCRIBED.value:
+        return None
+    return try_merge_parts(job_id, device)
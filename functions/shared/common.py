@@ -1,75 +1,659 @@
+import asyncio
+import base64
+import concurrent.futures
 import json
 import logging
+import threading
+import weakref
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
 
-from azure.storage.blob import BlobServiceClient
-from azure.storage.queue import QueueClient, BinaryBase64EncodePolicy
+import aiohttp
+import requests
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+from azure.data.tables import TableServiceClient, UpdateMode
+from azure.core.pipeline.transport import AioHttpTransport, RequestsTransport
+from azure.storage.blob import BlobBlock, BlobProperties, BlobServiceClient, ContentSettings
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+from azure.storage.queue import QueueServiceClient, BinaryBase64EncodePolicy
+from azure.storage.queue.aio import QueueServiceClient as AsyncQueueServiceClient
 
-from .job_status import JobStatus
-from ..shared.config import JOB_METADATA_FILENAME, STORAGE_CONN, RESULTS_CONTAINER, VIDEO_METADATA_FILENAME
+from .compression import CODEC_METADATA_KEY, IDENTITY, compress, decompress, resolve_codec
+from .job_status import ACTIVE_STATUSES, TERMINAL_STATUSES, JobStatus
+from ..shared.config import (
+    BLOB_CODEC,
+    BLOB_COMPRESSION_MIN_BYTES,
+    DEDUP_MAX_AGE,
+    JOB_INDEX_ENABLED,
+    JOB_INDEX_TABLE,
+    JOB_METADATA_CACHE_SIZE,
+    JOB_METADATA_FILENAME,
+    STORAGE_CONN,
+    STORAGE_POOL_SIZE,
+    RESULTS_CONTAINER,
+    VIDEO_METADATA_FILENAME,
+)
+
+
+# STORAGE CLIENT REGISTRY
+# One service client per connection string, shared by every invocation on the worker.
+# Containers and queues are only created once per process instead of on every call.
+_registry_lock = threading.Lock()
+_blob_service_clients: dict[str, BlobServiceClient] = {}
+_queue_service_clients: dict[str, QueueServiceClient] = {}
+_table_service_clients: dict[str, TableServiceClient] = {}
+_ensured_containers: set[tuple[str, str]] = set()
+_ensured_queues: set[tuple[str, str]] = set()
+_ensured_tables: set[tuple[str, str]] = set()
+_http_session = None
+
+_message_encode_policy = BinaryBase64EncodePolicy()
+
+
+class _RoundTripCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def increment(self):
+        with self._lock:
+            self.count += 1
+
+
+# unset outside an invocation: requests made there are not counted, rather than piling up in a shared counter
+_round_trips: ContextVar[_RoundTripCounter | None] = ContextVar("storage_round_trips", default=None)
+
+
+def reset_round_trips() -> None:
+    """Start counting storage round-trips for the current invocation"""
+    _round_trips.set(_RoundTripCounter())
+
+
+def get_round_trips() -> int:
+    """Number of storage HTTP requests sent since the last reset_round_trips()"""
+    counter = _round_trips.get()
+    return counter.count if counter is not None else 0
+
+
+def _count_round_trip(request) -> None:
+    # raw_request_hook runs once per attempt, so retries are counted as well
+    counter = _round_trips.get()
+    if counter is not None:
+        counter.increment()
+
+
+def _get_transport() -> RequestsTransport:
+    """Keep-alive transport backed by one pooled requests session per process"""
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=STORAGE_POOL_SIZE, pool_maxsize=STORAGE_POOL_SIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _http_session = session
+    return RequestsTransport(session=_http_session, session_owner=False)
+
+
+def get_blob_service_client(conn_str: str = STORAGE_CONN) -> BlobServiceClient:
+    client = _blob_service_clients.get(conn_str)
+    if client is None:
+        with _registry_lock:
+            client = _blob_service_clients.get(conn_str)
+            if client is None:
+                client = BlobServiceClient.from_connection_string(
+                    conn_str,
+                    transport=_get_transport(),
+                    raw_request_hook=_count_round_trip,
+                )
+                _blob_service_clients[conn_str] = client
+    return client
+
+
+def get_queue_service_client(conn_str: str = STORAGE_CONN) -> QueueServiceClient:
+    client = _queue_service_clients.get(conn_str)
+    if client is None:
+        with _registry_lock:
+            client = _queue_service_clients.get(conn_str)
+            if client is None:
+                client = QueueServiceClient.from_connection_string(
+                    conn_str,
+                    transport=_get_transport(),
+                    raw_request_hook=_count_round_trip,
+                )
+                _queue_service_clients[conn_str] = client
+    return client
 
 
 def get_queue_client(queue_name):
-    qc = QueueClient.from_connection_string(conn_str=STORAGE_CONN, queue_name=queue_name)
-    try:
-        qc.create_queue()
-        logging.info(f"Created queue {queue_name}")
-    except Exception as e:
-        logging.debug(f"Queue '{queue_name}' may already exist: {e}")
+    qc = get_queue_service_client().get_queue_client(queue_name)
+    key = (STORAGE_CONN, queue_name)
+    if key not in _ensured_queues:
+        try:
+            qc.create_queue()
+            logging.info(f"Created queue {queue_name}")
+            _ensured_queues.add(key)
+        except ResourceExistsError:
+            _ensured_queues.add(key)
+        except Exception as e:
+            logging.debug(f"Queue '{queue_name}' may already exist: {e}")
     return qc
 
 
-def enqueue_message(message: dict, queue_name: str):
+def enqueue_message(message: dict, queue_name: str, visibility_timeout: int | None = None):
     queue_client = get_queue_client(queue_name)
 
-    queue_client.message_encode_policy = BinaryBase64EncodePolicy()
-
     message_string = json.dumps(message)
     message_bytes = message_string.encode("utf-8")
-    queue_client.send_message(queue_client.message_encode_policy.encode(content=message_bytes))
+    queue_client.send_message(
+        _message_encode_policy.encode(content=message_bytes), visibility_timeout=visibility_timeout
+    )
+
+
+def get_container_client(container=RESULTS_CONTAINER):
+    container_client = get_blob_service_client().get_container_client(container)
+    key = (STORAGE_CONN, container)
+    if key not in _ensured_containers:
+        try:
+            container_client.create_container()
+            _ensured_containers.add(key)
+        except ResourceExistsError:
+            _ensured_containers.add(key)
+        except Exception as e:
+            logging.debug(f"Container '{container}' may already exist: {e}")
+    return container_client
 
 
 def get_blob_client(blob_name, container=RESULTS_CONTAINER):
-    bsc = BlobServiceClient.from_connection_string(STORAGE_CONN)
-    container_client = bsc.get_container_client(container)
-    try:
-        container_client.create_container()
-    except Exception as e:
-        logging.debug(f"Container '{container}' may already exist: {e}")
-    return container_client.get_blob_client(blob_name)
+    return get_container_client(container).get_blob_client(blob_name)
+
+
+def get_table_service_client(conn_str: str = STORAGE_CONN) -> TableServiceClient:
+    client = _table_service_clients.get(conn_str)
+    if client is None:
+        with _registry_lock:
+            client = _table_service_clients.get(conn_str)
+            if client is None:
+                client = TableServiceClient.from_connection_string(
+                    conn_str,
+                    transport=_get_transport(),
+                    raw_request_hook=_count_round_trip,
+                )
+                _table_service_clients[conn_str] = client
+    return client
+
+
+def get_table_client(table_name):
+    table_client = get_table_service_client().get_table_client(table_name)
+    key = (STORAGE_CONN, table_name)
+    if key not in _ensured_tables:
+        try:
+            table_client.create_table()
+            logging.info(f"Created table {table_name}")
+            _ensured_tables.add(key)
+        except ResourceExistsError:
+            _ensured_tables.add(key)
+        except Exception as e:
+            logging.debug(f"Table '{table_name}' may already exist: {e}")
+    return table_client
+
 
+# BLOB CODEC
+def _encode_blob(data: dict, codec: str | None = None) -> tuple[bytes, dict]:
+    """
+    Serialize data to JSON and compress it when a codec is configured and the payload
+    is above BLOB_COMPRESSION_MIN_BYTES. Returns the body and the upload_blob kwargs
+    that record the codec in Content-Encoding and blob metadata.
+    """
+    payload = json.dumps(data).encode("utf-8")
+    codec = resolve_codec(BLOB_CODEC if codec is None else codec)
+    if codec == IDENTITY or len(payload) < BLOB_COMPRESSION_MIN_BYTES:
+        return payload, {"content_settings": ContentSettings(content_type="application/json")}
 
-def write_blob(blob_name: str, data: dict):
+    return compress(payload, codec), {
+        "content_settings": ContentSettings(content_type="application/json", content_encoding=codec),
+        "metadata": {CODEC_METADATA_KEY: codec},
+    }
+
+
+def _decode_blob(raw: bytes, properties) -> dict:
+    """Decompress according to the recorded codec; blobs without one are plain JSON"""
+    codec = (properties.metadata or {}).get(CODEC_METADATA_KEY) or properties.content_settings.content_encoding
+    return json.loads(decompress(raw, codec).decode("utf-8"))
+
+
+def write_blob(blob_name: str, data: dict, codec: str | None = None, etag: str | None = None,
+               overwrite: bool = True) -> str:
+    """
+    Upload data as JSON and return the new ETag.
+    With etag set the write is conditional (If-Match) and raises ResourceModifiedError if the blob changed;
+    with overwrite=False it only creates the blob (If-None-Match: *) and raises ResourceExistsError otherwise.
+    """
     blob_client = get_blob_client(blob_name)
     try:
-        blob_client.upload_blob(json.dumps(data), overwrite=True)
+        body, upload_kwargs = _encode_blob(data, codec)
+        if etag:
+            upload_kwargs.update(etag=etag, match_condition=MatchConditions.IfNotModified)
+        result = blob_client.upload_blob(body, overwrite=overwrite, **upload_kwargs)
         logging.info(f"Blob uploaded: {blob_name}")
+        return result.get("etag")
+    except ResourceModifiedError:
+        logging.info(f"Blob {blob_name} changed since ETag {etag}, conditional upload rejected")
+        raise
+    except ResourceExistsError:
+        logging.info(f"Blob {blob_name} already exists, not overwritten")
+        raise
     except Exception as e:
         logging.error(f"Failed to upload blob {blob_name}: {e}")
         raise
 
 
-def read_blob(blob_name: str) -> dict:
+def read_blob_with_properties(blob_name: str) -> tuple[dict, BlobProperties]:
     blob_client = get_blob_client(blob_name)
     try:
-        blob_data = blob_client.download_blob().readall().decode("utf-8")
-        return json.loads(blob_data)
+        # decode ourselves so the transport does not transparently gunzip and lose the codec
+        downloader = blob_client.download_blob(decompress=False)
+        return _decode_blob(downloader.readall(), downloader.properties), downloader.properties
     except Exception as e:
         logging.error(f"Failed to read blob {blob_name}: {e}")
         raise  # Re-raise the exception so the calling function can handle it
 
 
+def read_blob_with_etag(blob_name: str) -> tuple[dict, str]:
+    data, properties = read_blob_with_properties(blob_name)
+    return data, properties.etag
+
+
+def read_blob(blob_name: str) -> dict:
+    return read_blob_with_properties(blob_name)[0]
+
+
+def get_blob_properties(blob_name: str) -> BlobProperties:
+    """Properties only (ETag, Last-Modified, ...), without downloading the body"""
+    return get_blob_client(blob_name).get_blob_properties()
+
+
+# STAGED BLOCK UPLOADS
+# Large binaries (audio) are uploaded as numbered blocks and committed at the end,
+# so neither the whole file nor more than one block per uploader is held in memory.
+def _block_id(index: int) -> str:
+    # all block ids of a blob must have the same length
+    return base64.b64encode(f"{index:08d}".encode()).decode()
+
+
+def stage_blob_block(blob_name: str, index: int, data: bytes) -> None:
+    get_blob_client(blob_name).stage_block(_block_id(index), data)
+
+
+def commit_blob_blocks(blob_name: str, block_count: int, content_type: str | None = None,
+                       metadata: dict | None = None) -> str:
+    """
+    Commit blocks 0..block_count-1 in order as the content of blob_name and return its ETag.
+    """
+    result = get_blob_client(blob_name).commit_block_list(
+        [BlobBlock(block_id=_block_id(index)) for index in range(block_count)],
+        content_settings=ContentSettings(content_type=content_type),
+        metadata=metadata,
+    )
+    logging.info(f"Blob committed: {blob_name} ({block_count} blocks)")
+    return result.get("etag")
+
+
+class BlockBlobWriter:
+    """
+    Write-only stream into a block blob. Data is buffered up to block_size,
+    staged as a block, and the block list is committed on close().
+    """
+
+    def __init__(self, blob_name: str, block_size: int, content_type: str | None = None):
+        self.blob_name = blob_name
+        self.block_size = block_size
+        self.content_type = content_type
+        self.size = 0
+        self._buffer = bytearray()
+        self._blocks = 0
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self.size += len(data)
+        while len(self._buffer) >= self.block_size:
+            self._stage(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+        return len(data)
+
+    def close(self, metadata: dict | None = None) -> str:
+        if self._buffer or not self._blocks:
+            self._stage(bytes(self._buffer))
+            self._buffer.clear()
+        return commit_blob_blocks(self.blob_name, self._blocks, self.content_type, metadata)
+
+    def _stage(self, block: bytes):
+        stage_blob_block(self.blob_name, self._blocks, block)
+        self._blocks += 1
+
+
 # JOB METADATA CRUD
+# Last known (metadata, etag) per job on this worker. Lets a status transition skip the GET
+# when the stage already read or wrote the document; If-Match catches anything stale.
+_job_metadata_cache: OrderedDict[str, tuple[dict, str]] = OrderedDict()
+_job_metadata_cache_lock = threading.Lock()
+
+
+def _cache_job_metadata(job_id: str, metadata: dict, etag: str | None) -> None:
+    with _job_metadata_cache_lock:
+        if etag is None:
+            _job_metadata_cache.pop(job_id, None)
+            return
+        _job_metadata_cache[job_id] = (dict(metadata), etag)
+        _job_metadata_cache.move_to_end(job_id)
+        while len(_job_metadata_cache) > JOB_METADATA_CACHE_SIZE:
+            _job_metadata_cache.popitem(last=False)
+
+
+def _cached_job_metadata(job_id: str) -> tuple[dict, str] | None:
+    with _job_metadata_cache_lock:
+        cached = _job_metadata_cache.get(job_id)
+    if cached is None:
+        return None
+    return dict(cached[0]), cached[1]
+
+
 def read_job_metadata(job_id: str) -> dict:
     """Read job metadata from blob storage"""
-    return read_blob(f"results/{job_id}/{JOB_METADATA_FILENAME}")
+    metadata, etag = read_blob_with_etag(f"results/{job_id}/{JOB_METADATA_FILENAME}")
+    _cache_job_metadata(job_id, metadata, etag)
+    return metadata
 
 
-def write_job_metadata(job_id: str, url: str, status: str) -> None:
+def write_job_metadata(job_id: str, url: str, status: str, **fields) -> None:
     """Write job metadata to blob storage"""
-    write_blob(
-        f"results/{job_id}/{JOB_METADATA_FILENAME}",
-        {"id": job_id, "url": url, "status": status},
+    metadata = {
+        **fields,
+        "id": job_id,
+        "url": url,
+        "status": status,
+        "created": datetime.now(timezone.utc).strftime("%Y%m%d"),
+    }
+    blob_name = f"results/{job_id}/{JOB_METADATA_FILENAME}"
+    try:
+        etag = write_blob(blob_name, metadata, overwrite=False)
+        replaced = False
+    except ResourceExistsError:
+        # a reused job id (client-chosen id, retried playlist fan-out)
+        etag = write_blob(blob_name, metadata)
+        replaced = True
+    _cache_job_metadata(job_id, metadata, etag)
+    _index_written_job(metadata, replaced)
+
+
+def _status_value(status) -> str:
+    return status.value if isinstance(status, JobStatus) else status
+
+
+_TERMINAL_STATUS_VALUES = {status.value for status in TERMINAL_STATUSES}
+
+
+def transition_job_status(job_id: str, from_states, to_state, **fields) -> dict | None:
+    """
+    Move a job to to_state if its current status is one of from_states, merging fields into the metadata.
+
+    The write is conditional on the ETag of the last read, so a concurrent writer can never be
+    clobbered. The cached ETag is used when available (one PUT, no GET); on a conflict the
+    document is re-read once and the transition re-evaluated, there is no retry loop.
+
+    Returns the new metadata, the current metadata if the job is already in to_state,
+    or None if the transition was rejected (stale or backwards).
+    """
+    blob_name = f"results/{job_id}/{JOB_METADATA_FILENAME}"
+    allowed = {_status_value(state) for state in from_states}
+    target = _status_value(to_state)
+
+    cached = _cached_job_metadata(job_id)
+    attempts = [cached] if cached else []
+    attempts.append(None)  # fresh read
+
+    for snapshot in attempts:
+        if snapshot is None:
+            metadata, etag = read_blob_with_etag(blob_name)
+        else:
+            metadata, etag = snapshot
+
+        current = metadata.get("status")
+        if snapshot is not None and (current == target or current not in allowed):
+            continue  # only a fresh read may reject, the cached copy could be stale
+
+        if current == target:
+            logging.info(f"Job {job_id} is already {target}")
+            _cache_job_metadata(job_id, metadata, etag)
+            return metadata
+        if current not in allowed:
+            logging.warning(f"Rejected status transition {current} -> {target} for job {job_id}")
+            _cache_job_metadata(job_id, metadata, etag)
+            return None
+
+        updated = {**metadata, **fields, "status": target}
+        try:
+            new_etag = write_blob(blob_name, updated, etag=etag)
+        except ResourceModifiedError:
+            _cache_job_metadata(job_id, metadata, None)
+            continue
+
+        _cache_job_metadata(job_id, updated, new_etag)
+        index_job_status(updated, previous_status=current)
+        logging.info(f"Job {job_id} status {current} -> {target}")
+        if updated.get("parent_id") and target in _TERMINAL_STATUS_VALUES:
+            _complete_parent_job_quietly(updated["parent_id"])
+        return updated
+
+    logging.warning(f"Status transition to {target} for job {job_id} lost a concurrent update, giving up")
+    return None
+
+
+# JOB STATUS INDEX
+# Table entities mirroring job_metadata.json so status reads and listings avoid blob downloads:
+#   lookup:  PartitionKey=<job id>,               RowKey="status"   -> point read by id
+#   listing: PartitionKey=<status>_<created day>, RowKey=<job id>   -> list/count by status
+#   children: PartitionKey=children_<parent id>,  RowKey=<job id>   -> progress of a playlist job
+# The blob stays the source of truth and index failures never fail a stage. Every status change goes
+# through transition_job_status, which mirrors it here; when mirroring fails the lookup entity is
+# removed (with the job's children entity), so status reads and playlist completion fall back to the
+# blob instead of serving a stale status.
+_JOB_LOOKUP_ROW = "status"
+# Table string properties hold at most 64 KiB of UTF-16, larger documents are read from the blob
+_JOB_DOCUMENT_MAX_CHARS = 32 * 1024
+# child metadata blobs read concurrently per step when confirming a playlist's completion
+_CHILD_READ_BATCH = 16
+
+
+def _job_listing_partition(status: str, created: str) -> str:
+    return f"{status}_{created}"
+
+
+def _job_children_partition(parent_id: str) -> str:
+    return f"children_{parent_id}"
+
+
+def index_job_status(metadata: dict, previous_status: str | None = None, previous_created: str | None = None) -> None:
+    """
+    Mirror a job's metadata into the index table, moving its listing entity out of the
+    previous status (and the previous creation day, when a job id was reused)
+    """
+    if not JOB_INDEX_ENABLED:
+        return
+
+    job_id = metadata["id"]
+    status = metadata["status"]
+    created = metadata.get("created") or datetime.now(timezone.utc).strftime("%Y%m%d")
+    previous_created = previous_created or created
+    try:
+        table = get_table_client(JOB_INDEX_TABLE)
+        lookup = {
+            "PartitionKey": job_id,
+            "RowKey": _JOB_LOOKUP_ROW,
+            "status": status,
+            "url": metadata.get("url"),
+            "created": created,
+        }
+        document = json.dumps(metadata, ensure_ascii=False)
+        if len(document) <= _JOB_DOCUMENT_MAX_CHARS:
+            lookup["metadata"] = document
+        table.upsert_entity(lookup, mode=UpdateMode.REPLACE)
+        table.upsert_entity(
+            {
+                "PartitionKey": _job_listing_partition(status, created),
+                "RowKey": job_id,
+                "url": metadata.get("url"),
+            },
+            mode=UpdateMode.REPLACE,
+        )
+        if previous_status and (previous_status, previous_created) != (status, created):
+            table.delete_entity(_job_listing_partition(previous_status, previous_created), job_id)
+        if metadata.get("parent_id"):
+            table.upsert_entity(
+                {
+                    "PartitionKey": _job_children_partition(metadata["parent_id"]),
+                    "RowKey": job_id,
+                    "status": status,
+                },
+                mode=UpdateMode.REPLACE,
+            )
+    except Exception as e:
+        logging.warning(f"Failed to update job index for {job_id}: {e}")
+        _drop_job_lookup(job_id, metadata.get("parent_id"))
+
+
+def _drop_job_lookup(job_id: str, parent_id: str | None = None) -> None:
+    try:
+        table = get_table_client(JOB_INDEX_TABLE)
+        table.delete_entity(job_id, _JOB_LOOKUP_ROW)
+        if parent_id:
+            table.delete_entity(_job_children_partition(parent_id), job_id)
+    except Exception as e:
+        logging.error(f"Failed to drop stale job index entity of {job_id}, its status reads may lag: {e}")
+
+
+def _index_written_job(metadata: dict, replaced: bool) -> None:
+    """Index a newly written metadata document; when it replaced a job, retire that job's listing entity"""
+    previous = (_read_job_lookup(metadata["id"]) or {}) if replaced else {}
+    index_job_status(metadata, previous_status=previous.get("status"), previous_created=previous.get("created"))
+
+
+def _read_job_lookup(job_id: str) -> dict | None:
+    if not JOB_INDEX_ENABLED:
+        return None
+
+    try:
+        return get_table_client(JOB_INDEX_TABLE).get_entity(job_id, _JOB_LOOKUP_ROW)
+    except ResourceNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning(f"Failed to read job index for {job_id}: {e}")
+        return None
+
+
+def read_indexed_job_status(job_id: str) -> dict | None:
+    """
+    The job's metadata document as last mirrored into the index table, or None if the job is
+    not indexed (or its document was too large to mirror).
+    """
+    entity = _read_job_lookup(job_id)
+    if entity is None or not entity.get("metadata"):
+        return None
+    return json.loads(entity["metadata"])
+
+
+def read_job_status(job_id: str) -> dict:
+    """Job metadata for status reads: one index point read, the metadata blob for jobs not indexed"""
+    return read_indexed_job_status(job_id) or read_job_metadata(job_id)
+
+
+def list_jobs_by_status(status: str, created: str | None = None) -> list[dict]:
+    """List jobs currently in status, optionally only those created on a given day (YYYYMMDD)"""
+    table = get_table_client(JOB_INDEX_TABLE)
+    if created:
+        query = "PartitionKey eq @partition"
+        parameters = {"partition": _job_listing_partition(status, created)}
+    else:
+        # every "<status>_<day>" partition sorts between "<status>_" and "<status>`"
+        query = "PartitionKey ge @low and PartitionKey lt @high"
+        parameters = {"low": f"{status}_", "high": f"{status}`"}
+
+    return [
+        {"id": entity["RowKey"], "url": entity.get("url"), "created": entity["PartitionKey"].rsplit("_", 1)[-1]}
+        for entity in table.query_entities(query, parameters=parameters, select=["PartitionKey", "RowKey", "url"])
+    ]
+
+
+def count_child_statuses(parent_id: str) -> dict[str, int] | None:
+    """
+    Number of child jobs of a playlist job per status, from one partition query of the index.
+    None without the index: counting would take one blob read per child.
+    """
+    if not JOB_INDEX_ENABLED:
+        return None
+    entities = get_table_client(JOB_INDEX_TABLE).query_entities(
+        "PartitionKey eq @partition",
+        parameters={"partition": _job_children_partition(parent_id)},
+        select=["status"],
     )
+    return dict(Counter(entity.get("status") for entity in entities))
+
+
+def _children_finished(parent_id: str, child_ids: list[str]) -> bool:
+    """
+    Whether every child job has reached a terminal status. The index answers from one partition query,
+    stopping at the first unfinished child; only children missing from it are confirmed from their
+    metadata blobs (all of them without the index), newest first and a batch at a time, so an
+    unfinished playlist costs a read or two instead of one per child.
+    """
+    unconfirmed = child_ids
+    if JOB_INDEX_ENABLED:
+        entities = get_table_client(JOB_INDEX_TABLE).query_entities(
+            "PartitionKey eq @partition",
+            parameters={"partition": _job_children_partition(parent_id)},
+            select=["RowKey", "status"],
+        )
+        indexed = set()
+        for entity in entities:
+            if entity.get("status") not in _TERMINAL_STATUS_VALUES:
+                return False
+            indexed.add(entity["RowKey"])
+        unconfirmed = [child_id for child_id in child_ids if child_id not in indexed]
+
+    # children are processed roughly in order, so the last ones are the likeliest to be unfinished
+    unconfirmed = unconfirmed[::-1]
+    for start in range(0, len(unconfirmed), _CHILD_READ_BATCH):
+        blob_names = [f"results/{child_id}/{JOB_METADATA_FILENAME}" for child_id in unconfirmed[start:start + _CHILD_READ_BATCH]]
+        children = run_async(aread_many(blob_names, return_exceptions=True))
+        if any(not isinstance(child, dict) or child.get("status") not in _TERMINAL_STATUS_VALUES for child in children):
+            return False
+    return True
+
+
+def complete_parent_job(parent_id: str) -> dict | None:
+    """
+    Mark a playlist job DONE once every child job has reached a terminal status. Called by whichever
+    stage finishes a child (and by the fan-out itself), the conditional transition makes it idempotent.
+    Returns the parent's new metadata, or None while children are still being processed.
+    """
+    parent = read_job_metadata(parent_id)
+    children = parent.get("children")
+    if parent.get("status") in _TERMINAL_STATUS_VALUES or not children:
+        return None
+
+    if not _children_finished(parent_id, children):
+        return None
+    logging.info(f"All {len(children)} child jobs of playlist job {parent_id} finished")
+    return transition_job_status(parent_id, ACTIVE_STATUSES, JobStatus.DONE)
+
+
+def _complete_parent_job_quietly(parent_id: str) -> None:
+    # the child's own transition already succeeded, a failure here must not fail its stage
+    try:
+        complete_parent_job(parent_id)
+    except Exception as e:
+        logging.warning(f"Could not check completion of playlist job {parent_id}: {e}")
 
 
 # VIDEO METADATA CRUD
@@ -78,11 +662,208 @@ def read_video_metadata(job_id: str) -> dict:
     return read_blob(f"results/{job_id}/{VIDEO_METADATA_FILENAME}")
 
 
-def write_failed_job_metadata(job_id: str) -> None:
-    """Write failed job metadata to blob storage"""
-    metadata = read_job_metadata(job_id)
-    metadata["status"] = JobStatus.FAILED.value
-    write_blob(
-        f"results/{job_id}/{JOB_METADATA_FILENAME}",
-        metadata,
+# VIDEO INDEX
+# video-index/{platform}/{video_id} points at the first job that finished processing the video,
+# until the pointer is older than DEDUP_MAX_AGE and the next finished job replaces it
+def _video_index_blob(platform: str, video_id: str) -> str:
+    return f"video-index/{platform}/{video_id}"
+
+
+def write_video_index(platform: str, video_id: str, job_id: str) -> None:
+    """Point the video at job_id unless another job already holds a fresh pointer (first finished job wins)"""
+    blob_name = _video_index_blob(platform, video_id)
+    now = datetime.now(timezone.utc)
+    pointer = {"job_id": job_id, "completed": now.isoformat()}
+    try:
+        write_blob(blob_name, pointer, overwrite=False)
+        return
+    except ResourceExistsError:
+        pass
+
+    current, etag = read_blob_with_etag(blob_name)
+    if (now - datetime.fromisoformat(current["completed"])).total_seconds() <= DEDUP_MAX_AGE:
+        logging.info(f"{platform} video {video_id} keeps pointing at job {current['job_id']}")
+        return
+    try:
+        write_blob(blob_name, pointer, etag=etag)
+    except ResourceModifiedError:
+        logging.info(f"Stale pointer of {platform} video {video_id} was replaced by another job first")
+
+
+async def aread_video_index(platform: str, video_id: str) -> dict | None:
+    """Pointer to the job that processed the video, or None if it was never processed"""
+    blob_client = await aget_blob_client(_video_index_blob(platform, video_id))
+    try:
+        downloader = await blob_client.download_blob(decompress=False)
+        return _decode_blob(await downloader.readall(), downloader.properties)
+    except ResourceNotFoundError:
+        return None
+
+
+def write_failed_job_metadata(job_id: str, **fields) -> None:
+    """Write failed job metadata to blob storage, with fields such as the error merged in"""
+    transition_job_status(job_id, ACTIVE_STATUSES, JobStatus.FAILED, **fields)
+
+
+# ASYNC STORAGE API
+# aiohttp sessions are bound to the event loop that created them, so async clients are cached per loop.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+_async_loop = None
+_async_loop_lock = threading.Lock()
+
+
+def _get_async_clients(conn_str: str = STORAGE_CONN) -> dict:
+    loop = asyncio.get_running_loop()
+    loop_clients = _async_clients.setdefault(loop, {})
+    clients = loop_clients.get(conn_str)
+    if clients is None:
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=STORAGE_POOL_SIZE))
+        clients = {
+            "blob": AsyncBlobServiceClient.from_connection_string(
+                conn_str,
+                transport=AioHttpTransport(session=session, session_owner=False),
+                raw_request_hook=_count_round_trip,
+            ),
+            "queue": AsyncQueueServiceClient.from_connection_string(
+                conn_str,
+                transport=AioHttpTransport(session=session, session_owner=False),
+                raw_request_hook=_count_round_trip,
+            ),
+        }
+        loop_clients[conn_str] = clients
+    return clients
+
+
+async def aget_blob_client(blob_name, container=RESULTS_CONTAINER):
+    container_client = _get_async_clients()["blob"].get_container_client(container)
+    key = (STORAGE_CONN, container)
+    if key not in _ensured_containers:
+        try:
+            await container_client.create_container()
+            _ensured_containers.add(key)
+        except ResourceExistsError:
+            _ensured_containers.add(key)
+        except Exception as e:
+            logging.debug(f"Container '{container}' may already exist: {e}")
+    return container_client.get_blob_client(blob_name)
+
+
+async def aget_queue_client(queue_name):
+    qc = _get_async_clients()["queue"].get_queue_client(queue_name)
+    key = (STORAGE_CONN, queue_name)
+    if key not in _ensured_queues:
+        try:
+            await qc.create_queue()
+            logging.info(f"Created queue {queue_name}")
+            _ensured_queues.add(key)
+        except ResourceExistsError:
+            _ensured_queues.add(key)
+        except Exception as e:
+            logging.debug(f"Queue '{queue_name}' may already exist: {e}")
+    return qc
+
+
+async def aenqueue_message(message: dict, queue_name: str, visibility_timeout: int | None = None):
+    """visibility_timeout (seconds) keeps the message hidden from consumers for that long"""
+    queue_client = await aget_queue_client(queue_name)
+
+    message_bytes = json.dumps(message).encode("utf-8")
+    await queue_client.send_message(
+        _message_encode_policy.encode(content=message_bytes), visibility_timeout=visibility_timeout
+    )
+
+
+async def awrite_blob(blob_name: str, data: dict, codec: str | None = None, overwrite: bool = True) -> str:
+    blob_client = await aget_blob_client(blob_name)
+    try:
+        body, upload_kwargs = _encode_blob(data, codec)
+        result = await blob_client.upload_blob(body, overwrite=overwrite, **upload_kwargs)
+        logging.info(f"Blob uploaded: {blob_name}")
+        return result.get("etag")
+    except ResourceExistsError:
+        logging.info(f"Blob {blob_name} already exists, not overwritten")
+        raise
+    except Exception as e:
+        logging.error(f"Failed to upload blob {blob_name}: {e}")
+        raise
+
+
+async def aread_blob_with_properties(blob_name: str) -> tuple[dict, BlobProperties]:
+    blob_client = await aget_blob_client(blob_name)
+    try:
+        downloader = await blob_client.download_blob(decompress=False)
+        return _decode_blob(await downloader.readall(), downloader.properties), downloader.properties
+    except Exception as e:
+        logging.error(f"Failed to read blob {blob_name}: {e}")
+        raise
+
+
+async def aread_blob(blob_name: str) -> dict:
+    return (await aread_blob_with_properties(blob_name))[0]
+
+
+async def awrite_job_metadata(job_id: str, url: str, status: str, **fields) -> None:
+    """Async counterpart of write_job_metadata"""
+    metadata = {
+        **fields,
+        "id": job_id,
+        "url": url,
+        "status": status,
+        "created": datetime.now(timezone.utc).strftime("%Y%m%d"),
+    }
+    blob_name = f"results/{job_id}/{JOB_METADATA_FILENAME}"
+    try:
+        etag = await awrite_blob(blob_name, metadata, overwrite=False)
+        replaced = False
+    except ResourceExistsError:
+        etag = await awrite_blob(blob_name, metadata)
+        replaced = True
+    _cache_job_metadata(job_id, metadata, etag)
+    await asyncio.to_thread(_index_written_job, metadata, replaced)
+
+
+async def aread_many(blob_names: list[str], return_exceptions: bool = False, with_properties: bool = False) -> list:
+    """
+    Read several blobs concurrently. Results keep the order of blob_names;
+    with return_exceptions=True a missing blob yields its exception instead of failing the batch.
+    with_properties=True yields (data, properties) pairs, as read_blob_with_properties does.
+    """
+    read = aread_blob_with_properties if with_properties else aread_blob
+    return await asyncio.gather(
+        *(read(blob_name) for blob_name in blob_names),
+        return_exceptions=return_exceptions,
     )
+
+
+def _get_async_loop() -> asyncio.AbstractEventLoop:
+    """Background event loop shared by synchronous callers, so async clients stay pooled"""
+    global _async_loop
+    with _async_loop_lock:
+        if _async_loop is None:
+            _async_loop = asyncio.new_event_loop()
+            threading.Thread(target=_async_loop.run_forever, name="storage-aio", daemon=True).start()
+    return _async_loop
+
+
+async def _with_round_trip_counter(counter: _RoundTripCounter | None, coro):
+    _round_trips.set(counter)
+    return await coro
+
+
+def submit_async(coro) -> concurrent.futures.Future:
+    """
+    Start a storage coroutine from synchronous code without waiting for it, so the caller can
+    overlap other work with it; call .result() on the returned future to join.
+    """
+    return asyncio.run_coroutine_threadsafe(
+        _with_round_trip_counter(_round_trips.get(), coro),
+        _get_async_loop(),
+    )
+
+
+def run_async(coro):
+    """
+    Run a storage coroutine from synchronous code (e.g. a queue-triggered function)
+    and block until it finishes. Round-trips are attributed to the calling invocation.
+    """
+    return submit_async(coro).result()
@@ -0,0 +1,60 @@
+import gzip
+import logging
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+IDENTITY = "identity"
+GZIP = "gzip"
+ZSTD = "zstd"
+
+# blob metadata key that records which codec was used on write
+CODEC_METADATA_KEY = "codec"
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def available_codecs() -> list[str]:
+    codecs = [IDENTITY, GZIP]
+    if zstandard is not None:
+        codecs.append(ZSTD)
+    return codecs
+
+
+def resolve_codec(codec: str | None) -> str:
+    """Normalize a configured codec name, falling back to gzip if zstd is not installed"""
+    codec = (codec or IDENTITY).lower()
+    if codec in ("", "none", IDENTITY):
+        return IDENTITY
+    if codec == ZSTD and zstandard is None:
+        logging.warning("zstandard is not installed, falling back to gzip blob compression")
+        return GZIP
+    if codec not in (GZIP, ZSTD):
+        raise ValueError(f"Unsupported blob codec: {codec}")
+    return codec
+
+
+def compress(payload: bytes, codec: str) -> bytes:
+    if codec == IDENTITY:
+        return payload
+    if codec == GZIP:
+        return gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)
+    if codec == ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    raise ValueError(f"Unsupported blob codec: {codec}")
+
+
+def decompress(payload: bytes, codec: str | None) -> bytes:
+    """Decode a blob body. Blobs written before compression existed have no codec and are returned as-is."""
+    if not codec or codec == IDENTITY:
+        return payload
+    if codec == GZIP:
+        return gzip.decompress(payload)
+    if codec == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Blob is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise ValueError(f"Unsupported blob codec: {codec}")
@@ -9,8 +9,101 @@ CONNECTION_STRING = os.environ.get("CONNECTION_STRING", "AccountName=devstoreacc
 
 MAX_DEQUEUE_COUNT = int(os.environ.get("MAX_DEQUEUE_COUNT", "5"))
 
+# VIDEO DEDUPLICATION: reuse results of a video processed within this many seconds (0 disables)
+DEDUP_MAX_AGE = int(os.environ.get("DEDUP_MAX_AGE", str(7 * 24 * 3600)))
+
+# BULK SUBMISSION
+BULK_MAX_ITEMS = int(os.environ.get("BULK_MAX_ITEMS", "10000"))
+BULK_CONCURRENCY = int(os.environ.get("BULK_CONCURRENCY", "32"))
+
+# DOWNLOAD RATE LIMIT (requests/s to YouTube across all workers, 0 disables) AND RETRIES (seconds)
+DOWNLOAD_RATE_LIMIT = float(os.environ.get("DOWNLOAD_RATE_LIMIT", "2"))
+DOWNLOAD_RATE_BURST = float(os.environ.get("DOWNLOAD_RATE_BURST", "10"))
+DOWNLOAD_RATE_MAX_WAIT = float(os.environ.get("DOWNLOAD_RATE_MAX_WAIT", "5"))
+RATE_LIMIT_TABLE = os.environ.get("RATE_LIMIT_TABLE", "ratelimits")
+DOWNLOAD_MAX_ATTEMPTS = int(os.environ.get("DOWNLOAD_MAX_ATTEMPTS", "6"))
+DOWNLOAD_BACKOFF_BASE = float(os.environ.get("DOWNLOAD_BACKOFF_BASE", "15"))
+DOWNLOAD_BACKOFF_MAX = float(os.environ.get("DOWNLOAD_BACKOFF_MAX", "3600"))
+
+# PLAYLIST FAN-OUT: child jobs become visible to the downloader PLAYLIST_STAGGER seconds apart
+PLAYLIST_MAX_ENTRIES = int(os.environ.get("PLAYLIST_MAX_ENTRIES", "1000"))
+PLAYLIST_CONCURRENCY = int(os.environ.get("PLAYLIST_CONCURRENCY", "16"))
+PLAYLIST_STAGGER = float(os.environ.get("PLAYLIST_STAGGER", "2"))
+
+# API ARTIFACT CACHE (TTLs in seconds)
+API_CACHE_MAX_ENTRIES = int(os.environ.get("API_CACHE_MAX_ENTRIES", "512"))
+API_CACHE_MAX_BYTES = int(os.environ.get("API_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+API_CACHE_TERMINAL_TTL = float(os.environ.get("API_CACHE_TERMINAL_TTL", "3600"))
+API_CACHE_ACTIVE_TTL = float(os.environ.get("API_CACHE_ACTIVE_TTL", "2"))
+# Cache-Control max-age (seconds) sent to clients/CDN for artifacts of finished jobs
+HTTP_TERMINAL_MAX_AGE = int(os.environ.get("HTTP_TERMINAL_MAX_AGE", "86400"))
+
+# LONG-POLL STATUS (seconds)
+LONG_POLL_INTERVAL = float(os.environ.get("LONG_POLL_INTERVAL", "1"))
+LONG_POLL_MAX_WAIT = float(os.environ.get("LONG_POLL_MAX_WAIT", "25"))
+
 # FILENAME CONFIGURATION
 JOB_METADATA_FILENAME = os.environ.get("JOB_METADATA_FILENAME", "job_metadata.json")
 VIDEO_METADATA_FILENAME = os.environ.get("VIDEO_METADATA_FILENAME", "video_metadata.json")
 TRANSCRIPT_FILENAME = os.environ.get("TRANSCRIBED_FILENAME", "transcript.json")
-SUMMARY_FILENAME = os.environ.get("SUMMARY_FILENAME", "summary.json")
\ No newline at end of file
+SUMMARY_FILENAME = os.environ.get("SUMMARY_FILENAME", "summary.json")
+SEGMENTS_FILENAME = os.environ.get("SEGMENTS_FILENAME", "segments.json")
+AUDIO_FILENAME = os.environ.get("AUDIO_FILENAME", "audio.mp3")
+# incremental transcripts: parts are formatted with their index, the manifest says how many exist
+TRANSCRIPT_PART_FILENAME = os.environ.get("TRANSCRIPT_PART_FILENAME", "transcript.part-{index:04d}.json")
+TRANSCRIPT_MANIFEST_FILENAME = os.environ.get("TRANSCRIPT_MANIFEST_FILENAME", "transcript.manifest.json")
+SUMMARY_PART_FILENAME = os.environ.get("SUMMARY_PART_FILENAME", "summary.part-{index:04d}.json")
+SPEECH_FILENAME = os.environ.get("SPEECH_FILENAME", "speech.json")
+
+# STORAGE CLIENT CONFIGURATION
+STORAGE_POOL_SIZE = int(os.environ.get("STORAGE_POOL_SIZE", "20"))
+JOB_METADATA_CACHE_SIZE = int(os.environ.get("JOB_METADATA_CACHE_SIZE", "1024"))
+
+# DOWNLOADER HTTP SESSION (timeout in seconds)
+DOWNLOADER_POOL_SIZE = int(os.environ.get("DOWNLOADER_POOL_SIZE", "10"))
+DOWNLOADER_HTTP_TIMEOUT = float(os.environ.get("DOWNLOADER_HTTP_TIMEOUT", "30"))
+# when set, extract_info results and subtitle bodies are saved here as replay fixtures
+DOWNLOADER_RECORD_DIR = os.environ.get("DOWNLOADER_RECORD_DIR", "")
+
+# AUDIO DOWNLOAD: fall back to audio + speech_to_text for videos without English captions;
+# audio is fetched and staged in blocks of AUDIO_BLOCK_SIZE bytes
+AUDIO_FALLBACK_ENABLED = os.environ.get("AUDIO_FALLBACK_ENABLED", "true").lower() == "true"
+AUDIO_BLOCK_SIZE = int(os.environ.get("AUDIO_BLOCK_SIZE", str(4 * 1024 * 1024)))
+# parallel Range requests per direct media download (http(s) links to mp4/mp3/... files)
+DIRECT_MEDIA_WORKERS = int(os.environ.get("DIRECT_MEDIA_WORKERS", "4"))
+
+# JOB STATUS INDEX (Table storage)
+JOB_INDEX_ENABLED = os.environ.get("JOB_INDEX_ENABLED", "true").lower() == "true"
+JOB_INDEX_TABLE = os.environ.get("JOB_INDEX_TABLE", "jobindex")
+
+# BLOB COMPRESSION (identity | gzip | zstd), applied only to payloads above the threshold
+BLOB_CODEC = os.environ.get("BLOB_CODEC", "identity")
+BLOB_COMPRESSION_MIN_BYTES = int(os.environ.get("BLOB_COMPRESSION_MIN_BYTES", "16384"))
+
+# SPEECH TO TEXT: Whisper is loaded on the first transcription (or by warm-up) instead of at import;
+# WHISPER_DEVICE empty picks cuda when available; WHISPER_WARMUP loads the model in the background
+# as soon as speech_to_text is imported (for nodes dedicated to transcription)
+WHISPER_MODEL_SIZE = os.environ.get("WHISPER_MODEL_SIZE", "base")
+# inference engine: whisper (fp32) | whisper-int8 (dynamic quantization, CPU) | faster-whisper (CTranslate2)
+WHISPER_BACKEND = os.environ.get("WHISPER_BACKEND", "whisper")
+WHISPER_DEVICE = os.environ.get("WHISPER_DEVICE", "")
+WHISPER_WARMUP = os.environ.get("WHISPER_WARMUP", "false").lower() == "true"
+# chunked transcription: with more than one worker, audio longer than two chunks is cut at pauses into
+# ~WHISPER_CHUNK_SECONDS pieces (cut searched in the last WHISPER_CHUNK_SEARCH_SECONDS) transcribed in parallel
+WHISPER_CHUNK_WORKERS = int(os.environ.get("WHISPER_CHUNK_WORKERS", "1"))
+WHISPER_CHUNK_SECONDS = float(os.environ.get("WHISPER_CHUNK_SECONDS", "120"))
+WHISPER_CHUNK_SEARCH_SECONDS = float(os.environ.get("WHISPER_CHUNK_SEARCH_SECONDS", "10"))
+# publish every finished chunk as a transcript part so nlp can start before the whole file is transcribed;
+# only chunked transcription has chunks, so this does nothing unless WHISPER_CHUNK_WORKERS > 1
+INCREMENTAL_TRANSCRIPT = os.environ.get("INCREMENTAL_TRANSCRIPT", "true").lower() == "true"
+
+# SPEECH PRE-SCREEN (opt-in): 30 ms frames above VAD_MIN_ENERGY (RMS) are sound, and speech when webrtcvad
+# (in requirements.txt) agrees at VAD_AGGRESSIVENESS; silences longer than VAD_SKIP_SILENCE seconds are not
+# transcribed. Audio without any sound is NO_SPEECH without Whisper or nlp. SPEECH_MIN_RATIO depends on
+# webrtcvad: audio whose speech ratio is below it is NO_SPEECH only when webrtcvad is importable, without it
+# the ratio is ignored because loudness alone cannot tell speech from music
+SPEECH_PRESCREEN_ENABLED = os.environ.get("SPEECH_PRESCREEN_ENABLED", "false").lower() == "true"
+SPEECH_MIN_RATIO = float(os.environ.get("SPEECH_MIN_RATIO", "0.1"))
+VAD_MIN_ENERGY = float(os.environ.get("VAD_MIN_ENERGY", "0.01"))
+VAD_AGGRESSIVENESS = int(os.environ.get("VAD_AGGRESSIVENESS", "2"))
+VAD_SKIP_SILENCE = float(os.environ.get("VAD_SKIP_SILENCE", "10"))
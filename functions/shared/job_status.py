@@ -2,9 +2,16 @@ from enum import Enum
 
 
 class JobStatus(Enum):
+    # video metadata is published, the transcript is still being fetched
+    METADATA_READY = "METADATA_READY"
     DOWNLOADED = "DOWNLOADED"
     TRANSCRIBED = "TRANSCRIBED"
     DONE = "DONE"
     CREATED = "CREATED"
     FAILED = "FAILED"
     NO_SPEECH = "NO_SPEECH"
+
+
+# jobs still moving through the pipeline vs. jobs whose results never change again
+ACTIVE_STATUSES = (JobStatus.CREATED, JobStatus.METADATA_READY, JobStatus.DOWNLOADED, JobStatus.TRANSCRIBED)
+TERMINAL_STATUSES = (JobStatus.DONE, JobStatus.FAILED, JobStatus.NO_SPEECH)
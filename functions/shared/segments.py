@@ -0,0 +1,48 @@
+from array import array
+
+
+class SegmentTable:
+    """
+    Caption cues as parallel arrays: cue i starts at start_ms[i], lasts duration_ms[i]
+    and its text begins at character text_offset[i] of the flat transcript
+    (it ends where cue i + 1 begins).
+    """
+
+    def __init__(self):
+        self.start_ms = array("q")
+        self.duration_ms = array("q")
+        self.text_offset = array("q")
+
+    def __len__(self):
+        return len(self.start_ms)
+
+    def append(self, start_ms: int, duration_ms: int, text_offset: int):
+        self.start_ms.append(start_ms)
+        self.duration_ms.append(duration_ms)
+        self.text_offset.append(text_offset)
+
+    def to_dict(self) -> dict:
+        return {
+            "start_ms": self.start_ms.tolist(),
+            "duration_ms": self.duration_ms.tolist(),
+            "text_offset": self.text_offset.tolist(),
+        }
+
+    @classmethod
+    def from_timed_texts(cls, timed_texts) -> tuple[str, "SegmentTable"]:
+        """
+        Build (flat transcript, table) from (start_seconds, end_seconds, text) triples,
+        e.g. Whisper segments. Empty texts are dropped, the rest are joined with one space.
+        """
+        table = cls()
+        parts = []
+        length = 0
+        for start, end, text in timed_texts:
+            text = text.strip()
+            if not text:
+                continue
+            offset = length + (1 if parts else 0)
+            table.append(round(start * 1000), round((end - start) * 1000), offset)
+            parts.append(text)
+            length = offset + len(text)
+        return " ".join(parts), table
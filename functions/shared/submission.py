@@ -0,0 +1,103 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from .common import aenqueue_message, aread_many, aread_video_index, awrite_blob, awrite_job_metadata
+from .config import DEDUP_MAX_AGE, NEW_QUEUE, SEGMENTS_FILENAME, SPEECH_FILENAME, SUMMARY_FILENAME, \
+    TRANSCRIPT_FILENAME, VIDEO_METADATA_FILENAME
+from .job_status import JobStatus
+from .logs import logging
+from .video_url import canonical_video_id
+
+
+# JOB SUBMISSION
+# Creating jobs (metadata blob + NEW_QUEUE message, or reuse of earlier results) is shared by
+# the api (single and bulk POST) and the downloader's playlist fan-out.
+def video_fields(video: tuple[str, str] | None) -> dict:
+    return {"platform": video[0], "video_id": video[1]} if video else {}
+
+
+# results a reused job gets copied: without the required ones the video is processed again,
+# optional ones are copied when the earlier job produced them (e.g. no speech.json without pre-screen)
+REUSED_REQUIRED_FILENAMES = (TRANSCRIPT_FILENAME, SUMMARY_FILENAME)
+REUSED_OPTIONAL_FILENAMES = (VIDEO_METADATA_FILENAME, SEGMENTS_FILENAME, SPEECH_FILENAME)
+
+
+async def reuse_processed_video(job_id: str, url: str, video: tuple[str, str] | None, force: bool,
+                                **fields) -> str | None:
+    """
+    If the same video was processed within DEDUP_MAX_AGE, copy its results (transcript and summary,
+    plus whichever optional artifacts exist) into job_id and mark the job DONE without queueing it.
+    Returns the id of the job the results came from, or None if the job has to be processed.
+    """
+    if video is None or force or DEDUP_MAX_AGE <= 0:
+        return None
+
+    try:
+        pointer = await aread_video_index(*video)
+        if pointer is None:
+            return None
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(pointer["completed"])
+        if age.total_seconds() > DEDUP_MAX_AGE:
+            logging.info(f"Found stale results for {video[0]} video {video[1]}, reprocessing")
+            return None
+
+        source_job = pointer["job_id"]
+        filenames = REUSED_REQUIRED_FILENAMES + REUSED_OPTIONAL_FILENAMES
+        artifacts = await aread_many(
+            [f"results/{source_job}/{filename}" for filename in filenames], return_exceptions=True
+        )
+        copies = {}
+        for filename, data in zip(filenames, artifacts):
+            if isinstance(data, ResourceNotFoundError) and filename in REUSED_OPTIONAL_FILENAMES:
+                continue
+            if isinstance(data, Exception):
+                raise data
+            if isinstance(data, dict) and data.get("id") == source_job:
+                data = {**data, "id": job_id}
+            copies[filename] = data
+
+        await asyncio.gather(*(awrite_blob(f"results/{job_id}/{filename}", data) for filename, data in copies.items()))
+        await awrite_job_metadata(
+            job_id, url, JobStatus.DONE.value, **fields, **video_fields(video), deduplicated_from=source_job
+        )
+    except Exception as e:
+        logging.warning(f"Could not reuse results for {video[0]} video {video[1]}: {e}")
+        return None
+
+    logging.info(f"Reused results of job {source_job} for job {job_id}")
+    return source_job
+
+
+async def submit_job(item, semaphore: asyncio.Semaphore, **fields) -> dict:
+    url = item.get("url") if isinstance(item, dict) else None
+    if not url:
+        return {"url": url, "error": item.get("error", "Missing url") if isinstance(item, dict) else "Missing url"}
+
+    job_id = item.get("id") or str(uuid.uuid4())
+    video = canonical_video_id(url)
+    async with semaphore:
+        try:
+            source_job = await reuse_processed_video(job_id, url, video, item.get("force") is True, **fields)
+            if source_job:
+                return {"id": job_id, "url": url, "deduplicated_from": source_job}
+
+            await awrite_job_metadata(job_id, url, JobStatus.CREATED.value, **fields, **video_fields(video))
+            await aenqueue_message({"id": job_id}, queue_name=NEW_QUEUE, visibility_timeout=item.get("delay"))
+        except Exception as e:
+            logging.error(f"Failed to submit job {job_id} for {url}: {e}")
+            return {"id": job_id, "url": url, "error": str(e)}
+
+    return {"id": job_id, "url": url}
+
+
+async def submit_jobs(items: list[dict], concurrency: int, **fields) -> list[dict]:
+    """
+    Create one job per item with at most concurrency submissions in flight.
+    fields are merged into every job's metadata (e.g. parent_id of a playlist); an item's
+    "delay" (seconds) postpones when its NEW_QUEUE message becomes visible.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(submit_job(item, semaphore, **fields) for item in items))
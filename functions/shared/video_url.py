@@ -0,0 +1,87 @@
+import re
+from urllib.parse import parse_qs, urlparse
+
+YOUTUBE = "youtube"
+
+_YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com"}
+_YOUTUBE_PATH_PREFIXES = ("shorts/", "embed/", "live/", "v/")
+_YOUTUBE_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_YOUTUBE_CHANNEL_PREFIXES = ("channel", "c", "user")
+_YOUTUBE_CHANNEL_TABS = ("videos", "shorts", "streams")
+DIRECT_MEDIA_EXTENSIONS = (".mp4", ".m4a", ".mp3", ".webm", ".wav", ".ogg", ".opus", ".aac", ".flac", ".mov", ".mkv")
+
+
+def canonical_video_id(url: str) -> tuple[str, str] | None:
+    """
+    Map a video URL to (platform, video id), so watch URLs, youtu.be short links,
+    shorts/embed/live URLs of the same video all resolve to the same key.
+    Returns None for URLs that do not point at a single known video.
+    """
+    try:
+        parsed = urlparse(url.strip() if "://" in url else f"https://{url.strip()}")
+    except ValueError:
+        return None
+
+    host = (parsed.hostname or "").lower()
+    path = parsed.path.lstrip("/")
+    video_id = None
+
+    if host == "youtu.be":
+        video_id = path.split("/")[0]
+    elif host in _YOUTUBE_HOSTS:
+        if path == "watch":
+            video_id = parse_qs(parsed.query).get("v", [None])[0]
+        else:
+            for prefix in _YOUTUBE_PATH_PREFIXES:
+                if path.startswith(prefix):
+                    video_id = path[len(prefix):].split("/")[0]
+                    break
+
+    if video_id and _YOUTUBE_ID.match(video_id):
+        return YOUTUBE, video_id
+    return None
+
+
+def canonical_collection_url(url: str) -> str | None:
+    """
+    Normalize a playlist or channel URL for flat extraction: playlists become /playlist?list=...,
+    channels their videos tab (or the shorts/streams tab if that was linked).
+    Returns None for URLs that are not a playlist or channel.
+    """
+    try:
+        parsed = urlparse(url.strip() if "://" in url else f"https://{url.strip()}")
+    except ValueError:
+        return None
+
+    if (parsed.hostname or "").lower() not in _YOUTUBE_HOSTS:
+        return None
+
+    parts = [part for part in parsed.path.split("/") if part]
+    if parts == ["playlist"]:
+        playlist_id = parse_qs(parsed.query).get("list", [None])[0]
+        return f"https://www.youtube.com/playlist?list={playlist_id}" if playlist_id else None
+
+    if parts and parts[0].startswith("@"):
+        channel, rest = parts[:1], parts[1:]
+    elif len(parts) >= 2 and parts[0] in _YOUTUBE_CHANNEL_PREFIXES:
+        channel, rest = parts[:2], parts[2:]
+    else:
+        return None
+
+    tab = rest[0] if rest and rest[0] in _YOUTUBE_CHANNEL_TABS else "videos"
+    return f"https://www.youtube.com/{'/'.join(channel)}/{tab}"
+
+
+def is_direct_media_url(url: str) -> bool:
+    """http(s) link straight to an audio/video file, judged by the extension of its path"""
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return False
+    return parsed.scheme in ("http", "https") and parsed.path.lower().endswith(DIRECT_MEDIA_EXTENSIONS)
+
+
+def canonical_video_url(platform: str, video_id: str) -> str:
+    if platform == YOUTUBE:
+        return f"https://www.youtube.com/watch?v={video_id}"
+    raise ValueError(f"Unsupported platform: {platform}")
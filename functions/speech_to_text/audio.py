@@ -0,0 +1,89 @@
+# speech_to_text/audio.py
+import subprocess
+import threading
+from typing import Iterable
+
+from .chunking import SAMPLE_RATE
+
+READ_SIZE = 1024 * 1024
+# bytes of ffmpeg's stderr kept for the error message
+STDERR_TAIL = 4096
+
+
+class AudioDecodeError(Exception):
+    """ffmpeg could not decode the input (e.g. an mp4 whose index sits at the end of a piped stream)"""
+
+
+def _ffmpeg_command(source: str) -> list[str]:
+    # mono 16 kHz float32, exactly what Whisper consumes, so no conversion is needed afterwards
+    return [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0", "-i", source,
+        "-f", "f32le", "-ac", "1", "-acodec", "pcm_f32le", "-ar", str(SAMPLE_RATE), "pipe:1",
+    ]
+
+
+def pipe_through(command: list[str], chunks: Iterable[bytes]) -> bytearray:
+    """
+    Feed chunks to command's stdin and drain its stderr on separate threads while collecting
+    its stdout, so no side can block another on a full pipe.
+    """
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    feed_error = []
+
+    def feed():
+        try:
+            for chunk in chunks:
+                process.stdin.write(chunk)
+        except BrokenPipeError:
+            # the process gave up early, its exit code and stderr tell why
+            pass
+        except Exception as e:
+            feed_error.append(e)
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def drain_stderr():
+        # a chatty ffmpeg fills the stderr pipe long before stdout ends, only the tail is worth keeping
+        while data := process.stderr.read(STDERR_TAIL):
+            stderr[:] = (stderr + data)[-STDERR_TAIL:]
+
+    stderr = bytearray()
+    feeder = threading.Thread(target=feed, name="ffmpeg-feed", daemon=True)
+    drainer = threading.Thread(target=drain_stderr, name="ffmpeg-stderr", daemon=True)
+    feeder.start()
+    drainer.start()
+
+    output = bytearray()
+    while data := process.stdout.read(READ_SIZE):
+        output += data
+    process.wait()
+    feeder.join()
+    drainer.join()
+
+    if feed_error:
+        raise feed_error[0]
+    if process.returncode != 0:
+        raise AudioDecodeError(stderr.decode("utf-8", "replace").strip() or f"exit code {process.returncode}")
+    return output
+
+
+def _to_array(pcm: bytearray):
+    import numpy as np
+
+    # frombuffer shares the bytearray's memory, the decoded audio is never copied
+    return np.frombuffer(pcm, dtype=np.float32)
+
+
+def decode_audio_stream(chunks: Iterable[bytes]):
+    """
+    Decode a compressed audio stream (e.g. blob download chunks) into a 16 kHz mono float32
+    NumPy array without touching the disk.
+    """
+    return _to_array(pipe_through(_ffmpeg_command("pipe:0"), chunks))
+
+
+def decode_audio_file(path: str):
+    return _to_array(pipe_through(_ffmpeg_command(path), ()))
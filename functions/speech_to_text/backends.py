@@ -0,0 +1,108 @@
+# speech_to_text/backends.py
+import importlib.util
+
+from ..shared.logs import logging
+
+# every backend returns a model whose transcribe(audio) gives openai-whisper's result shape:
+# {"text", "language", "segments": [{"start", "end", "text"}, ...]}
+WHISPER = "whisper"
+WHISPER_INT8 = "whisper-int8"
+FASTER_WHISPER = "faster-whisper"
+
+
+def _pick_device(device: str) -> str:
+    import torch
+
+    return device or ("cuda" if torch.cuda.is_available() else "cpu")
+
+
+def load_whisper(model_size: str, device: str):
+    # torch and whisper are imported here, so only processes that transcribe pay for them
+    import whisper
+
+    device = _pick_device(device)
+    logging.info(f"Using device for Whisper: {device}")
+    return whisper.load_model(model_size, device=device)
+
+
+def load_whisper_int8(model_size: str, device: str):
+    """
+    openai-whisper with its Linear layers dynamically quantized to int8: weights are stored as
+    int8 and activations quantized on the fly, which is where fp32 CPU inference spends its time.
+    """
+    import torch
+
+    if _pick_device(device) != "cpu":
+        logging.warning("int8 dynamic quantization only runs on CPU, loading the fp32 model")
+        return load_whisper(model_size, device)
+
+    model = _with_plain_linears(load_whisper(model_size, "cpu"))
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _with_plain_linears(model):
+    """
+    Replace whisper.model.Linear (an nn.Linear subclass that only casts weights to the input dtype)
+    with nn.Linear sharing its parameters: quantize_dynamic matches module types exactly and would
+    otherwise leave every layer in fp32.
+    """
+    import torch
+
+    for parent in list(model.modules()):
+        for name, child in parent.named_children():
+            if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+                plain = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None, device="meta")
+                plain.weight, plain.bias = child.weight, child.bias
+                setattr(parent, name, plain)
+    return model
+
+
+class FasterWhisperModel:
+    """Adapts a faster_whisper.WhisperModel (CTranslate2) to openai-whisper's transcribe()"""
+
+    def __init__(self, model):
+        self._model = model
+
+    def transcribe(self, audio, **kwargs) -> dict:
+        segments, info = self._model.transcribe(audio, **kwargs)
+        # segments is a generator, decoding happens while it is consumed
+        segments = [{"start": s.start, "end": s.end, "text": s.text} for s in segments]
+        return {"text": "".join(s["text"] for s in segments), "language": info.language, "segments": segments}
+
+
+def load_faster_whisper(model_size: str, device: str):
+    import faster_whisper
+
+    device = _pick_device(device)
+    compute_type = "int8" if device == "cpu" else "float16"
+    logging.info(f"Using device for faster-whisper: {device} ({compute_type})")
+    return FasterWhisperModel(faster_whisper.WhisperModel(model_size, device=device, compute_type=compute_type))
+
+
+_LOADERS = {
+    WHISPER: load_whisper,
+    WHISPER_INT8: load_whisper_int8,
+    FASTER_WHISPER: load_faster_whisper,
+}
+
+
+def available_backends() -> list[str]:
+    backends = [WHISPER, WHISPER_INT8]
+    if importlib.util.find_spec("faster_whisper") is not None:
+        backends.append(FASTER_WHISPER)
+    return backends
+
+
+def resolve_backend(backend: str | None) -> str:
+    """Normalize a configured backend name, falling back to whisper-int8 if faster-whisper is not installed"""
+    backend = (backend or WHISPER).lower()
+    if backend not in _LOADERS:
+        raise ValueError(f"Unsupported speech-to-text backend: {backend}")
+    if backend == FASTER_WHISPER and FASTER_WHISPER not in available_backends():
+        logging.warning("faster-whisper is not installed, falling back to the int8 whisper backend")
+        return WHISPER_INT8
+    return backend
+
+
+def get_loader(backend: str):
+    return _LOADERS[backend]
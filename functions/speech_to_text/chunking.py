@@ -0,0 +1,56 @@
+# speech_to_text/chunking.py
+from collections import Counter
+
+SAMPLE_RATE = 16000  # Whisper's input rate
+FRAME_SECONDS = 0.03
+
+
+def frame_energies(audio, frame_seconds: float = FRAME_SECONDS) -> list[float]:
+    """
+    RMS energy of consecutive frame_seconds frames of a 16 kHz float32 signal.
+    """
+    import numpy as np
+
+    frame = int(SAMPLE_RATE * frame_seconds)
+    usable = len(audio) // frame * frame
+    frames = np.asarray(audio[:usable], dtype=np.float32).reshape(-1, frame)
+    return np.sqrt(np.mean(frames ** 2, axis=1)).tolist()
+
+
+def plan_chunks(energies: list[float], total_seconds: float, chunk_seconds: float, search_seconds: float,
+                frame_seconds: float = FRAME_SECONDS) -> list[tuple[float, float]]:
+    """
+    Split [0, total_seconds) into pieces of about chunk_seconds, cutting each one at the
+    quietest frame of the search_seconds before its target end, so cuts fall into pauses
+    instead of words. A remainder shorter than half a chunk is merged into the last piece.
+    """
+    chunks = []
+    start = 0.0
+    while total_seconds - start > chunk_seconds * 1.5:
+        target = start + chunk_seconds
+        first = max(int((target - search_seconds) / frame_seconds), int(start / frame_seconds) + 1)
+        last = min(int(target / frame_seconds), len(energies))
+        if first >= last:
+            cut = target
+        else:
+            quietest = min(range(first, last), key=energies.__getitem__)
+            cut = (quietest + 0.5) * frame_seconds
+        chunks.append((start, cut))
+        start = cut
+    chunks.append((start, total_seconds))
+    return chunks
+
+
+def stitch_chunks(results: list[dict]) -> dict:
+    """
+    Merge per-chunk Whisper results, already ordered and with segment times shifted to the
+    whole file, into one result: segments concatenated, text rebuilt from them and the
+    language most chunks detected.
+    """
+    segments = [segment for result in results for segment in result["segments"]]
+    languages = Counter(result.get("language") for result in results if result.get("language"))
+    return {
+        "text": " ".join(text for text in (segment["text"].strip() for segment in segments) if text),
+        "language": languages.most_common(1)[0][0] if languages else "unknown",
+        "segments": segments,
+    }
@@ -1,21 +1,26 @@
+import functools
 import tempfile
+import time
 
-import torch
-import whisper
 from azure.functions import QueueMessage
 
-from ..shared.common import write_blob, enqueue_message, get_blob_client, read_job_metadata, write_job_metadata, \
-    write_failed_job_metadata
-from ..shared.config import TRANSCRIBED_QUEUE, TRANSCRIPT_FILENAME, MAX_DEQUEUE_COUNT
+from .audio import AudioDecodeError, decode_audio_file, decode_audio_stream
+from .chunking import SAMPLE_RATE
+from .model import get_whisper_model
+from .parallel import transcribe_chunked
+from .vad import VOICE_DETECTION, detect_speech, speech_ratio, speech_spans
+from ..shared.common import write_blob, enqueue_message, get_blob_client, transition_job_status, \
+    write_failed_job_metadata, reset_round_trips, get_round_trips
+from ..shared.config import AUDIO_FILENAME, TRANSCRIBED_QUEUE, TRANSCRIPT_FILENAME, SEGMENTS_FILENAME, \
+    SPEECH_FILENAME, TRANSCRIPT_MANIFEST_FILENAME, TRANSCRIPT_PART_FILENAME, MAX_DEQUEUE_COUNT, INCREMENTAL_TRANSCRIPT, \
+    SPEECH_MIN_RATIO, SPEECH_PRESCREEN_ENABLED, VAD_SKIP_SILENCE, WHISPER_CHUNK_SEARCH_SECONDS, \
+    WHISPER_CHUNK_SECONDS, WHISPER_CHUNK_WORKERS, WHISPER_WARMUP
 from ..shared.job_status import JobStatus
 from ..shared.logs import logging
+from ..shared.segments import SegmentTable
 
-logging.info("Loading Whisper model...")
-device = "cuda" if torch.cuda.is_available() else "cpu"
-logging.info(f"Using device for Whisper: {device}")
-
-_model = whisper.load_model("base", device=device)
-logging.info(f"Model loaded on: {device}")
+if WHISPER_WARMUP:
+    get_whisper_model().warm_up_in_background()
 
 
 def parse_id(msg: QueueMessage):
@@ -28,45 +33,151 @@ def parse_id(msg: QueueMessage):
         raise
 
 
-def transcribe_audio(job_id):
-    blob_client = get_blob_client(f"results/{job_id}/audio.mp3")
-    with tempfile.NamedTemporaryFile(suffix=".mp3") as tmp_file:
-        tmp_file.write(blob_client.download_blob().readall())
+def download_audio(job_id):
+    """
+    Decode results/{id}/audio.mp3 into a 16 kHz float32 array, piping the blob download
+    straight into ffmpeg. Formats ffmpeg cannot read from a pipe (mp4 with the index at the
+    end) are retried from a temporary file.
+    """
+    blob_client = get_blob_client(f"results/{job_id}/{AUDIO_FILENAME}")
+    try:
+        return decode_audio_stream(blob_client.download_blob().chunks())
+    except AudioDecodeError as e:
+        logging.warning(f"Streaming decode failed for job {job_id}, retrying from a temporary file: {e}")
+
+    with tempfile.NamedTemporaryFile(suffix=".audio") as tmp_file:
+        for chunk in blob_client.download_blob().chunks():
+            tmp_file.write(chunk)
         tmp_file.flush()
+        return decode_audio_file(tmp_file.name)
 
-        logging.info(f"Transcribing audio for job {job_id}...")
-        result = _model.transcribe(tmp_file.name)
-        transcript = result["text"]
-        language = result.get("language", "unknown")
-        logging.info(f"Transcription complete for job {job_id}, language: {language}")
 
-        return transcript, language
+def transcribe_audio(job_id):
+    """
+    Returns (transcript, language, segment table), or None when the pre-screen finds no sound at all,
+    or too little speech when webrtcvad can tell speech apart.
+    """
+    start = time.perf_counter()
+    audio = download_audio(job_id)
+    decoded = time.perf_counter()
+
+    total_seconds = len(audio) / SAMPLE_RATE
+    energies = spans = None
+    if SPEECH_PRESCREEN_ENABLED:
+        energies, regions = detect_speech(audio)
+        ratio = speech_ratio(regions, total_seconds)
+        write_blob(
+            f"results/{job_id}/{SPEECH_FILENAME}",
+            {"id": job_id, "speech_ratio": round(ratio, 3), "regions": [[round(s, 2), round(e, 2)] for s, e in regions]}
+        )
+        logging.info(f"Job {job_id} speech ratio {ratio:.2f} in {len(regions)} regions")
+        if not regions or (VOICE_DETECTION and ratio < SPEECH_MIN_RATIO):
+            return None
+
+        spans = speech_spans(regions, total_seconds, VAD_SKIP_SILENCE)
+        if total_seconds - sum(end - begin for begin, end in spans) < VAD_SKIP_SILENCE:
+            # no long silence to skip
+            spans = None
+    screened = time.perf_counter()
+
+    logging.info(f"Transcribing {total_seconds:.0f}s of audio for job {job_id}...")
+    result = _transcribe(job_id, audio, spans, energies)
+    logging.info(
+        f"Whisper timings for job {job_id}: download_decode={(decoded - start) * 1000:.0f}ms "
+        f"prescreen={(screened - decoded) * 1000:.0f}ms transcribe={(time.perf_counter() - screened) * 1000:.0f}ms "
+        f"audio={audio.nbytes / 2**20:.0f}MiB"
+    )
+
+    language = result.get("language", "unknown")
+    transcript, segments = SegmentTable.from_timed_texts(
+        (segment["start"], segment["end"], segment["text"]) for segment in result.get("segments", ())
+    )
+    if not segments:
+        transcript = result["text"].strip()
+    logging.info(f"Transcription complete for job {job_id}, language: {language}")
+
+    return transcript, language, segments
+
+
+def _transcribe(job_id, audio, spans=None, energies=None) -> dict:
+    """
+    Whisper-style result (text, language, segments) for a 16 kHz float32 signal: one model call
+    in this process, or silence-bounded chunks on the worker pool when WHISPER_CHUNK_WORKERS > 1
+    and the audio is longer than two chunks. With spans, only those (start, end) ranges are transcribed.
+    """
+    if WHISPER_CHUNK_WORKERS > 1 and len(audio) / SAMPLE_RATE > 2 * WHISPER_CHUNK_SECONDS:
+        on_chunk = functools.partial(publish_transcript_part, job_id) if INCREMENTAL_TRANSCRIPT else None
+        return transcribe_chunked(
+            audio, WHISPER_CHUNK_WORKERS, WHISPER_CHUNK_SECONDS, WHISPER_CHUNK_SEARCH_SECONDS, on_chunk=on_chunk,
+            spans=spans, energies=energies
+        )
+
+    whisper_model = get_whisper_model()
+    if not whisper_model.loaded:
+        logging.info(f"Job {job_id} waits for the Whisper model to load")
+    start = time.perf_counter()
+    model = whisper_model.get()
+    logging.info(f"Whisper model wait for job {job_id}: {(time.perf_counter() - start) * 1000:.0f}ms")
+    if spans:
+        return model.transcribe(audio, clip_timestamps=[t for span in spans for t in span])
+    return model.transcribe(audio)
+
+
+def publish_transcript_part(job_id, index, result, total):
+    """
+    Write one finished chunk as transcript.part-{index}.json, update the manifest and queue the
+    part for nlp, which scores parts while later chunks are still being transcribed.
+    """
+    transcript, _ = SegmentTable.from_timed_texts(
+        (segment["start"], segment["end"], segment["text"]) for segment in result["segments"]
+    )
+    write_blob(
+        f"results/{job_id}/{TRANSCRIPT_PART_FILENAME.format(index=index)}",
+        {"id": job_id, "index": index, "transcript": transcript, "language": result.get("language")}
+    )
+    write_blob(
+        f"results/{job_id}/{TRANSCRIPT_MANIFEST_FILENAME}",
+        {"id": job_id, "parts": index + 1, "total": total, "complete": index + 1 == total}
+    )
+    enqueue_message({"id": job_id, "part": index}, queue_name=TRANSCRIBED_QUEUE)
+    logging.info(f"speech_to_text published part {index + 1}/{total} of job {job_id}")
 
 
-def save_results(job_id, transcript, language):
+def save_results(job_id, transcript, language, segments=None):
     write_blob(
         f"results/{job_id}/{TRANSCRIPT_FILENAME}",
         {"id": job_id, "transcript": transcript, "language": language}
     )
+    if segments:
+        write_blob(f"results/{job_id}/{SEGMENTS_FILENAME}", {"id": job_id, **segments.to_dict()})
     logging.info(f"Transcript saved for job {job_id}")
 
-    url = read_job_metadata(job_id).get("url")
-    write_job_metadata(
-        job_id,
-        url,
-        JobStatus.TRANSCRIBED.value
-    )
+    if transition_job_status(job_id, (JobStatus.CREATED, JobStatus.DOWNLOADED), JobStatus.TRANSCRIBED) is None:
+        logging.warning(f"speech_to_text skipped enqueue, job {job_id} has moved past TRANSCRIBED")
+        return
     logging.info(f"speech_to_text updated job {job_id} metadata to blob")
 
     enqueue_message({"id": job_id}, queue_name=TRANSCRIBED_QUEUE)
     logging.info(f"Job {job_id} enqueued to {TRANSCRIBED_QUEUE}")
 
 
+def mark_no_speech(job_id):
+    # nothing worth transcribing: neither Whisper nor nlp runs
+    if transition_job_status(job_id, (JobStatus.CREATED, JobStatus.DOWNLOADED), JobStatus.NO_SPEECH) is None:
+        logging.warning(f"speech_to_text could not mark job {job_id} NO_SPEECH, it has moved on")
+        return
+    logging.info(f"speech_to_text updated job {job_id} metadata to NO_SPEECH")
+
+
 def main(msg: QueueMessage):
     job_id = parse_id(msg)
+    reset_round_trips()
     try:
-        transcript, language = transcribe_audio(job_id)
-        save_results(job_id, transcript, language)
+        transcribed = transcribe_audio(job_id)
+        if transcribed is None:
+            mark_no_speech(job_id)
+        else:
+            save_results(job_id, *transcribed)
 
         logging.info(f"speech_to_text processed job {job_id}")
     except Exception as e:
@@ -77,3 +188,5 @@ def main(msg: QueueMessage):
             logging.error(f"Failed to transcribe job {job_id}")
 
         raise
+    finally:
+        logging.info(f"speech_to_text job {job_id} storage round-trips: {get_round_trips()}")
@@ -0,0 +1,98 @@
+# speech_to_text/model.py
+import resource
+import sys
+import threading
+import time
+
+from .backends import WHISPER, get_loader, resolve_backend
+from ..shared.config import WHISPER_BACKEND, WHISPER_DEVICE, WHISPER_MODEL_SIZE
+from ..shared.logs import logging
+
+WARMUP_SAMPLES = 16000  # one second of silence at Whisper's 16 kHz
+
+
+def _rss_mib() -> float:
+    """Current resident set size of this process, falling back to the peak where /proc is missing"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macOS, KiB elsewhere
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+class WhisperModel:
+    """
+    Lazily loaded, process-wide Whisper model.
+
+    Every function app shares one worker process, so loading at import made the api and the
+    downloader pay for torch, whisper and the weights. The model is now loaded by the first
+    get() (or warm_up()); concurrent callers wait on one lock and the load happens once.
+    """
+
+    def __init__(self, model_size: str, device: str = "", backend: str = WHISPER, loader=None):
+        self.model_size = model_size
+        self.device = device
+        self.backend = backend
+        self._loader = loader or get_loader(backend)
+        self._model = None
+        self._lock = threading.Lock()
+        self.load_seconds = None
+        self.rss_delta_mib = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+        return self._model
+
+    def warm_up(self):
+        """
+        Load the model and run it once on a second of silence, so the first real
+        transcription does not also pay for lazy kernel and cache initialization.
+        """
+        import numpy as np
+
+        model = self.get()
+        start = time.perf_counter()
+        model.transcribe(np.zeros(WARMUP_SAMPLES, dtype=np.float32))
+        logging.info(f"Whisper {self.model_size} warm-up inference took {time.perf_counter() - start:.2f}s")
+
+    def warm_up_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self._warm_up_logged, name="whisper-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_up_logged(self):
+        try:
+            self.warm_up()
+        except Exception as e:
+            # the first transcription will retry the load and surface the error
+            logging.error(f"Whisper warm-up failed: {e}")
+
+    def _load(self):
+        logging.info(f"Loading Whisper model {self.model_size} with the {self.backend} backend...")
+        rss_before = _rss_mib()
+        start = time.perf_counter()
+        model = self._loader(self.model_size, self.device)
+        self.load_seconds = time.perf_counter() - start
+        self.rss_delta_mib = _rss_mib() - rss_before
+        logging.info(
+            f"Whisper model {self.model_size} ({self.backend}) loaded in {self.load_seconds:.2f}s, "
+            f"resident memory +{self.rss_delta_mib:.0f} MiB"
+        )
+        return model
+
+
+_whisper_model = WhisperModel(WHISPER_MODEL_SIZE, WHISPER_DEVICE, resolve_backend(WHISPER_BACKEND))
+
+
+def get_whisper_model() -> WhisperModel:
+    return _whisper_model
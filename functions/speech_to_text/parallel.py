@@ -0,0 +1,90 @@
+# speech_to_text/parallel.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from .chunking import FRAME_SECONDS, SAMPLE_RATE, frame_energies, plan_chunks, stitch_chunks
+from .model import get_whisper_model
+from ..shared.logs import logging
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _init_worker(torch_threads: int):
+    # split the cores between the workers instead of every worker claiming all of them
+    import torch
+
+    torch.set_num_threads(torch_threads)
+    get_whisper_model().get()
+
+
+def _transcribe_chunk(audio, offset_seconds: float) -> dict:
+    result = get_whisper_model().get().transcribe(audio)
+    return {
+        "language": result.get("language"),
+        "segments": [
+            {"start": segment["start"] + offset_seconds, "end": segment["end"] + offset_seconds,
+             "text": segment["text"]}
+            for segment in result.get("segments", ())
+        ],
+    }
+
+
+def get_transcription_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool shared by all chunked transcriptions of this worker. Every process loads its
+    own copy of the model once (memory grows with workers) and keeps it between jobs.
+    Processes are spawned, not forked: forking a process with torch threads running can deadlock.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            torch_threads = max(1, (os.cpu_count() or 1) // workers)
+            logging.info(f"Starting {workers} Whisper worker processes with {torch_threads} threads each")
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(torch_threads,),
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def transcribe_chunked(audio, workers: int, chunk_seconds: float, search_seconds: float, on_chunk=None,
+                       spans=None, energies=None) -> dict:
+    """
+    Transcribe a 16 kHz float32 signal as silence-bounded chunks on a process pool and stitch
+    the chunk results back in order. Returns a Whisper-style dict (text, language, segments).
+    on_chunk(index, result, total) is called in chunk order as soon as every earlier chunk is done.
+    spans limits transcription to those (start, end) ranges; energies reuses frame energies
+    already computed for the signal.
+    """
+    total_seconds = len(audio) / SAMPLE_RATE
+    if energies is None:
+        energies = frame_energies(audio)
+    chunks = []
+    for span_start, span_end in spans or [(0.0, total_seconds)]:
+        span_energies = energies[int(span_start / FRAME_SECONDS):int(span_end / FRAME_SECONDS)]
+        chunks.extend(
+            (span_start + start, span_start + end)
+            for start, end in plan_chunks(span_energies, span_end - span_start, chunk_seconds, search_seconds)
+        )
+    logging.info(f"Transcribing {total_seconds:.0f}s of audio as {len(chunks)} chunks on {workers} processes")
+
+    pool = get_transcription_pool(workers)
+    futures = [
+        pool.submit(_transcribe_chunk, audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)], start)
+        for start, end in chunks
+    ]
+    results = []
+    for index, future in enumerate(futures):
+        results.append(future.result())
+        if on_chunk is not None:
+            on_chunk(index, results[-1], len(futures))
+    return stitch_chunks(results)
@@ -0,0 +1,92 @@
+# speech_to_text/vad.py
+from .chunking import FRAME_SECONDS, SAMPLE_RATE, frame_energies
+from ..shared.config import VAD_AGGRESSIVENESS, VAD_MIN_ENERGY
+
+try:
+    import webrtcvad
+except ImportError:  # in requirements.txt, but the energy gate still runs without it
+    webrtcvad = None
+
+# whether detected regions are voice; without webrtcvad they are only sound, music and noise included
+VOICE_DETECTION = webrtcvad is not None
+
+# bridge pauses between words and sentences, pad region edges so onsets are not clipped
+MIN_PAUSE_SECONDS = 0.5
+PADDING_SECONDS = 0.2
+MIN_SPEECH_SECONDS = 0.25
+
+
+def speech_regions(flags: list[bool], frame_seconds: float = FRAME_SECONDS, min_pause: float = MIN_PAUSE_SECONDS,
+                   padding: float = PADDING_SECONDS, min_speech: float = MIN_SPEECH_SECONDS) -> list[tuple[float, float]]:
+    """
+    Turn per-frame speech flags into (start, end) second ranges: runs separated by less than
+    min_pause are joined, runs shorter than min_speech dropped, the rest padded on both sides.
+    """
+    runs = []
+    start = None
+    for i, flag in enumerate(list(flags) + [False]):
+        if flag and start is None:
+            start = i
+        elif not flag and start is not None:
+            if runs and (start - runs[-1][1]) * frame_seconds < min_pause:
+                runs[-1] = (runs[-1][0], i)
+            else:
+                runs.append((start, i))
+            start = None
+
+    total = len(flags) * frame_seconds
+    regions = []
+    for first, last in runs:
+        if (last - first) * frame_seconds < min_speech:
+            continue
+        region = (max(0.0, first * frame_seconds - padding), min(total, last * frame_seconds + padding))
+        if regions and region[0] <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], region[1])
+        else:
+            regions.append(region)
+    return regions
+
+
+def speech_spans(regions: list[tuple[float, float]], total_seconds: float,
+                 max_silence: float) -> list[tuple[float, float]]:
+    """
+    Ranges worth transcribing: speech regions joined across silences up to max_silence seconds,
+    so only long silent stretches are cut out (Whisper needs context around short pauses).
+    """
+    spans = []
+    for start, end in regions:
+        if spans and start - spans[-1][1] <= max_silence:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+    return [(start, min(end, total_seconds)) for start, end in spans]
+
+
+def speech_ratio(regions: list[tuple[float, float]], total_seconds: float) -> float:
+    return sum(end - start for start, end in regions) / total_seconds if total_seconds else 0.0
+
+
+def _webrtc_flags(audio, frame_count: int) -> list[bool]:
+    import numpy as np
+
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+    frame_bytes = int(SAMPLE_RATE * FRAME_SECONDS) * 2
+    vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+    return [vad.is_speech(pcm[i * frame_bytes:(i + 1) * frame_bytes], SAMPLE_RATE) for i in range(frame_count)]
+
+
+def detect_speech(audio) -> tuple[list[float], list[tuple[float, float]]]:
+    """
+    Cheap speech detection over a 16 kHz float32 signal. A frame counts as speech when it is
+    louder than VAD_MIN_ENERGY (absolute silence is below it) and, when webrtcvad is installed,
+    webrtcvad agrees. No threshold relative to the noise floor: speech over music barely rises
+    above it. Returns (frame energies, speech regions), see VOICE_DETECTION.
+    """
+    energies = frame_energies(audio)
+    if not energies:
+        return energies, []
+
+    flags = [energy > VAD_MIN_ENERGY for energy in energies]
+    if webrtcvad is not None:
+        flags = [flag and voiced for flag, voiced in zip(flags, _webrtc_flags(audio, len(flags)))]
+    return energies, speech_regions(flags)
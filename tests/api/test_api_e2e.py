@@ -3,7 +3,8 @@ import pytest
 import requests
 
 
-POLL_INTERVAL = 10
+POLL_WAIT = 20
+POLL_RETRY_INTERVAL = 1
 POLL_TIMEOUT = 120
 NEGATIVE_TEST_POLL_TIMEOUT = 240
 
@@ -11,9 +12,13 @@ NEGATIVE_TEST_POLL_TIMEOUT = 240
 def poll_job_status(base_url: str, job_id: str, timeout: int = POLL_TIMEOUT) -> dict:
     start_time = time.time()
     terminal_states = {"DONE", "FAILED", "NO_SPEECH"}
+    status = None
 
     while time.time() - start_time < timeout:
-        response = requests.get(f"{base_url}?id={job_id}")
+        # long-poll: the API holds the request until the status moves past `since`
+        wait = max(1, min(POLL_WAIT, int(timeout - (time.time() - start_time))))
+        since = f"&since={status}" if status else ""
+        response = requests.get(f"{base_url}?id={job_id}&wait={wait}{since}")
 
         if response.status_code == 200:
             data = response.json()
@@ -21,8 +26,8 @@ def poll_job_status(base_url: str, job_id: str, timeout: int = POLL_TIMEOUT) ->
 
             if status in terminal_states:
                 return data
-
-        time.sleep(POLL_INTERVAL)
+        else:
+            time.sleep(POLL_RETRY_INTERVAL)
 
     response = requests.get(f"{base_url}?id={job_id}")
     return response.json() if response.status_code == 200 else {"status": "TIMEOUT"}
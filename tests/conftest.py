@@ -0,0 +1,99 @@
+import itertools
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+
+
+class FakeBlobClient:
+    """Minimal in-memory stand-in for azure.storage.blob.BlobClient"""
+
+    _etags = itertools.count(1)
+
+    def __init__(self, store: dict, blob_name: str):
+        self.store = store
+        self.blob_name = blob_name
+
+    def upload_blob(self, body, overwrite=False, content_settings=None, metadata=None, etag=None,
+                    match_condition=None, **kwargs):
+        current = self.store.get(self.blob_name)
+        if etag and (current is None or current.etag != etag):
+            raise ResourceModifiedError("The condition specified using HTTP conditional header(s) is not met.")
+        if not overwrite and current is not None:
+            raise ResourceExistsError("The specified blob already exists.")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        new_etag = f'"0x{next(self._etags):X}"'
+        self.store[self.blob_name] = SimpleNamespace(
+            body=body,
+            etag=new_etag,
+            last_modified=datetime.now(timezone.utc),
+            metadata=metadata or {},
+            content_settings=content_settings or SimpleNamespace(content_encoding=None),
+        )
+        return {"etag": new_etag}
+
+    def stage_block(self, block_id, data, **kwargs):
+        self.store.setdefault(("blocks", self.blob_name), {})[block_id] = bytes(data)
+
+    def commit_block_list(self, block_list, content_settings=None, metadata=None, **kwargs):
+        staged = self.store.pop(("blocks", self.blob_name), {})
+        body = b"".join(staged[block.id] for block in block_list)
+        return self.upload_blob(body, overwrite=True, content_settings=content_settings, metadata=metadata)
+
+    def download_blob(self, decompress=True, **kwargs):
+        blob = self.store.get(self.blob_name)
+        if blob is None:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return SimpleNamespace(readall=lambda: blob.body, properties=blob)
+
+    def get_blob_properties(self, **kwargs):
+        blob = self.store.get(self.blob_name)
+        if blob is None:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return blob
+
+
+class FakeTableClient:
+    """Minimal in-memory stand-in for azure.data.tables.TableClient"""
+
+    def __init__(self, store: dict):
+        self.store = store
+
+    def upsert_entity(self, entity, mode=None, **kwargs):
+        self.store[(entity["PartitionKey"], entity["RowKey"])] = dict(entity)
+
+    def delete_entity(self, partition_key, row_key, **kwargs):
+        self.store.pop((partition_key, row_key), None)
+
+    def query_entities(self, query_filter, parameters=None, select=None, **kwargs):
+        # only single-partition queries are supported
+        assert query_filter == "PartitionKey eq @partition"
+        return [entity for (partition, _), entity in self.store.items() if partition == parameters["partition"]]
+
+    def get_entity(self, partition_key, row_key, **kwargs):
+        if (partition_key, row_key) not in self.store:
+            raise ResourceNotFoundError("The specified resource does not exist.")
+        return self.store[(partition_key, row_key)]
+
+
+@pytest.fixture
+def fake_storage(monkeypatch):
+    from functions.shared import common
+
+    store = {}
+    monkeypatch.setattr(common, "get_blob_client", lambda blob_name, container=None: FakeBlobClient(store, blob_name))
+    monkeypatch.setattr(common, "_job_metadata_cache", common.OrderedDict())
+    monkeypatch.setattr(common, "JOB_INDEX_ENABLED", False)
+    return store
+
+
+@pytest.fixture
+def fake_index(monkeypatch):
+    from functions.shared import common
+
+    store = {}
+    monkeypatch.setattr(common, "get_table_client", lambda table_name: FakeTableClient(store))
+    monkeypatch.setattr(common, "JOB_INDEX_ENABLED", True)
+    return store
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+from azure.functions import HttpRequest
+
+from functions.api import main as api
+from functions.shared import submission
+
+
+def post(body: bytes) -> HttpRequest:
+    return HttpRequest(method="POST", url="/api/api", body=body, params={})
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    jobs = {"metadata": [], "queued": []}
+
+    async def fake_write(job_id, url, status, **fields):
+        if "broken" in url:
+            raise RuntimeError("blob write failed")
+        jobs["metadata"].append((job_id, url, status))
+
+    async def fake_enqueue(message, queue_name, visibility_timeout=None):
+        jobs["queued"].append((message["id"], queue_name))
+
+    async def no_previous_results(platform, video_id):
+        return None
+
+    monkeypatch.setattr(submission, "awrite_job_metadata", fake_write)
+    monkeypatch.setattr(submission, "aenqueue_message", fake_enqueue)
+    monkeypatch.setattr(submission, "aread_video_index", no_previous_results)
+    return jobs
+
+
+class TestBulkPost:
+
+    def test_urls_list(self, submitted):
+        body = json.dumps({"urls": ["https://youtu.be/a", {"id": "job-b", "url": "https://youtu.be/b"}]})
+
+        response = api.handle_post(post(body.encode()))
+        data = json.loads(response.get_body())
+
+        assert response.status_code == 200
+        assert data["submitted"] == 2
+        assert data["jobs"][1] == {"id": "job-b", "url": "https://youtu.be/b"}
+        assert len(submitted["queued"]) == 2
+
+    def test_jsonl_body_reports_per_item_errors(self, submitted):
+        body = "\n".join([
+            json.dumps({"url": "https://youtu.be/a"}),
+            json.dumps({"title": "no url"}),
+            json.dumps({"url": "https://broken.example/video"}),
+            "not json",
+        ])
+
+        data = json.loads(api.handle_post(post(body.encode())).get_body())
+
+        assert data["submitted"] == 1
+        assert data["failed"] == 3
+        assert [job.get("error") for job in data["jobs"]] == [
+            None, "Missing url", "blob write failed", "Invalid JSON line"
+        ]
+        assert len(submitted["queued"]) == 1
+
+    def test_single_job_body_is_not_bulk(self):
+        request = post(json.dumps({"url": "https://youtu.be/a"}).encode())
+
+        assert api._parse_bulk_items(request) is None
+
+    def test_malformed_single_body_is_not_bulk(self):
+        response = api.handle_post(post(b"not json"))
+
+        assert response.status_code == 400
+        assert json.loads(response.get_body())["message"] == "Missing url parameter"
+
+    def test_single_ndjson_line_is_bulk(self, submitted):
+        request = HttpRequest(
+            method="POST", url="/api/api", params={},
+            headers={"Content-Type": "application/x-ndjson"},
+            body=json.dumps({"url": "https://youtu.be/a"}).encode(),
+        )
+
+        assert api._parse_bulk_items(request) == [{"url": "https://youtu.be/a"}]
+
+    def test_pretty_printed_single_job_is_not_bulk(self):
+        request = post(json.dumps({"url": "https://youtu.be/a"}, indent=2).encode())
+
+        assert api._parse_bulk_items(request) is None
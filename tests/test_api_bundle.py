@@ -0,0 +1,83 @@
+import json
+
+import pytest
+from azure.functions import HttpRequest
+
+from functions.api import main as api
+from functions.shared.common import read_blob_with_properties, write_blob, write_job_metadata
+from functions.shared.job_status import JobStatus
+
+
+def get(**params) -> HttpRequest:
+    return HttpRequest(method="GET", url="/api/api", body=b"", params=params)
+
+
+@pytest.fixture
+def bundle_storage(fake_storage, monkeypatch):
+    reads = []
+
+    async def fake_read_many(blob_names, return_exceptions=False, with_properties=False):
+        reads.append(list(blob_names))
+        results = []
+        for blob_name in blob_names:
+            try:
+                data, properties = read_blob_with_properties(blob_name)
+                results.append((data, properties) if with_properties else data)
+            except Exception as e:
+                results.append(e)
+        return results
+
+    monkeypatch.setattr(api, "aread_many", fake_read_many)
+    monkeypatch.setattr(api, "_artifact_cache", api.ArtifactCache(max_entries=16, max_bytes=1024 * 1024))
+
+    write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.DONE.value)
+    write_blob("results/job-1/summary.json", {"verdict": {"score": 0.7, "verdict": "POSITIVE"}})
+    write_blob("results/job-1/transcript.json", {"id": "job-1", "transcript": "Great battery."})
+    return reads
+
+
+class TestBundle:
+
+    def test_all_artifacts_in_one_response(self, bundle_storage):
+        response = api.handle_get(get(id="job-1", action="bundle"), "bundle")
+        data = json.loads(response.get_body())
+
+        assert response.status_code == 200
+        assert data["status"]["status"] == "DONE"
+        assert data["summary"]["verdict"]["verdict"] == "POSITIVE"
+        assert data["transcript"] == {"full-text": {"id": "job-1", "transcript": "Great battery."}}
+        assert data["metadata"] is None
+        assert len(bundle_storage) == 1
+
+    def test_field_selection_skips_transcript(self, bundle_storage):
+        response = api.handle_get(get(id="job-1", action="bundle", fields="status,summary"), "bundle")
+
+        assert set(json.loads(response.get_body())) == {"status", "summary"}
+        assert bundle_storage == [["results/job-1/summary.json"]]
+
+    def test_cached_parts_are_not_refetched(self, bundle_storage):
+        api.handle_get(get(id="job-1", action="summary"), "summary")
+
+        api.handle_get(get(id="job-1", action="bundle", fields="summary"), "bundle")
+
+        assert bundle_storage == []
+
+    def test_bundle_with_placeholder_is_not_cacheable(self, bundle_storage):
+        response = api.handle_get(get(id="job-1", action="bundle"), "bundle")
+
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert "ETag" not in response.headers
+
+    def test_complete_bundle_of_finished_job_is_immutable(self, bundle_storage):
+        response = api.handle_get(get(id="job-1", action="bundle", fields="status,summary,transcript"), "bundle")
+
+        assert "immutable" in response.headers["Cache-Control"]
+        assert response.headers["ETag"].startswith('W/"')
+
+    def test_cached_parts_keep_blob_etag(self, bundle_storage):
+        api.handle_get(get(id="job-1", action="bundle", fields="summary"), "bundle")
+
+        response = api.handle_get(get(id="job-1", action="summary"), "summary")
+
+        assert not response.headers["ETag"].startswith('W/"')
+        assert response.headers["Last-Modified"]
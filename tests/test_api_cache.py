@@ -0,0 +1,134 @@
+import json
+
+import pytest
+from azure.functions import HttpRequest
+
+from functions.api import main as api
+from functions.shared.common import write_blob, write_job_metadata
+from functions.shared.job_status import JobStatus
+
+
+def get(**params) -> HttpRequest:
+    return HttpRequest(method="GET", url="/api/api", body=b"", params=params)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = api.ArtifactCache(max_entries=8, max_bytes=1024 * 1024)
+    monkeypatch.setattr(api, "_artifact_cache", cache)
+    return cache
+
+
+class TestArtifactCache:
+
+    def test_terminal_job_summary_served_from_cache(self, fake_storage, cache):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.DONE.value)
+        write_blob("results/job-1/summary.json", {"verdict": {"score": 0.7, "verdict": "POSITIVE"}})
+
+        first = api.handle_get(get(id="job-1", action="summary"), "summary")
+        fake_storage.clear()
+        second = api.handle_get(get(id="job-1", action="summary"), "summary")
+
+        assert second.status_code == 200
+        assert second.get_body() == first.get_body()
+        assert cache.stats()["hits"] >= 1
+
+    def test_active_job_artifacts_expire(self, fake_storage, cache, monkeypatch):
+        monkeypatch.setattr(api, "API_CACHE_ACTIVE_TTL", 0)
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.TRANSCRIBED.value)
+        write_blob("results/job-1/video_metadata.json", {"video-metadata": {"title": "Review"}})
+
+        api.handle_get(get(id="job-1", action="metadata"), "metadata")
+        fake_storage.clear()
+
+        assert api.handle_get(get(id="job-1", action="metadata"), "metadata").status_code == 404
+
+    def test_placeholder_is_not_cached(self, fake_storage, cache):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.DONE.value)
+
+        api.handle_get(get(id="job-1", action="summary"), "summary")
+        write_blob("results/job-1/summary.json", {"verdict": {"score": 0.7, "verdict": "POSITIVE"}})
+        response = api.handle_get(get(id="job-1", action="summary"), "summary")
+
+        assert "verdict" in json.loads(response.get_body())
+
+    def test_lru_respects_byte_budget(self):
+        cache = api.ArtifactCache(max_entries=8, max_bytes=10)
+        cache.put(("a", "summary"), api.CachedResponse("123456"), 60)
+        cache.put(("b", "summary"), api.CachedResponse("123456"), 60)
+
+        assert cache.get(("a", "summary")) is None
+        assert cache.get(("b", "summary")).body == "123456"
+        assert cache.stats()["bytes"] == 6
+
+
+class TestConditionalGet:
+
+    def test_etag_and_not_modified_without_download(self, fake_storage, cache, monkeypatch):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.DONE.value)
+        write_blob("results/job-1/summary.json", {"verdict": {"score": 0.7, "verdict": "POSITIVE"}})
+
+        first = api.handle_get(get(id="job-1", action="summary"), "summary")
+        etag = first.headers["ETag"]
+        assert etag == fake_storage["results/job-1/summary.json"].etag
+        assert "immutable" in first.headers["Cache-Control"]
+        assert "Last-Modified" in first.headers
+
+        # a fresh worker: nothing cached, only the blob properties may be read
+        monkeypatch.setattr(api, "_artifact_cache", api.ArtifactCache(max_entries=8, max_bytes=1024 * 1024))
+        api._read_status("job-1")
+        monkeypatch.setattr(api, "read_blob_with_properties", lambda blob_name: pytest.fail("body downloaded"))
+        request = HttpRequest(
+            method="GET", url="/api/api", body=b"", params={"id": "job-1", "action": "summary"},
+            headers={"If-None-Match": etag},
+        )
+
+        assert api.handle_get(request, "summary").status_code == 304
+
+    def test_active_job_status_is_revalidated(self, fake_storage, cache):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.CREATED.value)
+
+        first = api.handle_get(get(id="job-1"), None)
+        request = HttpRequest(
+            method="GET", url="/api/api", body=b"", params={"id": "job-1"},
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+        assert first.headers["Cache-Control"] == "no-cache"
+        assert api.handle_get(request, None).status_code == 304
+
+    def test_placeholder_has_no_validator(self, fake_storage, cache):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.DONE.value)
+
+        response = api.handle_get(get(id="job-1", action="summary"), "summary")
+
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert "ETag" not in response.headers
+
+    def test_missing_artifact_with_if_none_match_returns_placeholder(self, fake_storage, cache):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.TRANSCRIBED.value)
+        request = HttpRequest(
+            method="GET", url="/api/api", body=b"", params={"id": "job-1", "action": "summary"},
+            headers={"If-None-Match": '"0x1"'},
+        )
+
+        response = api.handle_get(request, "summary")
+
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "no-cache"
+
+    def test_artifact_read_while_active_is_not_immutable(self, fake_storage, cache, monkeypatch):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.TRANSCRIBED.value)
+        write_blob("results/job-1/summary.json", {"verdict": {"score": 0.7, "verdict": "POSITIVE"}})
+        read_artifact = api._read_artifact
+
+        def finish_during_read(job_id, action):
+            result = read_artifact(job_id, action)
+            write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.DONE.value)
+            monkeypatch.setattr(api, "_artifact_cache", api.ArtifactCache(max_entries=8, max_bytes=1024 * 1024))
+            return result
+
+        monkeypatch.setattr(api, "_read_artifact", finish_during_read)
+        response = api.handle_get(get(id="job-1", action="summary"), "summary")
+
+        assert response.headers["Cache-Control"] == "no-cache"
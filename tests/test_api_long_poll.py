@@ -0,0 +1,64 @@
+import json
+import threading
+import time
+
+import pytest
+from azure.functions import HttpRequest
+
+from functions.api import main as api
+from functions.shared.common import transition_job_status, write_job_metadata
+from functions.shared.job_status import JobStatus
+
+
+def get(**params) -> HttpRequest:
+    return HttpRequest(method="GET", url="/api/api", body=b"", params=params)
+
+
+@pytest.fixture
+def watcher(fake_storage, monkeypatch):
+    monkeypatch.setattr(api, "_artifact_cache", api.ArtifactCache(max_entries=16, max_bytes=1024 * 1024))
+    watcher = api.StatusWatcher(interval=0.05)
+    monkeypatch.setattr(api, "_status_watcher", watcher)
+    write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.CREATED.value)
+    return watcher
+
+
+class TestLongPoll:
+
+    def test_returns_when_status_changes(self, watcher):
+        threading.Timer(0.2, transition_job_status, ("job-1", (JobStatus.CREATED,), JobStatus.TRANSCRIBED)).start()
+
+        start = time.monotonic()
+        response = api.handle_get(get(id="job-1", wait="5"), None)
+
+        assert json.loads(response.get_body())["status"] == "TRANSCRIBED"
+        assert time.monotonic() - start < 2
+
+    def test_returns_current_status_after_deadline(self, watcher):
+        response = api.handle_get(get(id="job-1", wait="0.2", since="CREATED"), None)
+
+        assert json.loads(response.get_body())["status"] == "CREATED"
+
+    def test_since_differs_returns_immediately(self, watcher):
+        response = api.handle_get(get(id="job-1", wait="5", since="TRANSCRIBED"), None)
+
+        assert json.loads(response.get_body())["status"] == "CREATED"
+        assert watcher._thread is None
+
+    def test_waiters_share_one_read_per_interval(self, watcher, monkeypatch):
+        api._read_status("job-1")
+        reads = []
+        fetch_status = api._fetch_status
+        monkeypatch.setattr(api, "_fetch_status", lambda job_id: reads.append(job_id) or fetch_status(job_id))
+
+        threads = [
+            threading.Thread(target=api.handle_get, args=(get(id="job-1", wait="0.3"), None))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # one read per watcher tick, not one per waiting request
+        assert len(reads) <= 0.3 / 0.05 + 2
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from functions.shared import common
+from functions.shared.config import CONNECTION_STRING
+
+AZURITE = CONNECTION_STRING
+
+
+class TestAsyncClients:
+
+    def test_async_clients_reused_per_event_loop(self, monkeypatch):
+        # no real aiohttp sessions, they would outlive their loops unclosed
+        monkeypatch.setattr(common.aiohttp, "ClientSession", lambda connector: object())
+        monkeypatch.setattr(common.aiohttp, "TCPConnector", lambda limit: None)
+
+        async def clients_twice():
+            return common._get_async_clients(AZURITE), common._get_async_clients(AZURITE)
+
+        first, again = asyncio.run(clients_twice())
+        other_loop, _ = asyncio.run(clients_twice())
+
+        assert first is again
+        assert other_loop is not first
+
+
+class TestReadMany:
+
+    def test_missing_blob_returned_as_exception(self, monkeypatch):
+        async def fake_read(blob_name):
+            if blob_name.endswith("missing.json"):
+                raise FileNotFoundError(blob_name)
+            return {"name": blob_name}
+
+        monkeypatch.setattr(common, "aread_blob", fake_read)
+        names = ["results/a/one.json", "results/a/missing.json", "results/a/two.json"]
+
+        results = common.run_async(common.aread_many(names, return_exceptions=True))
+
+        assert results[0] == {"name": "results/a/one.json"}
+        assert isinstance(results[1], FileNotFoundError)
+        assert results[2] == {"name": "results/a/two.json"}
+        with pytest.raises(FileNotFoundError):
+            common.run_async(common.aread_many(names))
@@ -0,0 +1,26 @@
+import pytest
+
+from functions.speech_to_text.audio import AudioDecodeError, pipe_through
+
+
+class TestPipeThrough:
+
+    def test_large_input_streams_without_deadlock(self):
+        # far more than a pipe buffer in both directions
+        chunks = [bytes([i]) * 256 * 1024 for i in range(32)]
+
+        assert pipe_through(["cat"], iter(chunks)) == b"".join(chunks)
+
+    def test_failing_decoder_raises(self):
+        with pytest.raises(AudioDecodeError):
+            pipe_through(["sh", "-c", "cat > /dev/null; echo 'Invalid data found' >&2; exit 1"], [b"not audio"])
+
+    def test_decoder_exiting_early_is_reported_not_hung(self):
+        with pytest.raises(AudioDecodeError):
+            pipe_through(["false"], (b"x" * 1024 * 1024 for _ in range(16)))
+
+    def test_verbose_stderr_does_not_block_decoder(self):
+        script = "cat > /dev/null; head -c 300000 /dev/zero | tr '\\0' w >&2; echo 'last words' >&2; exit 1"
+
+        with pytest.raises(AudioDecodeError, match="last words$"):
+            pipe_through(["sh", "-c", script], [b"not audio"])
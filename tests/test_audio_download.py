@@ -0,0 +1,185 @@
+import re
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from functions.downloader import media, strategies
+from functions.shared.common import read_job_metadata, write_blob, write_job_metadata
+from functions.shared.job_status import JobStatus
+
+AUDIO = bytes(range(256)) * 40
+VIDEO_URL = "https://www.youtube.com/watch?v=abcdefghijk"
+CAPTIONLESS_INFO = {
+    "title": "Review",
+    "subtitles": {},
+    "formats": [
+        {"format_id": "18", "url": "video-url", "vcodec": "avc1", "acodec": "mp4a", "protocol": "https"},
+        {"format_id": "251", "url": "opus-url", "vcodec": "none", "acodec": "opus", "abr": 130,
+         "ext": "webm", "protocol": "https"},
+        {"format_id": "139", "url": "m4a-url", "vcodec": "none", "acodec": "mp4a", "abr": 48,
+         "ext": "m4a", "protocol": "https", "filesize": len(AUDIO)},
+    ],
+}
+
+
+class RangeResponse:
+
+    def __init__(self, body: bytes, status_code: int):
+        self.body = body
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    @property
+    def content(self):
+        return self.body
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=None):
+        for i in range(0, len(self.body), 100):
+            yield self.body[i:i + 100]
+
+
+class RangeHttp:
+    """Serves AUDIO, honouring Range headers when supports_range is set"""
+
+    def __init__(self, supports_range=True):
+        self.supports_range = supports_range
+        self.ranges = []
+        self.lock = threading.Lock()
+
+    def head(self, url, allow_redirects=False, timeout=None):
+        headers = {"Content-Length": str(len(AUDIO)), "Content-Type": "video/mp4"}
+        if self.supports_range:
+            headers["Accept-Ranges"] = "bytes"
+        return SimpleNamespace(url=url, headers=headers, raise_for_status=lambda: None)
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        match = re.match(r"bytes=(\d+)-(\d+)", (headers or {}).get("Range", ""))
+        if not (match and self.supports_range):
+            return RangeResponse(AUDIO, 200)
+        start, end = int(match[1]), int(match[2])
+        with self.lock:
+            self.ranges.append((start, end))
+        return RangeResponse(AUDIO[start:end + 1], 206)
+
+
+class TestStreamToBlob:
+
+    @pytest.mark.parametrize("size", [len(AUDIO), None])
+    def test_blob_matches_source(self, fake_storage, size):
+        http = RangeHttp()
+
+        written = media.stream_to_blob(http, "media-url", "results/job-1/audio.mp3", size=size, block_size=1000)
+
+        assert written == len(AUDIO)
+        assert fake_storage["results/job-1/audio.mp3"].body == AUDIO
+        assert len(http.ranges) == (11 if size else 0)
+
+    def test_server_without_range_support(self, fake_storage):
+        media.stream_to_blob(RangeHttp(supports_range=False), "media-url", "results/job-1/audio.mp3",
+                             size=len(AUDIO), block_size=1000)
+
+        assert fake_storage["results/job-1/audio.mp3"].body == AUDIO
+
+
+@pytest.fixture
+def youtube_audio(fake_storage, monkeypatch):
+    async def write_to_fake(blob_name, data):
+        return write_blob(blob_name, data)
+
+    extractor = SimpleNamespace(extract_info=lambda url, download=False: CAPTIONLESS_INFO)
+    session = SimpleNamespace(http=RangeHttp(), extractor=lambda options: extractor)
+    queued = []
+    monkeypatch.setattr(strategies, "get_downloader_session", lambda: session)
+    monkeypatch.setattr(strategies, "awrite_blob", write_to_fake)
+    monkeypatch.setattr(strategies.YOUTUBE_RATE_LIMITER, "rate", 0)
+    monkeypatch.setattr(strategies, "enqueue_message", lambda message, queue_name: queued.append(queue_name))
+    write_job_metadata("job-1", VIDEO_URL, JobStatus.CREATED.value)
+    return queued
+
+
+class TestAudioFallback:
+
+    def test_video_without_captions_is_downloaded_for_speech_to_text(self, fake_storage, youtube_audio):
+        queued = youtube_audio
+
+        strategies.YTAudioDownloader("job-1", VIDEO_URL, info=CAPTIONLESS_INFO).process()
+
+        audio = fake_storage["results/job-1/audio.mp3"]
+        assert audio.body == AUDIO
+        assert audio.content_settings.content_type == "audio/mp4"
+        assert read_job_metadata("job-1")["status"] == JobStatus.DOWNLOADED.value
+        assert queued == [strategies.DOWNLOADED_QUEUE]
+
+    def test_caption_downloader_hands_job_over(self, fake_storage, youtube_audio, monkeypatch):
+        acquired = []
+        monkeypatch.setattr(strategies.YOUTUBE_RATE_LIMITER, "acquire", lambda max_wait: acquired.append(max_wait))
+
+        fallback = strategies.YTDownloader("job-1", VIDEO_URL).process()
+        published = fake_storage["results/job-1/video_metadata.json"].etag
+
+        assert fallback == strategies.AudioFallback(CAPTIONLESS_INFO, True)
+        assert read_job_metadata("job-1")["status"] == JobStatus.METADATA_READY.value
+
+        strategies.YTAudioDownloader.from_fallback("job-1", VIDEO_URL, fallback).process()
+
+        assert len(acquired) == 1
+        assert fake_storage["results/job-1/video_metadata.json"].etag == published
+        assert read_job_metadata("job-1")["status"] == JobStatus.DOWNLOADED.value
+        assert youtube_audio == [strategies.DOWNLOADED_QUEUE]
+
+
+class TestDirectMedia:
+
+    @pytest.mark.parametrize("supports_range", [True, False])
+    def test_file_copied_to_audio_blob(self, fake_storage, monkeypatch, supports_range):
+        http = RangeHttp(supports_range)
+        queued = []
+        session = type("Session", (), {"http": http})()
+        monkeypatch.setattr(strategies, "get_downloader_session", lambda: session)
+        monkeypatch.setattr(strategies, "enqueue_message", lambda message, queue_name: queued.append(queue_name))
+        monkeypatch.setattr(strategies, "AUDIO_BLOCK_SIZE", 1000)
+        write_job_metadata("job-1", "https://cdn.example.com/review.mp4", JobStatus.CREATED.value)
+
+        strategies.DirectMediaDownloader("job-1", "https://cdn.example.com/review.mp4").process()
+
+        assert fake_storage["results/job-1/audio.mp3"].body == AUDIO
+        assert len(http.ranges) == (11 if supports_range else 0)
+        assert queued == [strategies.DOWNLOADED_QUEUE]
+
+
+class FailingRangeHttp(RangeHttp):
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        response = super().get(url, headers, timeout, stream)
+        if headers["Range"].startswith("bytes=0-"):
+            return RangeResponse(b"", 206)
+        return response
+
+
+class TestParallelRanges:
+
+    def test_blob_matches_source(self, fake_storage):
+        written = media.parallel_ranges_to_blob(RangeHttp(), "media-url", "results/job-1/audio.mp3",
+                                                len(AUDIO), workers=4, block_size=1000)
+
+        assert written == len(AUDIO)
+        assert fake_storage["results/job-1/audio.mp3"].body == AUDIO
+
+    def test_first_failure_aborts_without_commit(self, fake_storage):
+        http = FailingRangeHttp()
+
+        with pytest.raises(ValueError):
+            media.parallel_ranges_to_blob(http, "media-url", "results/job-1/audio.mp3",
+                                          len(AUDIO), workers=1, block_size=1000)
+
+        assert "results/job-1/audio.mp3" not in fake_storage
+        assert len(http.ranges) < 11
@@ -0,0 +1,48 @@
+from functions.shared.segments import SegmentTable
+from functions.speech_to_text.chunking import plan_chunks, stitch_chunks
+
+FRAME = 0.5
+
+
+def energies_with_pauses(total_seconds, pauses):
+    return [0.0 if any(start <= i * FRAME < end for start, end in pauses) else 1.0
+            for i in range(int(total_seconds / FRAME))]
+
+
+class TestPlanChunks:
+
+    def test_cuts_fall_into_pauses(self):
+        energies = energies_with_pauses(100, [(27, 28), (55, 56)])
+
+        chunks = plan_chunks(energies, 100, chunk_seconds=30, search_seconds=5, frame_seconds=FRAME)
+
+        assert chunks == [(0.0, 27.25), (27.25, 55.25), (55.25, 100)]
+
+    def test_no_silence_cuts_at_the_quietest_frame_in_window(self):
+        energies = [1.0] * 200
+        energies[110] = 0.5
+
+        chunks = plan_chunks(energies, 100, chunk_seconds=60, search_seconds=10, frame_seconds=FRAME)
+
+        assert chunks == [(0.0, 55.25), (55.25, 100)]
+
+    def test_short_audio_is_one_chunk(self):
+        assert plan_chunks([1.0] * 100, 50, chunk_seconds=40, search_seconds=5, frame_seconds=FRAME) == [(0.0, 50)]
+
+
+class TestStitch:
+
+    def test_segments_kept_in_order_with_majority_language(self):
+        results = [
+            {"language": "en", "segments": [{"start": 0.0, "end": 2.0, "text": " Great battery."}]},
+            {"language": "de", "segments": []},
+            {"language": "en", "segments": [{"start": 61.0, "end": 63.5, "text": " Weak camera."}]},
+        ]
+
+        stitched = stitch_chunks(results)
+
+        assert stitched["text"] == "Great battery. Weak camera."
+        assert stitched["language"] == "en"
+        text, table = SegmentTable.from_timed_texts((s["start"], s["end"], s["text"]) for s in stitched["segments"])
+        assert text == stitched["text"]
+        assert table.to_dict() == {"start_ms": [0, 61000], "duration_ms": [2000, 2500], "text_offset": [0, 15]}
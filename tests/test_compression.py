@@ -0,0 +1,50 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from functions.shared.common import _decode_blob, _encode_blob
+from functions.shared.compression import GZIP, IDENTITY, ZSTD, available_codecs
+
+
+def blob_properties(upload_kwargs: dict):
+    content_settings = upload_kwargs["content_settings"]
+    return SimpleNamespace(metadata=upload_kwargs.get("metadata"), content_settings=content_settings)
+
+
+@pytest.fixture
+def large_transcript():
+    return {"id": "job-1", "transcript": "The battery life is amazing and lasts whole day. " * 2000}
+
+
+class TestBlobCodec:
+
+    @pytest.mark.parametrize("codec", [GZIP, ZSTD])
+    def test_roundtrip_compressed(self, large_transcript, codec):
+        if codec not in available_codecs():
+            pytest.skip(f"{codec} not installed")
+
+        body, upload_kwargs = _encode_blob(large_transcript, codec)
+
+        assert len(body) < len(json.dumps(large_transcript))
+        assert upload_kwargs["metadata"] == {"codec": codec}
+        assert upload_kwargs["content_settings"].content_encoding == codec
+        assert _decode_blob(body, blob_properties(upload_kwargs)) == large_transcript
+
+    def test_small_payload_stays_plain(self):
+        body, upload_kwargs = _encode_blob({"id": "job-1", "status": "CREATED"}, GZIP)
+
+        assert json.loads(body) == {"id": "job-1", "status": "CREATED"}
+        assert "metadata" not in upload_kwargs
+
+    def test_identity_codec(self, large_transcript):
+        body, upload_kwargs = _encode_blob(large_transcript, IDENTITY)
+
+        assert json.loads(body) == large_transcript
+        assert upload_kwargs["content_settings"].content_encoding is None
+
+    def test_reads_legacy_uncompressed_blob(self, large_transcript):
+        legacy = SimpleNamespace(metadata={}, content_settings=SimpleNamespace(content_encoding=None))
+        body = json.dumps(large_transcript).encode("utf-8")
+
+        assert _decode_blob(body, legacy) == large_transcript
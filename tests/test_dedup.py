@@ -0,0 +1,142 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from azure.functions import HttpRequest
+
+from functions.api import main as api
+from functions.shared import submission
+from functions.shared.common import read_blob, read_job_metadata, write_blob, write_video_index
+from functions.shared.video_url import canonical_video_id
+
+
+class TestCanonicalVideoId:
+
+    @pytest.mark.parametrize("url", [
+        "https://www.youtube.com/watch?v=Qfb2IjEbIAI",
+        "https://youtube.com/watch?v=Qfb2IjEbIAI&t=42s",
+        "https://m.youtube.com/watch?feature=share&v=Qfb2IjEbIAI",
+        "https://youtu.be/Qfb2IjEbIAI?si=abc",
+        "https://www.youtube.com/shorts/Qfb2IjEbIAI",
+        "https://www.youtube.com/embed/Qfb2IjEbIAI",
+        "youtube.com/live/Qfb2IjEbIAI",
+    ])
+    def test_same_video(self, url):
+        assert canonical_video_id(url) == ("youtube", "Qfb2IjEbIAI")
+
+    @pytest.mark.parametrize("url", [
+        "https://www.youtube.com/playlist?list=PL123",
+        "https://www.youtube.com/watch?v=INVALID_VIDEO_ID_12345",
+        "https://example.com/video.mp4",
+    ])
+    def test_not_a_single_video(self, url):
+        assert canonical_video_id(url) is None
+
+
+@pytest.fixture
+def processed_video(fake_storage, monkeypatch):
+    async def fake_read_index(platform, video_id):
+        try:
+            return read_blob(f"video-index/{platform}/{video_id}")
+        except Exception:
+            return None
+
+    async def fake_read_many(blob_names, return_exceptions=False):
+        results = []
+        for blob_name in blob_names:
+            try:
+                results.append(read_blob(blob_name))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    async def fake_write(blob_name, data, codec=None):
+        return write_blob(blob_name, data)
+
+    async def fake_write_job_metadata(job_id, url, status, **fields):
+        api.write_job_metadata(job_id, url, status, **fields)
+
+    monkeypatch.setattr(submission, "aread_video_index", fake_read_index)
+    monkeypatch.setattr(submission, "aread_many", fake_read_many)
+    monkeypatch.setattr(submission, "awrite_blob", fake_write)
+    monkeypatch.setattr(submission, "awrite_job_metadata", fake_write_job_metadata)
+
+    write_blob("results/job-1/transcript.json", {"id": "job-1", "transcript": "Great battery."})
+    write_blob("results/job-1/summary.json", {"verdict": {"score": 0.7, "verdict": "POSITIVE"}})
+    write_blob("results/job-1/video_metadata.json", {"video-metadata": {"title": "Review"}})
+
+    def complete(age: timedelta = timedelta()):
+        completed = datetime.now(timezone.utc) - age
+        write_blob("video-index/youtube/Qfb2IjEbIAI", {"job_id": "job-1", "completed": completed.isoformat()})
+
+    return complete
+
+
+def post(body: dict) -> HttpRequest:
+    return HttpRequest(method="POST", url="/api/api", body=json.dumps(body).encode(), params={})
+
+
+class TestDeduplication:
+
+    def test_short_link_reuses_processed_watch_url(self, processed_video):
+        processed_video()
+
+        response = api.handle_post(post({"id": "job-2", "url": "https://youtu.be/Qfb2IjEbIAI"}))
+
+        assert json.loads(response.get_body())["deduplicated_from"] == "job-1"
+        assert read_job_metadata("job-2")["status"] == "DONE"
+        assert read_blob("results/job-2/transcript.json") == {"id": "job-2", "transcript": "Great battery."}
+
+    @pytest.mark.parametrize("body, age", [
+        ({"force": True}, timedelta()),
+        ({}, timedelta(days=30)),
+    ])
+    def test_force_or_stale_results_reprocess(self, processed_video, monkeypatch, body, age):
+        processed_video(age)
+        queued = []
+        monkeypatch.setattr(api, "enqueue_message", lambda message, queue_name: queued.append(message))
+
+        api.handle_post(post({"id": "job-2", "url": "https://www.youtube.com/shorts/Qfb2IjEbIAI", **body}))
+
+        assert read_job_metadata("job-2")["status"] == "CREATED"
+        assert read_job_metadata("job-2")["video_id"] == "Qfb2IjEbIAI"
+        assert queued == [{"id": "job-2"}]
+
+    def test_existing_optional_artifacts_copied(self, processed_video):
+        processed_video()
+        write_blob("results/job-1/segments.json", {"id": "job-1", "segments": [{"start": 0.0, "text": "Great"}]})
+
+        api.handle_post(post({"id": "job-2", "url": "https://youtu.be/Qfb2IjEbIAI"}))
+
+        assert read_blob("results/job-2/segments.json")["id"] == "job-2"
+        with pytest.raises(Exception):
+            read_blob("results/job-2/speech.json")
+
+    def test_missing_summary_reprocesses(self, processed_video, fake_storage, monkeypatch):
+        processed_video()
+        del fake_storage["results/job-1/summary.json"]
+        monkeypatch.setattr(api, "enqueue_message", lambda message, queue_name: None)
+
+        response = api.handle_post(post({"id": "job-2", "url": "https://youtu.be/Qfb2IjEbIAI"}))
+
+        assert "deduplicated_from" not in json.loads(response.get_body())
+        assert read_job_metadata("job-2")["status"] == "CREATED"
+
+
+class TestVideoIndex:
+
+    def test_first_finished_job_wins(self, fake_storage):
+        write_video_index("youtube", "Qfb2IjEbIAI", "job-1")
+        write_video_index("youtube", "Qfb2IjEbIAI", "job-2")
+
+        assert read_blob("video-index/youtube/Qfb2IjEbIAI")["job_id"] == "job-1"
+
+    def test_stale_pointer_replaced(self, fake_storage):
+        completed = datetime.now(timezone.utc) - timedelta(days=30)
+        write_blob("video-index/youtube/Qfb2IjEbIAI", {"job_id": "job-1", "completed": completed.isoformat()})
+
+        write_video_index("youtube", "Qfb2IjEbIAI", "job-2")
+
+        assert read_blob("video-index/youtube/Qfb2IjEbIAI")["job_id"] == "job-2"
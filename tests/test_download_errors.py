@@ -0,0 +1,128 @@
+import itertools
+
+import pytest
+import requests
+from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+from yt_dlp.utils import DownloadError, ExtractorError
+
+from functions.downloader import main as downloader, rate_limit
+from functions.downloader.errors import DEFERRED, PERMANENT, RETRYABLE, UNKNOWN, PermanentDownloadError, \
+    classify_download_error
+from functions.downloader.rate_limit import RateLimited, TokenBucket
+from functions.shared.common import read_job_metadata, write_job_metadata
+from functions.shared.config import DOWNLOAD_BACKOFF_BASE
+from functions.shared.job_status import JobStatus
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class TestClassification:
+
+    @pytest.mark.parametrize("error, kind", [
+        (DownloadError("ERROR: [youtube] abc: Private video. Sign in if you've been granted access"), PERMANENT),
+        (DownloadError("ERROR: [youtube] abc: Video unavailable"), PERMANENT),
+        (PermanentDownloadError("Unsupported platform for URL: ftp://x"), PERMANENT),
+        (ExtractorError("This live event will begin in a few moments", expected=True), PERMANENT),
+        (DownloadError("ERROR: unable to download video data: HTTP Error 429: Too Many Requests"), RETRYABLE),
+        (DownloadError("ERROR: [youtube] abc: Sign in to confirm you're not a bot"), RETRYABLE),
+        (DownloadError("ERROR: [youtube] abc: Unable to download webpage: HTTP Error 404: Not Found"), PERMANENT),
+        (DownloadError("ERROR: [youtube] abc: Unable to download webpage: HTTP Error 403: Forbidden"), PERMANENT),
+        (DownloadError("ERROR: [youtube] abc: Unable to download webpage: HTTP Error 503: Service Unavailable"),
+         RETRYABLE),
+        (DownloadError("ERROR: [youtube] abc: Unable to download webpage: <urlopen error timed out>"), RETRYABLE),
+        (DownloadError("ERROR: [youtube] abc: Unable to extract uploader id"), UNKNOWN),
+        (http_error(503), RETRYABLE),
+        (http_error(404), PERMANENT),
+        (requests.ConnectionError("reset"), RETRYABLE),
+        (RateLimited("youtube", 3), DEFERRED),
+        (KeyError("id"), UNKNOWN),
+    ])
+    def test_classify(self, error, kind):
+        assert classify_download_error(error) == kind
+
+
+class FakeEntity(dict):
+
+    def __init__(self, values, etag):
+        super().__init__(values)
+        self.metadata = {"etag": etag}
+
+
+class FakeBucketTable:
+    """Single-row table with ETag checks"""
+
+    _etags = itertools.count(1)
+
+    def __init__(self):
+        self.row = None
+
+    def get_entity(self, partition_key, row_key, **kwargs):
+        if self.row is None:
+            raise ResourceNotFoundError("The specified resource does not exist.")
+        return FakeEntity(*self.row)
+
+    def create_entity(self, entity, **kwargs):
+        if self.row is not None:
+            raise ResourceExistsError("The specified entity already exists.")
+        self.row = (dict(entity), next(self._etags))
+
+    def update_entity(self, entity, mode=None, etag=None, match_condition=None, **kwargs):
+        if self.row[1] != etag:
+            raise ResourceModifiedError("The update condition specified in the request was not satisfied.")
+        self.row = (dict(entity), next(self._etags))
+
+
+class TestTokenBucket:
+
+    def test_burst_then_wait(self, monkeypatch):
+        table = FakeBucketTable()
+        monkeypatch.setattr(rate_limit, "get_table_client", lambda table_name: table)
+        bucket = TokenBucket("youtube", rate=1, capacity=3)
+
+        assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+        assert 0.9 < bucket.try_acquire() <= 1
+        with pytest.raises(RateLimited):
+            bucket.acquire(max_wait=0.1)
+
+    def test_storage_failure_does_not_block(self, monkeypatch):
+        def broken(table_name):
+            raise ConnectionError("storage down")
+
+        monkeypatch.setattr(rate_limit, "get_table_client", broken)
+
+        assert TokenBucket("youtube", rate=1, capacity=1).try_acquire() == 0
+
+
+class TestHandleDownloadError:
+
+    @pytest.fixture
+    def rescheduled(self, fake_storage, monkeypatch):
+        messages = []
+        monkeypatch.setattr(
+            downloader, "enqueue_message",
+            lambda message, queue_name, visibility_timeout=None: messages.append((message, visibility_timeout)),
+        )
+        write_job_metadata("job-1", "https://www.youtube.com/watch?v=abcdefghijk", JobStatus.CREATED.value)
+        return messages
+
+    def test_retryable_is_rescheduled_with_backoff(self, rescheduled):
+        assert downloader.handle_download_error("job-1", 2, http_error(429))
+
+        message, delay = rescheduled[0]
+        assert message == {"id": "job-1", "attempt": 3}
+        assert DOWNLOAD_BACKOFF_BASE * 2 <= delay <= DOWNLOAD_BACKOFF_BASE * 4
+        assert read_job_metadata("job-1")["status"] == JobStatus.CREATED.value
+
+    def test_permanent_fails_without_retry(self, rescheduled):
+        assert downloader.handle_download_error("job-1", 0, DownloadError("ERROR: Private video"))
+
+        assert rescheduled == []
+        assert read_job_metadata("job-1")["status"] == JobStatus.FAILED.value
+        assert "Private video" in read_job_metadata("job-1")["error"]
+
+    def test_unknown_is_left_to_the_queue(self, rescheduled):
+        assert not downloader.handle_download_error("job-1", 0, KeyError("id"))
@@ -0,0 +1,123 @@
+import json
+import threading
+
+from functions.downloader import strategies
+from functions.downloader.session import DownloaderSession
+
+
+class FakeResponse:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=None):
+        body = json.dumps({"events": [{"tStartMs": 0, "segs": [{"utf8": "Great"}, {"utf8": " battery."}]}]})
+        yield body.encode()
+
+
+class FakeHttp:
+
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, timeout=None, stream=False):
+        self.urls.append(url)
+        return FakeResponse()
+
+
+class FakeExtractor:
+
+    def extract_info(self, url, download=False):
+        return {
+            "title": "Review",
+            "subtitles": {"en": [{"ext": "vtt", "url": "vtt-url"}, {"ext": "json3", "url": "json3-url"}]},
+        }
+
+
+class FakeSession:
+
+    def __init__(self):
+        self.http = FakeHttp()
+        self.options = []
+
+    def extractor(self, options):
+        self.options.append(options)
+        return FakeExtractor()
+
+
+class TestDownloaderSession:
+
+    def test_extractor_reused_per_thread_and_options(self):
+        session = DownloaderSession(pool_size=2)
+        options = {"quiet": True}
+
+        first = session.extractor(options)
+        assert session.extractor(dict(options)) is first
+        assert session.extractor({"quiet": False}) is not first
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(session.extractor(options)))
+        thread.start()
+        thread.join()
+        assert other[0] is not first
+
+    def test_http_session_is_shared(self):
+        session = DownloaderSession(pool_size=2)
+
+        assert session.http is session.http
+
+
+def record_storage(monkeypatch) -> list:
+    """Replace blob writes and status transitions with a recorder of (kind, target) events"""
+    events = []
+
+    async def fake_write(blob_name, data):
+        events.append(("write", blob_name))
+
+    def fake_transition(job_id, from_states, to_state, **fields):
+        events.append(("status", to_state))
+        return {"status": to_state.value}
+
+    monkeypatch.setattr(strategies, "awrite_blob", fake_write)
+    monkeypatch.setattr(strategies, "transition_job_status", fake_transition)
+    return events
+
+
+class TestYTDownloaderTimings:
+
+    def test_extract_and_subtitle_fetch_timed_separately(self, monkeypatch):
+        fake_session = FakeSession()
+        monkeypatch.setattr(strategies, "get_downloader_session", lambda: fake_session)
+        record_storage(monkeypatch)
+
+        downloader = strategies.YTDownloader("job-1", "https://www.youtube.com/watch?v=abcdefghijk")
+        result = downloader._download()
+
+        assert result["transcript"] == "Great battery."
+        assert result["video_metadata"]["subtitle_type"] == "manual"
+        assert fake_session.http.urls == ["json3-url"]
+        assert fake_session.options == [strategies.YT_TRANSCRIPT_OPTIONS]
+        assert {"extract_info", "subtitle_fetch"} <= set(downloader.timings)
+
+    def test_video_metadata_published_before_transcript(self, monkeypatch):
+        fake_session = FakeSession()
+        monkeypatch.setattr(strategies, "get_downloader_session", lambda: fake_session)
+        events = record_storage(monkeypatch)
+
+        downloader = strategies.YTDownloader("job-1", "https://www.youtube.com/watch?v=abcdefghijk")
+        result = downloader._download()
+        assert result["metadata_published"] is True
+        assert events == [
+            ("write", "results/job-1/video_metadata.json"),
+            ("status", strategies.JobStatus.METADATA_READY),
+        ]
+
+        downloader._save_results(result)
+        written = [blob for kind, blob in events if kind == "write"]
+        assert written.count("results/job-1/video_metadata.json") == 1
@@ -0,0 +1,134 @@
+import pytest
+
+from functions.shared.common import (
+    read_indexed_job_status,
+    read_job_metadata,
+    read_job_status,
+    transition_job_status,
+    write_blob,
+    write_failed_job_metadata,
+    write_job_metadata,
+)
+from functions.shared.job_status import JobStatus
+
+JOB_BLOB = "results/job-1/job_metadata.json"
+
+
+def fail_read(blob_name):
+    raise AssertionError(f"unexpected read of {blob_name}")
+
+
+class TestTransitionJobStatus:
+
+    def test_uses_cached_etag_without_read(self, fake_storage, monkeypatch):
+        from functions.shared import common
+
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.CREATED.value)
+        monkeypatch.setattr(common, "read_blob_with_etag", fail_read)
+
+        result = transition_job_status("job-1", (JobStatus.CREATED,), JobStatus.TRANSCRIBED, language="en")
+
+        assert result["status"] == "TRANSCRIBED"
+        assert result["language"] == "en"
+        assert result["url"] == "https://youtu.be/abc"
+
+    def test_rejects_backwards_transition(self, fake_storage):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.DONE.value)
+
+        assert transition_job_status("job-1", (JobStatus.CREATED,), JobStatus.TRANSCRIBED) is None
+        assert read_job_metadata("job-1")["status"] == "DONE"
+
+    def test_stale_cache_rereads_once(self, fake_storage):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.CREATED.value)
+        # another worker moves the job on behind our cached ETag
+        write_blob(JOB_BLOB, {"id": "job-1", "url": "https://youtu.be/abc", "status": "TRANSCRIBED"})
+
+        result = transition_job_status("job-1", (JobStatus.TRANSCRIBED,), JobStatus.DONE)
+
+        assert result["status"] == "DONE"
+
+    def test_concurrent_done_is_not_clobbered(self, fake_storage):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.CREATED.value)
+        write_blob(JOB_BLOB, {"id": "job-1", "url": "https://youtu.be/abc", "status": "DONE"})
+
+        assert transition_job_status("job-1", (JobStatus.CREATED,), JobStatus.TRANSCRIBED) is None
+        assert read_job_metadata("job-1")["status"] == "DONE"
+
+    def test_already_in_target_state(self, fake_storage):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.TRANSCRIBED.value)
+
+        result = transition_job_status("job-1", (JobStatus.CREATED,), JobStatus.TRANSCRIBED)
+
+        assert result["status"] == "TRANSCRIBED"
+
+    def test_failed_does_not_override_terminal(self, fake_storage):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.NO_SPEECH.value)
+
+        write_failed_job_metadata("job-1")
+
+        assert read_job_metadata("job-1")["status"] == "NO_SPEECH"
+
+
+class TestJobIndex:
+
+    def test_transition_moves_listing_entity(self, fake_storage, fake_index):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.CREATED.value)
+        created = read_job_metadata("job-1")["created"]
+
+        transition_job_status("job-1", (JobStatus.CREATED,), JobStatus.TRANSCRIBED)
+
+        assert (f"TRANSCRIBED_{created}", "job-1") in fake_index
+        assert (f"CREATED_{created}", "job-1") not in fake_index
+        assert read_indexed_job_status("job-1")["status"] == "TRANSCRIBED"
+
+    def test_unindexed_job(self, fake_storage, fake_index):
+        assert read_indexed_job_status("missing") is None
+
+    def test_full_document_mirrored(self, fake_storage, fake_index):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.CREATED.value, parent_id="playlist-1")
+
+        write_failed_job_metadata("job-1", error="Video unavailable")
+
+        indexed = read_indexed_job_status("job-1")
+        assert indexed["error"] == "Video unavailable"
+        assert indexed["parent_id"] == "playlist-1"
+
+    def test_status_read_from_index_alone(self, fake_storage, fake_index, monkeypatch):
+        from functions.shared import common
+
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.CREATED.value)
+        transition_job_status("job-1", (JobStatus.CREATED,), JobStatus.TRANSCRIBED)
+        monkeypatch.setattr(common, "read_blob_with_etag", fail_read)
+
+        assert read_job_status("job-1")["status"] == "TRANSCRIBED"
+
+    def test_failed_index_write_falls_back_to_blob(self, fake_storage, fake_index, monkeypatch):
+        from functions.shared import common
+
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.CREATED.value)
+        table_client = type(common.get_table_client("jobs"))
+
+        def upsert_fails(self, entity, mode=None, **kwargs):
+            raise ConnectionError("table down")
+
+        monkeypatch.setattr(table_client, "upsert_entity", upsert_fails)
+        transition_job_status("job-1", (JobStatus.CREATED,), JobStatus.TRANSCRIBED)
+
+        assert read_indexed_job_status("job-1") is None
+        assert read_job_status("job-1")["status"] == "TRANSCRIBED"
+
+    def test_new_job_skips_previous_lookup(self, fake_storage, fake_index, monkeypatch):
+        from functions.shared import common
+
+        table_client = type(common.get_table_client("jobs"))
+        monkeypatch.setattr(table_client, "get_entity", lambda self, *keys, **kwargs: pytest.fail("lookup read"))
+
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.CREATED.value)
+
+    def test_rewritten_job_leaves_no_orphan_listing(self, fake_storage, fake_index):
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.CREATED.value)
+
+        write_job_metadata("job-1", "https://youtu.be/abc", JobStatus.DONE.value)
+
+        listings = [key for key in fake_index if key[1] == "job-1" and key[0] != "job-1"]
+        assert listings == [(f"DONE_{read_job_metadata('job-1')['created']}", "job-1")]
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from functions.downloader.json3 import Json3Parser, parse_json3
+
+SUBTITLES = {
+    "wireMagic": "pb3",
+    "pens": [{}],
+    "events": [
+        {"tStartMs": 0, "dDurationMs": 120000, "id": 1, "wpWinPosId": 1},
+        {"tStartMs": 160, "dDurationMs": 4000, "segs": [{"utf8": "Starting with"}, {"utf8": " the battery", "tOffsetMs": 400}]},
+        {"tStartMs": 4160, "dDurationMs": 10, "aAppend": 1, "segs": [{"utf8": "\n"}]},
+        {"tStartMs": 4170, "dDurationMs": 3000, "segs": [{"utf8": "I’m impressed — really"}]},
+    ],
+}
+
+
+def flat_transcript(subtitle_json: dict) -> str:
+    return " ".join(
+        text
+        for event in subtitle_json["events"]
+        for text in (seg.get("utf8", "").strip() for seg in event.get("segs") or ())
+        if text
+    )
+
+
+class TestJson3Parser:
+
+    def test_matches_full_load_for_any_chunking(self):
+        body = json.dumps(SUBTITLES, ensure_ascii=False).encode("utf-8")
+
+        for size in (1, 3, 7, 64, len(body)):
+            chunks = (body[i:i + size] for i in range(0, len(body), size))
+            transcript, segments = parse_json3(chunks)
+            assert transcript == flat_transcript(SUBTITLES)
+            assert len(segments) == 2
+
+    def test_segment_table_maps_cues_to_text(self):
+        transcript, segments = parse_json3([json.dumps(SUBTITLES).encode()])
+
+        table = segments.to_dict()
+        assert table["start_ms"] == [160, 4170]
+        assert table["duration_ms"] == [4000, 3000]
+        second = table["text_offset"][1]
+        assert transcript[:second].rstrip() == "Starting with the battery"
+        assert transcript[second:] == "I’m impressed — really"
+
+    def test_truncated_body_raises(self):
+        parser = Json3Parser()
+        parser.feed(json.dumps(SUBTITLES).encode()[:-10])
+
+        with pytest.raises(ValueError):
+            parser.close()
@@ -0,0 +1,160 @@
+import json
+
+import pytest
+from azure.functions import HttpRequest
+
+from functions.api import main as api
+from functions.downloader import strategies
+from functions.shared import common, submission
+from functions.shared.common import read_job_metadata, transition_job_status, write_blob, \
+    write_failed_job_metadata, write_job_metadata
+from functions.shared.job_status import JobStatus
+from functions.shared.video_url import canonical_collection_url
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL123"
+
+
+class TestCanonicalCollectionUrl:
+
+    @pytest.mark.parametrize("url, expected", [
+        ("https://www.youtube.com/playlist?list=PL123&si=x", PLAYLIST_URL),
+        ("https://www.youtube.com/@reviews", "https://www.youtube.com/@reviews/videos"),
+        ("youtube.com/@reviews/shorts", "https://www.youtube.com/@reviews/shorts"),
+        ("https://www.youtube.com/channel/UC123/featured", "https://www.youtube.com/channel/UC123/videos"),
+        ("https://www.youtube.com/watch?v=Qfb2IjEbIAI", None),
+        ("https://example.com/@reviews", None),
+    ])
+    def test_collection_urls(self, url, expected):
+        assert canonical_collection_url(url) == expected
+
+
+class FakeExtractor:
+
+    def extract_info(self, url, download=False):
+        return {
+            "title": "Phone reviews",
+            "entries": [
+                {"id": "Qfb2IjEbIAI", "url": "https://www.youtube.com/watch?v=Qfb2IjEbIAI"},
+                {"id": "Qfb2IjEbIAI", "url": "https://www.youtube.com/watch?v=Qfb2IjEbIAI"},
+                {"id": "abcdefghijk", "url": "https://www.youtube.com/shorts/abcdefghijk"},
+                {"id": "UCchannel", "url": "https://www.youtube.com/channel/UCchannel"},
+            ],
+        }
+
+
+@pytest.fixture
+def playlist_storage(fake_storage, fake_index, monkeypatch):
+    queued = []
+
+    async def fake_write_job_metadata(job_id, url, status, **fields):
+        write_job_metadata(job_id, url, status, **fields)
+
+    async def fake_enqueue(message, queue_name, visibility_timeout=None):
+        queued.append((message["id"], visibility_timeout))
+
+    async def no_previous_results(platform, video_id):
+        return None
+
+    async def read_many(blob_names, return_exceptions=False):
+        results = []
+        for blob_name in blob_names:
+            try:
+                results.append(common.read_blob(blob_name))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    session = type("Session", (), {"extractor": lambda self, options: FakeExtractor()})()
+    monkeypatch.setattr(strategies, "get_downloader_session", lambda: session)
+    monkeypatch.setattr(strategies.YOUTUBE_RATE_LIMITER, "rate", 0)
+    monkeypatch.setattr(submission, "awrite_job_metadata", fake_write_job_metadata)
+    monkeypatch.setattr(submission, "aenqueue_message", fake_enqueue)
+    monkeypatch.setattr(submission, "aread_video_index", no_previous_results)
+    monkeypatch.setattr(common, "aread_many", read_many)
+    monkeypatch.setattr(api, "_artifact_cache", api.ArtifactCache(max_entries=16, max_bytes=1024 * 1024))
+
+    write_job_metadata("job-1", PLAYLIST_URL, JobStatus.CREATED.value)
+    return queued
+
+
+def status(job_id: str) -> dict:
+    request = HttpRequest(method="GET", url="/api/api", body=b"", params={"id": job_id})
+    return json.loads(api.handle_get(request, None).get_body())
+
+
+class TestPlaylistFanOut:
+
+    def test_children_submitted_once_per_video(self, playlist_storage):
+        strategies.PlaylistDownloader("job-1", PLAYLIST_URL).process()
+
+        parent = read_job_metadata("job-1")
+        assert parent["status"] == JobStatus.DOWNLOADED.value
+        assert parent["children"] == ["job-1-0000", "job-1-0001"]
+        assert read_job_metadata("job-1-0001")["parent_id"] == "job-1"
+        assert playlist_storage == [("job-1-0000", None), ("job-1-0001", 2)]
+
+    def test_parent_progress_and_completion(self, playlist_storage, monkeypatch):
+        strategies.PlaylistDownloader("job-1", PLAYLIST_URL).process()
+
+        transition_job_status("job-1-0000", (JobStatus.CREATED,), JobStatus.DONE)
+        assert status("job-1")["progress"] == {"total": 2, "finished": 1, "statuses": {"DONE": 1, "CREATED": 1}}
+        assert read_job_metadata("job-1")["status"] == JobStatus.DOWNLOADED.value
+
+        # the stage finishing the last child completes the parent, no status read needed
+        transition_job_status("job-1-0001", (JobStatus.CREATED,), JobStatus.NO_SPEECH)
+        assert read_job_metadata("job-1")["status"] == JobStatus.DONE.value
+
+    def test_failed_child_completes_parent(self, playlist_storage):
+        strategies.PlaylistDownloader("job-1", PLAYLIST_URL).process()
+        transition_job_status("job-1-0000", (JobStatus.CREATED,), JobStatus.DONE)
+
+        write_failed_job_metadata("job-1-0001", error="Video unavailable")
+
+        assert read_job_metadata("job-1")["status"] == JobStatus.DONE.value
+
+    def test_status_read_does_not_complete_parent(self, playlist_storage, fake_storage):
+        strategies.PlaylistDownloader("job-1", PLAYLIST_URL).process()
+        # a child whose completion check was lost
+        for child_id in ("job-1-0000", "job-1-0001"):
+            write_blob(f"results/{child_id}/job_metadata.json", {"id": child_id, "status": "DONE", "parent_id": "job-1"})
+
+        status("job-1")
+
+        assert read_job_metadata("job-1")["status"] == JobStatus.DOWNLOADED.value
+
+    def test_children_finished_before_fan_out_completes_parent(self, playlist_storage, monkeypatch):
+        async def reused(job_id, url, video, force, **fields):
+            write_job_metadata(job_id, url, JobStatus.DONE.value, **fields)
+            return "job-0"
+
+        monkeypatch.setattr(submission, "reuse_processed_video", reused)
+
+        strategies.PlaylistDownloader("job-1", PLAYLIST_URL).process()
+
+        assert read_job_metadata("job-1")["status"] == JobStatus.DONE.value
+
+    def test_unfinished_child_in_index_skips_blob_reads(self, playlist_storage, monkeypatch):
+        strategies.PlaylistDownloader("job-1", PLAYLIST_URL).process()
+        monkeypatch.setattr(common, "aread_many", lambda *args, **kwargs: pytest.fail("child blobs read"))
+
+        transition_job_status("job-1-0000", (JobStatus.CREATED,), JobStatus.DONE)
+
+        assert read_job_metadata("job-1")["status"] == JobStatus.DOWNLOADED.value
+
+    def test_completion_without_index_stops_at_unfinished_child(self, playlist_storage, monkeypatch):
+        strategies.PlaylistDownloader("job-1", PLAYLIST_URL).process()
+        monkeypatch.setattr(common, "JOB_INDEX_ENABLED", False)
+        monkeypatch.setattr(common, "_CHILD_READ_BATCH", 1)
+        read_many = common.aread_many
+        reads = []
+
+        async def counting_read_many(blob_names, return_exceptions=False):
+            reads.append(blob_names)
+            return await read_many(blob_names, return_exceptions)
+
+        monkeypatch.setattr(common, "aread_many", counting_read_many)
+
+        transition_job_status("job-1-0000", (JobStatus.CREATED,), JobStatus.DONE)
+
+        assert reads == [["results/job-1-0001/job_metadata.json"]]
+        assert read_job_metadata("job-1")["status"] == JobStatus.DOWNLOADED.value
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+import requests
+
+from functions.downloader import session as downloader_session
+from functions.downloader import strategies
+from functions.downloader.replay import RecordingSession, ReplaySession
+from functions.shared import common
+from functions.shared.job_status import JobStatus
+
+VIDEO_URL = "https://www.youtube.com/watch?v=abcdefghijk"
+CAPTIONS = json.dumps(
+    {"events": [{"tStartMs": 0, "dDurationMs": 1500, "segs": [{"utf8": "Great"}, {"utf8": " battery."}]}]}
+).encode()
+
+
+class LiveResponse:
+    status_code = 200
+    content = CAPTIONS
+
+
+class LiveSession:
+    """What RecordingSession wraps: a session that would hit the network"""
+
+    def __init__(self):
+        self.http = self
+        self.calls = 0
+
+    def extractor(self, options):
+        return self
+
+    def extract_info(self, url, download=False):
+        self.calls += 1
+        return {"title": "Review", "subtitles": {"en": [{"ext": "json3", "url": "https://captions/json3"}]}}
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return LiveResponse()
+
+
+@pytest.fixture
+def replay_storage(fake_storage, monkeypatch):
+    async def write_to_fake(blob_name, data):
+        return common.write_blob(blob_name, data)
+
+    queued = []
+    monkeypatch.setattr(strategies, "awrite_blob", write_to_fake)
+    monkeypatch.setattr(strategies, "enqueue_message", lambda message, queue_name: queued.append(queue_name))
+    monkeypatch.setattr(strategies.YOUTUBE_RATE_LIMITER, "rate", 0)
+    return queued
+
+
+class TestRecordReplay:
+
+    def test_recorded_job_replays_offline(self, tmp_path, replay_storage, monkeypatch):
+        live = LiveSession()
+        recorder = RecordingSession(live, tmp_path)
+        info = recorder.extractor({}).extract_info(VIDEO_URL, download=False)
+        recorder.http.get(info["subtitles"]["en"][0]["url"], stream=True)
+        assert live.calls == 2
+
+        monkeypatch.setattr(downloader_session, "_session", ReplaySession(tmp_path))
+        common.write_job_metadata("job-1", VIDEO_URL, JobStatus.CREATED.value)
+        downloader = strategies.YTDownloader("job-1", VIDEO_URL)
+        downloader.process()
+
+        assert live.calls == 2
+        assert common.read_blob("results/job-1/transcript.json")["transcript"] == "Great battery."
+        assert common.read_job_metadata("job-1")["status"] == JobStatus.TRANSCRIBED.value
+        assert replay_storage == [strategies.TRANSCRIBED_QUEUE]
+        assert {"extract_info", "subtitle_fetch", "save", "finalize"} <= set(downloader.timings)
+
+    def test_unrecorded_url_fails_like_the_network(self, tmp_path):
+        with pytest.raises(requests.ConnectionError):
+            ReplaySession(tmp_path).http.get("https://captions/missing")
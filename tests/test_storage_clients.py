@@ -0,0 +1,60 @@
+import asyncio
+import contextvars
+import threading
+
+from functions.shared import common
+from functions.shared.config import CONNECTION_STRING
+
+AZURITE = CONNECTION_STRING
+OTHER_ACCOUNT = AZURITE.replace("127.0.0.1", "localhost")
+
+
+def fresh_context(fn, *args):
+    # a context that never saw reset_round_trips(), like a worker thread outside an invocation
+    return contextvars.Context().run(fn, *args)
+
+
+class TestClientRegistry:
+
+    def test_service_clients_reused_per_connection_string(self):
+        first = common.get_blob_service_client(AZURITE)
+
+        assert common.get_blob_service_client(AZURITE) is first
+        assert common.get_blob_service_client(OTHER_ACCOUNT) is not first
+        assert common.get_queue_service_client(AZURITE) is common.get_queue_service_client(AZURITE)
+
+
+class TestRoundTrips:
+
+    def test_requests_outside_an_invocation_are_not_counted(self):
+        def count_without_reset():
+            common._count_round_trip(None)
+            return common.get_round_trips()
+
+        assert fresh_context(count_without_reset) == 0
+        assert fresh_context(count_without_reset) == 0
+
+    def test_async_round_trips_attributed_to_each_invocation(self):
+        async def storage_calls(n):
+            for _ in range(n):
+                common._count_round_trip(None)
+                await asyncio.sleep(0)
+
+        results = {}
+        start = threading.Barrier(2)
+
+        def invocation(name, n):
+            common.reset_round_trips()
+            start.wait()
+            pending = common.submit_async(storage_calls(n))
+            common.run_async(storage_calls(n))
+            pending.result()
+            results[name] = common.get_round_trips()
+
+        threads = [threading.Thread(target=fresh_context, args=(invocation, name, n)) for name, n in (("a", 3), ("b", 5))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {"a": 6, "b": 10}
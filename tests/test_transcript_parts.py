@@ -0,0 +1,74 @@
+import pytest
+
+from functions.nlp import summary
+from functions.shared import common
+from functions.shared.job_status import JobStatus
+from functions.speech_to_text import main as speech_to_text
+
+
+@pytest.fixture
+def storage(fake_storage, monkeypatch):
+    async def read_many(blob_names, return_exceptions=False):
+        results = []
+        for blob_name in blob_names:
+            try:
+                results.append(common.read_blob(blob_name))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    queued = []
+    monkeypatch.setattr(summary, "aread_many", read_many)
+    monkeypatch.setattr(speech_to_text, "enqueue_message", lambda message, queue_name: queued.append(message))
+    return queued
+
+
+def chunk(start, text):
+    return {"language": "en", "segments": [{"start": start, "end": start + 2.0, "text": text}]}
+
+
+class TestTranscriptParts:
+
+    def test_parts_published_with_manifest(self, storage):
+        speech_to_text.publish_transcript_part("job-1", 0, chunk(0.0, " Great battery."), 2)
+
+        assert common.read_blob("results/job-1/transcript.part-0000.json")["transcript"] == "Great battery."
+        assert summary.read_manifest("job-1") == {"id": "job-1", "parts": 1, "total": 2, "complete": False}
+        assert storage == [{"id": "job-1", "part": 0}]
+
+        speech_to_text.publish_transcript_part("job-1", 1, chunk(120.0, " Weak camera."), 2)
+        assert summary.read_manifest("job-1")["complete"] is True
+
+    def test_merge_waits_for_manifest_and_every_part(self, storage):
+        speech_to_text.publish_transcript_part("job-1", 0, chunk(0.0, " Great battery."), 2)
+        summary.write_part_scores("job-1", 0, [{"label": "POSITIVE", "score": 0.9}], {"battery": [0.9], "camera": []})
+        assert summary.try_merge_parts("job-1", "smartphone") is None
+
+        speech_to_text.publish_transcript_part("job-1", 1, chunk(120.0, " Weak camera."), 2)
+        assert summary.try_merge_parts("job-1", "smartphone") is None
+
+        summary.write_part_scores("job-1", 1, [{"label": "NEGATIVE", "score": -0.7}], {"battery": [], "camera": [-0.7]})
+        assert summary.try_merge_parts("job-1", "smartphone") == "NEUTRAL"
+
+        merged = common.read_blob("results/job-1/summary.json")
+        assert merged["sentiment_series_chart"] == {"y": [0.9, -0.7], "labels": ["POSITIVE", "NEGATIVE"]}
+        assert merged["sentiment_by_part"]["features_verdict"] == {
+            "battery": {"score": 9.5, "label": "POSITIVE"},
+            "camera": {"score": 1.5, "label": "NEGATIVE"},
+        }
+
+    def test_last_part_leaves_merge_to_final_message_until_transcribed(self, storage, fake_storage):
+        common.write_job_metadata("job-1", "https://example.com/a.mp3", JobStatus.DOWNLOADED.value)
+        speech_to_text.publish_transcript_part("job-1", 0, chunk(0.0, " Great battery."), 1)
+        summary.write_part_scores("job-1", 0, [{"label": "POSITIVE", "score": 0.9}], {"battery": [0.9]})
+
+        assert summary.merge_after_part("job-1", "smartphone") is None
+        assert "results/job-1/summary.json" not in fake_storage
+
+        common.transition_job_status("job-1", (JobStatus.DOWNLOADED,), JobStatus.TRANSCRIBED)
+        assert summary.merge_after_part("job-1", "smartphone") == "POSITIVE"
+
+    def test_job_without_parts_is_not_merged(self, storage):
+        assert summary.try_merge_parts("job-2", "smartphone") is None
@@ -0,0 +1,108 @@
+import itertools
+
+import pytest
+
+from functions.shared import common
+from functions.shared.job_status import JobStatus
+from functions.speech_to_text import main as speech_to_text
+from functions.speech_to_text import vad
+from functions.speech_to_text.vad import detect_speech, speech_ratio, speech_regions, speech_spans
+
+FRAME = 0.1
+
+
+def flags(pattern: str) -> list[bool]:
+    return [c == "#" for c in pattern]
+
+
+class TestSpeechRegions:
+
+    def test_short_pauses_joined_and_blips_dropped(self):
+        # 1 s speech, 0.3 s pause, 1 s speech, 2 s silence, a 0.1 s click, silence
+        pattern = "#" * 10 + "." * 3 + "#" * 10 + "." * 20 + "#" + "." * 10
+
+        regions = speech_regions(flags(pattern), frame_seconds=FRAME, min_pause=0.5, padding=0.2, min_speech=0.25)
+
+        assert [(round(s, 2), round(e, 2)) for s, e in regions] == [(0.0, 2.5)]
+
+    def test_spans_skip_only_long_silences(self):
+        regions = [(0.0, 10.0), (15.0, 20.0), (300.0, 310.0)]
+
+        assert speech_spans(regions, 320.0, max_silence=30) == [(0.0, 20.0), (300.0, 310.0)]
+        assert speech_ratio(regions, 320.0) == 25 / 320
+
+
+class TestDetectSpeech:
+
+    @pytest.fixture
+    def energy_only(self, monkeypatch):
+        monkeypatch.setattr(vad, "webrtcvad", None)
+
+        def use_energies(energies):
+            monkeypatch.setattr(vad, "frame_energies", lambda audio: energies)
+
+        return use_energies
+
+    def test_low_dynamic_range_speech_over_music(self, energy_only):
+        # a minute of speech over a music bed: frame RMS only moves between 0.05 and 0.14
+        frames = 2000
+        energy_only(list(itertools.islice(itertools.cycle([0.05, 0.08, 0.14, 0.11, 0.06]), frames)))
+
+        _, regions = detect_speech(None)
+
+        assert speech_ratio(regions, frames * vad.FRAME_SECONDS) == 1.0
+
+    def test_true_silence(self, energy_only):
+        energy_only([0.0, 0.002, 0.001, 0.004] * 500)
+
+        _, regions = detect_speech(None)
+
+        assert regions == []
+
+
+class Audio(list):
+    """Decoded-audio stand-in, numpy is not needed to exercise the pre-screen decisions"""
+
+    @property
+    def nbytes(self):
+        return len(self) * 4
+
+
+@pytest.fixture
+def prescreen(fake_storage, monkeypatch):
+    monkeypatch.setattr(speech_to_text, "SPEECH_PRESCREEN_ENABLED", True)
+    monkeypatch.setattr(speech_to_text, "download_audio", lambda job_id: Audio([0.0] * 16000 * 60))
+    common.write_job_metadata("job-1", "https://example.com/a.mp3", JobStatus.DOWNLOADED.value)
+
+
+class TestPrescreen:
+
+    def test_little_speech_goes_to_no_speech_without_whisper(self, prescreen, monkeypatch):
+        monkeypatch.setattr(speech_to_text, "VOICE_DETECTION", True)
+        monkeypatch.setattr(speech_to_text, "detect_speech", lambda audio: ([], [(10.0, 12.0)]))
+        monkeypatch.setattr(speech_to_text, "_transcribe", lambda *args: (_ for _ in ()).throw(AssertionError))
+
+        assert speech_to_text.transcribe_audio("job-1") is None
+        speech_to_text.mark_no_speech("job-1")
+
+        assert common.read_blob("results/job-1/speech.json") == {
+            "id": "job-1", "speech_ratio": 0.033, "regions": [[10.0, 12.0]]
+        }
+        assert common.read_job_metadata("job-1")["status"] == JobStatus.NO_SPEECH.value
+
+    def test_little_sound_without_webrtcvad_is_still_transcribed(self, prescreen, monkeypatch):
+        monkeypatch.setattr(speech_to_text, "VOICE_DETECTION", False)
+        monkeypatch.setattr(speech_to_text, "detect_speech", lambda audio: ([], [(10.0, 12.0)]))
+        monkeypatch.setattr(speech_to_text, "_transcribe", lambda *args: {
+            "language": "en", "text": " Great battery.", "segments": [{"start": 10.0, "end": 12.0, "text": " Great battery."}]
+        })
+
+        transcript, language, _ = speech_to_text.transcribe_audio("job-1")
+
+        assert (transcript, language) == ("Great battery.", "en")
+
+    def test_no_sound_is_no_speech_without_webrtcvad(self, prescreen, monkeypatch):
+        monkeypatch.setattr(speech_to_text, "VOICE_DETECTION", False)
+        monkeypatch.setattr(speech_to_text, "detect_speech", lambda audio: ([], []))
+
+        assert speech_to_text.transcribe_audio("job-1") is None
@@ -0,0 +1,106 @@
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from functions.speech_to_text import backends
+from functions.speech_to_text.model import WhisperModel
+
+
+class TestWhisperModel:
+
+    def test_loaded_on_first_get_only(self):
+        loads = []
+        holder = WhisperModel("tiny", loader=lambda size, device: loads.append((size, device)) or object())
+
+        assert not holder.loaded and loads == []
+        model = holder.get()
+        assert holder.get() is model
+        assert loads == [("tiny", "")]
+        assert holder.load_seconds is not None and holder.rss_delta_mib is not None
+
+    def test_concurrent_callers_share_one_load(self):
+        loads = []
+
+        def slow_loader(size, device):
+            loads.append(size)
+            time.sleep(0.05)
+            return object()
+
+        holder = WhisperModel("base", loader=slow_loader)
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(holder.get())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loads == ["base"]
+        assert len(set(map(id, models))) == 1
+
+    def test_failed_load_is_retried(self):
+        attempts = []
+
+        def flaky_loader(size, device):
+            attempts.append(size)
+            if len(attempts) == 1:
+                raise RuntimeError("download interrupted")
+            return object()
+
+        holder = WhisperModel("base", loader=flaky_loader)
+        try:
+            holder.get()
+        except RuntimeError:
+            pass
+        assert holder.get() is not None
+        assert len(attempts) == 2
+
+    def test_importing_speech_to_text_does_not_load_whisper(self):
+        code = "import sys, functions.speech_to_text.main; print('torch' in sys.modules or 'whisper' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
+
+
+class TestBackends:
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            backends.resolve_backend("whisper-fp8")
+
+    def test_faster_whisper_falls_back_when_not_installed(self, monkeypatch):
+        monkeypatch.setattr(backends, "available_backends", lambda: [backends.WHISPER, backends.WHISPER_INT8])
+
+        assert backends.resolve_backend("Faster-Whisper") == backends.WHISPER_INT8
+        assert backends.resolve_backend(None) == backends.WHISPER
+
+    def test_faster_whisper_result_has_whisper_shape(self):
+        class FakeEngine:
+            def transcribe(self, audio):
+                segments = (SimpleNamespace(start=s, end=s + 1.5, text=t) for s, t in ((0.0, " Great"), (1.5, " battery.")))
+                return segments, SimpleNamespace(language="en")
+
+        result = backends.FasterWhisperModel(FakeEngine()).transcribe([0.0])
+
+        assert result == {
+            "text": " Great battery.",
+            "language": "en",
+            "segments": [{"start": 0.0, "end": 1.5, "text": " Great"}, {"start": 1.5, "end": 3.0, "text": " battery."}],
+        }
+
+    def test_int8_backend_quantizes_whisper_linears(self, monkeypatch):
+        torch = pytest.importorskip("torch")
+        whisper = pytest.importorskip("whisper")
+        dims = whisper.model.ModelDimensions(
+            n_mels=80, n_audio_ctx=8, n_audio_state=16, n_audio_head=2, n_audio_layer=1,
+            n_vocab=64, n_text_ctx=8, n_text_state=16, n_text_head=2, n_text_layer=1,
+        )
+        monkeypatch.setattr(backends, "load_whisper", lambda size, device: whisper.model.Whisper(dims))
+
+        model = backends.load_whisper_int8("tiny", "cpu")
+
+        quantized = [m for m in model.modules() if isinstance(m, torch.ao.nn.quantized.dynamic.Linear)]
+        assert quantized
+        assert not any(isinstance(m, whisper.model.Linear) for m in model.modules())